@@ -0,0 +1,75 @@
+'''
+Compares the two ways a large list response can become models, offline:
+
+  dicts:  json.loads(body), then [VideoFile(**item) for item in items]
+  bytes:  response_adapter(List[VideoFile]).validate_json(body), which is
+          what the client does now
+
+Reports wall time and peak traced memory for each.
+
+    python examples/benchmark_list_decoding.py --count 50000
+'''
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import List
+
+from videojungle.model import VideoFile, response_adapter
+
+def video_file(index: int) -> dict:
+    return {
+        "id": f"8f0c2a7e-{index:08d}",
+        "filename": f"clip_{index}.mp4",
+        "name": f"Clip {index}",
+        "description": "Drone footage over the coast at sunset, 4K, stabilized",
+        "thumbnail": None,
+        "duration": 12.5 + index % 60,
+        "fps": 29.97,
+        "owner_id": "1b6e4c1d-4b0e-4a58-9d4f-0c9a2f3a7e11",
+        "size": 48_000_000 + index,
+        "hash": f"{index:064x}",
+        "created_at": "2024-05-01T12:00:00",
+        "recorded_at": None,
+        "key": f"uploads/clip_{index}.mp4",
+        "analysis": [{"start": 0.0, "end": 4.2, "label": "ocean", "score": 0.93}],
+        "url": None,
+        "current_status": "analyzed",
+        "download_url": f"https://cdn.example.com/clip_{index}.mp4",
+        "thumbnail_url": None,
+        "has_redirect": False,
+    }
+
+def via_dicts(body: bytes):
+    return [VideoFile(**item) for item in json.loads(body)]
+
+def via_bytes(body: bytes):
+    return response_adapter(List[VideoFile]).validate_json(body)
+
+def measure(decode, body: bytes, repeat: int = 3):
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = decode(body)
+        timings.append(time.perf_counter() - started)
+        del result
+    gc.collect()
+    tracemalloc.start()
+    result = decode(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=50000)
+    args = parser.parse_args()
+
+    body = json.dumps([video_file(index) for index in range(args.count)]).encode()
+    via_bytes(b"[]")  # build the cached validator outside the timings
+    print(f"{args.count} video files, {len(body) / 1e6:.1f} MB of JSON")
+    for name, decode in (("dicts", via_dicts), ("bytes", via_bytes)):
+        elapsed, peak = measure(decode, body)
+        print(f"{name:>6}: {elapsed:.3f}s, peak {peak / 1e6:.1f} MB")
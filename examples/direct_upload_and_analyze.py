@@ -6,8 +6,8 @@ Usage:
   - Run: python examples/direct_upload_and_analyze.py /path/to/video.mp4 --name "My Upload" [--subscribe]
 
 What it does:
-  1) Creates a video record with upload_method="direct" to get a presigned POST
-  2) Uploads the file bytes to S3 using the presigned form
+  1) Creates a video record with upload_method="direct" to get a presigned target
+  2) Uploads the file bytes straight to S3, resuming if interrupted
   3) Starts analysis for the created video
   4) Optionally subscribes to status updates via SSE
 """
@@ -16,98 +16,23 @@ import argparse
 import json
 import os
 import sys
-from typing import Any, Dict
-
-import requests
 
 from videojungle import ApiClient
 
 
-def _extract_upload_info(obj: Dict[str, Any]) -> Dict[str, Any]:
-    """Find the presigned POST payload in the response.
-
-    Expected shapes include one of:
-      { "upload_url": { "url": ..., "fields": {...} }, "video": {"id": ...} }
-      { "video": { "id": ..., "upload_url": { "url": ..., "fields": {...} } } }
-    """
-    if not isinstance(obj, dict):
-        raise ValueError("Unexpected response payload; expected a dict.")
-
-    upload_url = obj.get("upload_url")
-    if isinstance(upload_url, dict) and "url" in upload_url and "fields" in upload_url:
-        return upload_url
-
-    video = obj.get("video", {}) if isinstance(obj.get("video"), dict) else {}
-    upload_url = video.get("upload_url")
-    if isinstance(upload_url, dict) and "url" in upload_url and "fields" in upload_url:
-        return upload_url
-
-    raise KeyError("Could not find presigned upload_url in API response.")
-
-
-def _extract_video_id(obj: Dict[str, Any]) -> str:
-    """Extract the created video id from the API response."""
-    if isinstance(obj, dict):
-        video = obj.get("video")
-        if isinstance(video, dict) and "id" in video:
-            return str(video["id"])
-        if "id" in obj:
-            return str(obj["id"])
-    raise KeyError("Could not find video id in API response.")
-
+def subscribe_sse(vj: ApiClient, video_id: str) -> None:
+    """Print SSE status updates for the given video id.
 
-def upload_via_presigned_post(file_path: str, upload_info: Dict[str, Any]) -> None:
-    """Upload the file to S3 using a presigned POST payload."""
-    url = upload_info["url"]
-    fields = upload_info.get("fields", {})
-
-    filename = os.path.basename(file_path)
-    content_type = fields.get("Content-Type") or "application/octet-stream"
-
-    with open(file_path, "rb") as f:
-        resp = requests.post(
-            url,
-            data=fields,
-            files={"file": (filename, f, content_type)},
-        )
-
-    if resp.status_code not in (200, 201, 204):
-        # S3 may return an XML error body when something goes wrong
-        snippet = resp.text[:300].replace("\n", " ")
-        raise RuntimeError(f"S3 upload failed ({resp.status_code}): {snippet}")
-
-
-def subscribe_sse(base_url: str, video_id: str, token: str) -> None:
-    """Subscribe to SSE updates for the given video id.
-
-    Endpoint: GET /videos/{video_id}/subscribe
+    The client keeps one reconnecting connection per video and resumes
+    from the last event it received.
     """
-    url = f"{base_url}/videos/{video_id}/subscribe"
-    headers = {
-        "Accept": "text/event-stream",
-        "Cache-Control": "no-cache",
-        "X-API-Key": token,
-    }
-    with requests.get(url, headers=headers, stream=True, timeout=60) as r:
-        r.raise_for_status()
+    with vj.video_files.subscribe(video_id) as events:
         print("Subscribed to status updates (Ctrl-C to exit) ...")
-        for raw in r.iter_lines(decode_unicode=True):
-            if raw is None:
-                continue
-            line = raw.strip()
-            if not line or line.startswith(":"):
-                # comment/keepalive
-                continue
-            if line.startswith("data:"):
-                data = line[len("data:"):].strip()
-                try:
-                    obj = json.loads(data)
-                    print(f"SSE data: {json.dumps(obj, ensure_ascii=False)}")
-                except Exception:
-                    print(f"SSE data: {data}")
-            else:
-                # Other SSE fields like event:, id:, retry:
-                print(line)
+        for event in events:
+            try:
+                print(f"SSE {event.event}: {json.dumps(event.json(), ensure_ascii=False)}")
+            except ValueError:
+                print(f"SSE {event.event}: {event.data}")
 
 
 def main() -> int:
@@ -132,33 +57,20 @@ def main() -> int:
     # Initialize API client
     vj = ApiClient(token=api_key)
 
-    print("Requesting presigned POST for direct upload ...")
-    # Note: run_analysis=False because we will start analysis after upload completes
-    create_resp = vj.video_files.create(
+    print(f"Uploading '{file_path}' directly to storage ...")
+    # Retrying an interrupted upload of the same file reuses its video file while the presigned target is valid
+    video = vj.video_files.direct_upload(
+        file_path,
         name=display_name,
-        filename=os.path.basename(file_path),
-        upload_method="direct",
-        run_analysis=False,
+        run_analysis=True,
+        print_progress=True,
     )
-
-    try:
-        upload_info = _extract_upload_info(create_resp)
-        video_id = _extract_video_id(create_resp)
-    except Exception as e:
-        print(f"Failed to parse create response: {e}", file=sys.stderr)
-        return 1
-
-    print(f"Uploading '{file_path}' to S3 ...")
-    upload_via_presigned_post(file_path, upload_info)
-    print("Upload complete.")
-
-    print("Starting analysis ...")
-    vj.video_files.create_analysis(video_id)
+    video_id = video.id
     print(f"Analysis started for video id: {video_id}")
 
     if args.subscribe:
         try:
-            subscribe_sse(vj.BASE_URL, video_id, api_key)
+            subscribe_sse(vj, video_id)
         except KeyboardInterrupt:
             print("\nSSE subscription stopped by user.")
 
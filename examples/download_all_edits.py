@@ -34,45 +34,29 @@ def download_all_edits(project_id: str, output_dir: str = ".", print_progress: b
         print("No edits found in this project.")
         return
 
-    # Sort edits by creation date
+    # Sort edits by creation date and number them as episodes
     sorted_edits = sorted(edits, key=lambda x: x.get('created_at', ''))
+    episodes = {edit.get('id'): f"episode-{str(i).zfill(2)}.mp4" for i, edit in enumerate(sorted_edits, 1)}
 
     if print_progress:
         print(f"Found {len(sorted_edits)} edit(s) in the project.")
 
-    # Download each edit with sequential numbering
-    for i, edit in enumerate(sorted_edits, 1):
-        edit_id = edit.get('id')
-        edit_name = edit.get('name', f'edit_{edit_id}')
-        created_at = edit.get('created_at', 'unknown')
+    # Start every render at once and download them in parallel as they finish;
+    # episodes already downloaded by an earlier run are skipped
+    result = vj.edits.download_all(
+        project_id=project_id,
+        dest=output_dir,
+        concurrency=4,
+        filename=lambda edit: episodes.get(edit['id'], f"{edit['id']}.mp4"),
+        print_progress=print_progress
+    )
 
-        # Create episode filename with zero-padded number
-        episode_number = str(i).zfill(2)
-        output_filename = os.path.join(output_dir, f"episode-{episode_number}.mp4")
-
-        if print_progress:
-            print(f"\n[{i}/{len(sorted_edits)}] Downloading: {edit_name}")
-            print(f"  Edit ID: {edit_id}")
-            print(f"  Created: {created_at}")
-            print(f"  Saving to: {output_filename}")
-
-        try:
-            vj.edits.download_edit_render(
-                project_id=project_id,
-                edit_id=edit_id,
-                filename=output_filename,
-                print_progress=print_progress
-            )
-
-            if print_progress:
-                print(f"  ✓ Successfully downloaded: {output_filename}")
-
-        except Exception as e:
-            print(f"  ✗ Error downloading edit {edit_id}: {str(e)}")
-            continue
+    for outcome in result.failed:
+        print(f"  ✗ Error downloading edit {outcome.id}: {str(outcome.error)}")
 
     if print_progress:
-        print(f"\n✓ Download complete! All edits saved to: {output_dir}")
+        print(f"\n✓ Download complete! {result}")
+        print(f"All edits saved to: {output_dir}")
 
 
 def list_projects_interactive() -> Optional[str]:
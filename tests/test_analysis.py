@@ -0,0 +1,98 @@
+import math
+import random
+
+import pytest
+
+from videojungle import analysis
+from videojungle.analysis import AnalysisTable, IntervalIndex
+
+@pytest.fixture(params=["numpy", "pure"])
+def backend(request, monkeypatch):
+    # Runs each test on the NumPy columns and on the array.array fallback
+    if request.param == "numpy":
+        monkeypatch.setattr(analysis, "np", pytest.importorskip("numpy"))
+    else:
+        monkeypatch.setattr(analysis, "np", None)
+    return request.param
+
+def records(count, seed):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        # Integer times so that touching and duplicate endpoints are common
+        start = rng.randint(0, 200)
+        rows.append({"start": start, "end": start + rng.choice([0, 1, 5, 20, 80]),
+                     "label": rng.choice(["beach", "car", "dog"]),
+                     "score": rng.choice([None, 0.2, 0.5, 0.9])})
+    return rows
+
+def windows(seed):
+    rng = random.Random(seed)
+    pairs = [(low, low + rng.choice([0, 1, 10, 50, 300])) for low in (rng.randint(-20, 220) for _ in range(150))]
+    return pairs + [(0, 0), (200, 200), (-10, -1), (281, 400)]
+
+def naive(rows, keep):
+    return sorted((float(r["start"]), float(r["end"]), r["label"]) for r in rows if keep(r))
+
+def keys(table):
+    return sorted((segment.start, segment.end, segment.label) for segment in table)
+
+@pytest.mark.parametrize("count", [0, 1, 2, 7, 300])
+def test_overlapping_and_containing_match_naive_scan(backend, count):
+    rows = records(count, seed=count)
+    index = IntervalIndex(AnalysisTable.from_records(rows))
+    for low, high in windows(count):
+        assert keys(index.overlapping(low, high)) == naive(rows, lambda r: r["start"] <= high and r["end"] >= low)
+        assert keys(index.containing(low, high)) == naive(rows, lambda r: r["start"] >= low and r["end"] <= high)
+        assert keys(index.at(low)) == naive(rows, lambda r: r["start"] <= low <= r["end"])
+        beach = index.overlapping(low, high, labels=["beach", "dog"])
+        assert keys(beach) == naive(rows, lambda r: r["label"] in ("beach", "dog") and r["start"] <= high and r["end"] >= low)
+
+def test_results_come_back_in_start_order(backend):
+    index = IntervalIndex(AnalysisTable.from_records(records(300, seed=1)))
+    for low, high in windows(1):
+        for table in (index.overlapping(low, high), index.containing(low, high)):
+            order = [(segment.start, segment.end) for segment in table]
+            assert order == sorted(order)
+
+def test_range_minimum_matches_naive_scan(backend):
+    index = IntervalIndex(AnalysisTable.from_records(records(300, seed=2)))
+    ends = index._ends
+    rng = random.Random(2)
+    for _ in range(500):
+        low = rng.randrange(len(ends))
+        high = rng.randrange(low, len(ends))
+        assert ends[index._argmin_end(low, high)] == min(ends[low:high + 1])
+
+def test_nearest_matches_naive_scan(backend):
+    rows = records(300, seed=3)
+    index = IntervalIndex(AnalysisTable.from_records(rows))
+    for point in [-5, 0, 13.5, 99, 250, 400]:
+        distance = min(0.0 if r["start"] <= point <= r["end"] else min(abs(r["start"] - point), abs(r["end"] - point))
+                       for r in rows)
+        segment = index.nearest(point)
+        assert min(abs(segment.start - point), abs(segment.end - point), 0.0 if segment.start <= point <= segment.end else math.inf) == distance
+    assert IntervalIndex(AnalysisTable.from_records([])).nearest(1.0) is None
+
+def test_where_matches_naive_scan(backend):
+    rows = records(300, seed=4)
+    table = AnalysisTable.from_records(rows)
+    for low, high in windows(4)[:40]:
+        assert keys(table.where(start=low, end=high, labels=["car"], min_score=0.5)) == naive(
+            rows, lambda r: r["label"] == "car" and r["score"] is not None and r["score"] >= 0.5 and r["start"] <= high and r["end"] >= low)
+        assert keys(table.between(low, high, contained=True)) == naive(rows, lambda r: r["start"] >= low and r["end"] <= high)
+
+def test_backends_agree(monkeypatch):
+    numpy = pytest.importorskip("numpy")
+    rows = records(300, seed=5)
+
+    def answers():
+        index = IntervalIndex(AnalysisTable.from_records(rows))
+        return index._min_end, [index.containing(low, high).to_records() for low, high in windows(5)]
+    vectorized = answers()
+    monkeypatch.setattr(analysis, "np", None)
+    assert answers() == vectorized
+
+def test_reversed_window_is_rejected(backend):
+    with pytest.raises(ValueError):
+        IntervalIndex(AnalysisTable.from_records(records(5, seed=6))).overlapping(10, 5)
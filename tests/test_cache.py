@@ -0,0 +1,56 @@
+import json
+
+from videojungle import ApiClient, ResponseCache
+from videojungle.jobs import prompt_ready_check
+
+PROMPT_ID = "0f8e2a7e-1111-2222-3333-444455556666"
+
+class FakeResponse:
+    def __init__(self, body, headers=None, status_code=200):
+        self.content = body
+        self.headers = headers or {}
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+def prompt(value):
+    return json.dumps({"id": PROMPT_ID, "value": value, "persona": "p", "created_at": "2024-05-01",
+                       "parameters": [], "name": "n", "task": None}).encode()
+
+def client(bodies, headers=None):
+    cache = ResponseCache(ttls={"/prompts/{id}": 600})
+    vj = ApiClient(token="token", cache=cache)
+    sent = []
+
+    def send(method, url, endpoint, deadline, **kwargs):
+        sent.append(kwargs["headers"])
+        return FakeResponse(bodies.pop(0), headers)
+    vj._send_with_retries = send
+    return vj, cache, sent
+
+def test_status_polls_reach_the_server():
+    vj, cache, sent = client([prompt("generating..."), prompt("generating..."), prompt("done")])
+    check = prompt_ready_check(vj, PROMPT_ID)
+    assert check()[0] is False
+    assert check()[0] is False
+    finished, result = check()
+    assert finished and result.value == "done"
+    assert len(sent) == 3
+    assert cache.hits == 0
+
+def test_bypass_refreshes_cached_entry():
+    vj, cache, sent = client([prompt("generating..."), prompt("done")])
+    assert vj._make_request("GET", f"/prompts/{PROMPT_ID}")["value"] == "generating..."
+    assert vj._make_request("GET", f"/prompts/{PROMPT_ID}", use_cache=False)["value"] == "done"
+    # A normal read afterwards is served from the refreshed entry
+    assert vj._make_request("GET", f"/prompts/{PROMPT_ID}")["value"] == "done"
+    assert len(sent) == 2
+    assert cache.hits == 1
+
+def test_bypass_revalidates_with_validators():
+    vj, cache, sent = client([prompt("done"), prompt("done")], headers={"ETag": '"v1"'})
+    vj._make_request("GET", f"/prompts/{PROMPT_ID}")
+    vj._make_request("GET", f"/prompts/{PROMPT_ID}", use_cache=False)
+    assert sent[1].get("If-None-Match") == '"v1"'
+    assert cache.hits == 0
@@ -0,0 +1,114 @@
+import hashlib
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from videojungle import ApiClient
+from videojungle.dedup import DedupIndex, hash_file
+
+class FakeLibrary:
+    # Stands in for the client's video_files listing
+    def __init__(self, videos):
+        self.videos = videos
+        self.listings = 0
+
+    def iter_list(self):
+        self.listings += 1
+        return iter(self.videos)
+
+def library(*videos):
+    return SimpleNamespace(video_files=FakeLibrary([SimpleNamespace(id=i, size=s, hash=h) for i, s, h in videos]))
+
+@pytest.fixture
+def index(tmp_path):
+    dedup = DedupIndex(str(tmp_path / "dedup.sqlite3"))
+    yield dedup
+    dedup.close()
+
+@pytest.fixture
+def clip(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(os.urandom(20000))
+    return str(path)
+
+def test_files_of_unknown_size_are_not_hashed_up_front(index, clip):
+    assert index.match_video_file(None, clip) == (None, None)
+    assert index.stats() == {"hits": 0, "misses": 1}
+
+def test_recorded_upload_is_matched_by_content(index, clip, tmp_path):
+    index.record(hash_file(clip), clip, "video_file", "v1")
+    copy = tmp_path / "copy.mp4"
+    copy.write_bytes(open(clip, "rb").read())
+    assert index.match_video_file(None, str(copy)) == (hash_file(clip), "v1")
+    # Same size, different content
+    other = tmp_path / "other.mp4"
+    other.write_bytes(os.urandom(20000))
+    assert index.match_video_file(None, str(other))[1] is None
+    assert index.stats() == {"hits": 1, "misses": 1}
+
+def test_assets_match_per_project_then_fall_back_to_video_files(index, clip):
+    file_hash = hash_file(clip)
+    index.record(file_hash, clip, "asset", "a1", "p1")
+    assert index.match_asset(None, clip, "p1") == (file_hash, "a1", None)
+    assert index.match_asset(None, clip, "p2") == (file_hash, None, None)
+    index.record(file_hash, clip, "video_file", "v1")
+    assert index.match_asset(None, clip, "p2") == (file_hash, None, "v1")
+
+def test_forget_and_persistence(tmp_path, clip):
+    path = str(tmp_path / "dedup.sqlite3")
+    first = DedupIndex(path)
+    first.record(hash_file(clip), clip, "video_file", "v1")
+    first.close()
+    second = DedupIndex(path)
+    assert second.match_video_file(None, clip)[1] == "v1"
+    second.forget("video_file", "v1")
+    assert second.match_video_file(None, clip)[1] is None
+    second.close()
+
+def test_changed_file_is_rehashed(index, clip):
+    index.record(hash_file(clip), clip, "video_file", "v1")
+    with open(clip, "r+b") as f:
+        f.write(b"changed!")
+    os.utime(clip, ns=(0, 0))
+    assert index.match_video_file(None, clip) == (hash_file(clip), None)
+
+def test_server_check_is_opt_in(index, clip):
+    server = library(("v9", 20000, hash_file(clip)))
+    assert index.match_video_file(server, clip) == (None, None)
+    assert server.video_files.listings == 0
+
+def test_server_hashes_match_and_drop_deleted_files(tmp_path, clip):
+    index = DedupIndex(str(tmp_path / "dedup.sqlite3"), check_server=True)
+    gone = tmp_path / "gone.mp4"
+    gone.write_bytes(b"x")
+    index.record(hash_file(str(gone)), str(gone), "video_file", "deleted")
+    server = library(("v9", 20000, hash_file(clip).upper()), ("v10", None, "abc"))
+    assert index.match_video_file(server, clip) == (hash_file(clip), "v9")
+    assert index.match_video_file(server, str(gone))[1] is None
+    # Listing is cached for server_ttl
+    assert server.video_files.listings == 1
+    index.close()
+
+class FakeUploads:
+    # _make_request stand-in that consumes the streamed body like a real session
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, method, endpoint, **kwargs):
+        self.calls.append((method, endpoint))
+        if "data" in kwargs:
+            for _ in kwargs["data"]:
+                pass
+            return {"id": f"v{len(self.calls)}"}
+        return {"video": {"id": "new"}}
+
+def test_create_reuses_uploaded_content(index, clip):
+    vj = ApiClient(token="token", dedup=index)
+    vj._make_request = uploads = FakeUploads()
+    vj.video_files.get = lambda video_file_id: video_file_id
+    uploaded = vj.video_files.create("clip", clip, run_analysis=False)
+    # Hashed while streaming, then matched without another upload
+    assert index.match_video_file(None, clip) == (hashlib.sha256(open(clip, "rb").read()).hexdigest(), uploaded)
+    assert vj.video_files.create("again", clip, run_analysis=False) == uploaded
+    assert [endpoint for _, endpoint in uploads.calls] == ["/video-file", "/video-file/new/upload-video"]
@@ -0,0 +1,157 @@
+import hashlib
+import os
+
+import pytest
+
+from videojungle import ApiClient
+from videojungle.downloads import DownloadVerificationError, RangeDownloader, download_complete, hash_algorithm
+
+class FakeRaw:
+    # urllib3-style raw body that can drop the connection after `fail_after` bytes
+    def __init__(self, data, fail_after=None):
+        self.data = data
+        self.position = 0
+        self.fail_after = fail_after
+        self.decode_content = False
+
+    def readinto(self, buffer):
+        if self.fail_after is not None and self.position >= self.fail_after:
+            raise ConnectionError("connection reset")
+        end = len(self.data) if self.fail_after is None else min(len(self.data), self.fail_after)
+        count = min(len(buffer), end - self.position, 1000)
+        buffer[:count] = self.data[self.position:self.position + count]
+        self.position += count
+        return count
+
+class FakeResponse:
+    def __init__(self, status_code, data, headers, fail_after=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.raw = FakeRaw(data, fail_after)
+        self.text = ""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+class FakeServer:
+    # Serves one object with Range and If-Range support
+    def __init__(self, data, etag='"v1"'):
+        self.data = data
+        self.etag = etag
+        self.ranges = []
+        self.fail_after = None
+
+    def get(self, url, headers, stream, timeout):
+        byte_range = headers.get("Range")
+        self.ranges.append(byte_range)
+        base = {"ETag": self.etag}
+        if byte_range is None or headers.get("If-Range", self.etag) != self.etag:
+            return FakeResponse(200, self.data, dict(base, **{"Content-Length": str(len(self.data))}), self.fail_after)
+        first, _, last = byte_range[len("bytes="):].partition("-")
+        first, last = int(first), int(last) if last else len(self.data) - 1
+        body = self.data[first:last + 1]
+        headers = dict(base, **{"Content-Range": f"bytes {first}-{last}/{len(self.data)}", "Content-Length": str(len(body))})
+        return FakeResponse(206, body, headers, self.fail_after if first else None)
+
+DATA = os.urandom(50000)
+SHA256 = hashlib.sha256(DATA).hexdigest()
+
+def downloader(server, **kwargs):
+    kwargs.setdefault("part_size", 8192)
+    kwargs.setdefault("buffer_size", 4096)
+    return RangeDownloader(server, **kwargs)
+
+def test_hash_algorithm_needs_explicit_algorithm():
+    assert hash_algorithm(f"sha256:{SHA256.upper()}") == ("sha256", SHA256)
+    assert hash_algorithm("SHA-256:abc") == ("sha256", "abc")
+    # A bare digest is never guessed from its length
+    assert hash_algorithm(SHA256) is None
+    assert hash_algorithm("crc99:abc") is None
+    assert hash_algorithm(None) is None
+
+def test_streamed_download_resumes_after_interruption(tmp_path):
+    server = FakeServer(DATA)
+    server.fail_after = 20000
+    target = str(tmp_path / "out.mp4")
+    with pytest.raises(ConnectionError):
+        downloader(server).download("u", target, expected_size=len(DATA), expected_hash=f"sha256:{SHA256}")
+    assert not download_complete(target, len(DATA))
+    server.fail_after = None
+    downloader(server).download("u", target, expected_size=len(DATA), expected_hash=f"sha256:{SHA256}")
+    with open(target, "rb") as f:
+        assert f.read() == DATA
+    # Resumed from the last journaled checkpoint instead of byte 0
+    assert server.ranges[-1] == "bytes=16384-"
+    assert not os.path.exists(f"{target}.part")
+
+def test_parallel_download_resumes_missing_ranges(tmp_path):
+    server = FakeServer(DATA)
+    target = str(tmp_path / "out.mp4")
+    failing = downloader(server, min_parallel_size=0, max_workers=1)
+    server.fail_after = 1000
+    with pytest.raises(ConnectionError):
+        failing.download("u", target, expected_hash=f"sha256:{SHA256}")
+    server.fail_after = None
+    server.ranges.clear()
+    downloader(server, min_parallel_size=0).download("u", target, expected_hash=f"sha256:{SHA256}")
+    with open(target, "rb") as f:
+        assert f.read() == DATA
+    assert "bytes=0-8191" not in server.ranges
+
+def test_changed_object_restarts(tmp_path):
+    server = FakeServer(DATA)
+    server.fail_after = 20000
+    target = str(tmp_path / "out.mp4")
+    with pytest.raises(ConnectionError):
+        downloader(server).download("u", target)
+    server.fail_after = None
+    server.etag = '"v2"'
+    downloader(server).download("u", target, expected_hash=f"sha256:{SHA256}")
+    with open(target, "rb") as f:
+        assert f.read() == DATA
+
+def test_size_mismatch(tmp_path):
+    target = str(tmp_path / "out.mp4")
+    with pytest.raises(DownloadVerificationError):
+        downloader(FakeServer(DATA)).download("u", target, expected_size=len(DATA) + 1)
+    assert not os.path.exists(target)
+
+def test_hash_mismatch_discards_part_file(tmp_path):
+    target = str(tmp_path / "out.mp4")
+    with pytest.raises(DownloadVerificationError):
+        downloader(FakeServer(DATA)).download("u", target, expected_hash=f"sha256:{'0' * 64}")
+    assert not os.path.exists(target)
+    assert not os.path.exists(f"{target}.part")
+    assert not os.path.exists(f"{target}.part.json")
+
+def test_bare_hash_is_not_verified(tmp_path):
+    target = str(tmp_path / "out.mp4")
+    # An md5-length value that is not the file's md5 must not fail the download
+    downloader(FakeServer(DATA)).download("u", target, expected_size=len(DATA), expected_hash="0" * 32)
+    with open(target, "rb") as f:
+        assert f.read() == DATA
+
+def test_download_complete_checks_size(tmp_path):
+    path = tmp_path / "render.mp4"
+    path.write_bytes(DATA[:1000])
+    assert not download_complete(str(path), len(DATA))
+    assert not download_complete(str(path), None)
+    assert download_complete(str(path), 1000)
+    (tmp_path / "render.mp4.part").write_bytes(b"")
+    assert not download_complete(str(path), 1000)
+
+def test_remote_size(tmp_path):
+    assert downloader(FakeServer(DATA)).remote_size("u") == len(DATA)
+
+def test_bulk_download_replaces_truncated_files(tmp_path):
+    truncated, complete = tmp_path / "a.mp4", tmp_path / "b.mp4"
+    truncated.write_bytes(DATA[:100])
+    complete.write_bytes(DATA)
+    vj = ApiClient(token="token")
+    vj.downloader = downloader(FakeServer(DATA))
+    result = vj._download_many([("a", str(truncated), "u"), ("b", str(complete), "u")], 2, None, False)
+    assert [outcome.skipped for outcome in result] == [False, True]
+    assert truncated.read_bytes() == DATA
@@ -0,0 +1,168 @@
+import asyncio
+import contextlib
+import queue
+import threading
+
+import pytest
+
+from videojungle.events import CONNECTED, AsyncEventMultiplexer, EventMultiplexer, SSEParser, ServerSentEvent, iter_sse
+from videojungle.jobs import Job
+from videojungle.retry import RetryPolicy
+from videojungle.timeouts import Timeout
+
+class FakeStream:
+    # Streaming response that stays open, sending queued lines, until closed
+    status_code = 200
+
+    def __init__(self, headers, timeout):
+        self.headers = headers
+        self.timeout = timeout
+        self.lines: "queue.Queue" = queue.Queue()
+        self.opened = threading.Event()
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self, decode_unicode=True):
+        self.opened.set()
+        while True:
+            line = self.lines.get()
+            if line is None:
+                return
+            yield line
+
+    def close(self):
+        self.lines.put(None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class FakeSession:
+    def __init__(self):
+        self.streams = []
+        self.opened = threading.Condition()
+
+    def get(self, url, headers, stream, timeout):
+        response = FakeStream(headers, timeout)
+        with self.opened:
+            self.streams.append(response)
+            self.opened.notify_all()
+        return response
+
+    def wait_for(self, count):
+        with self.opened:
+            assert self.opened.wait_for(lambda: len(self.streams) >= count, timeout=5)
+        self.streams[count - 1].opened.wait(5)
+        return self.streams[count - 1]
+
+class FakeClient:
+    BASE_URL = "https://api.example.com"
+    token = "token"
+
+    def __init__(self):
+        self.session = FakeSession()
+        self.timeout = Timeout(connect=5, read=120)
+        self.retry = RetryPolicy()
+
+@pytest.fixture
+def multiplexer():
+    multiplexer = EventMultiplexer(FakeClient())
+    yield multiplexer
+    multiplexer.close()
+
+def test_parser_fields():
+    lines = ["retry: 1500", "id: 7", "event: status", "data: {\"a\":", "data: 1}", "", ": keep-alive", "", "data: x", ""]
+    events = list(iter_sse(lines))
+    assert events == [ServerSentEvent("{\"a\":\n1}", "status", "7", 1500), ServerSentEvent("x", "message", "7", None)]
+    assert events[0].json() == {"a": 1}
+
+def test_parser_ignores_ids_with_nul_and_bad_retry():
+    parser = SSEParser()
+    for line in ["id: a\0b", "retry: soon", "data:no-space"]:
+        assert parser.feed(line) is None
+    assert parser.feed("") == ServerSentEvent("no-space", "message", None, None)
+
+def test_late_subscriber_receives_connected(multiplexer):
+    first = []
+    multiplexer.subscribe("/videos/v/subscribe", callback=first.append)
+    multiplexer.client.session.wait_for(1)
+    late = []
+    multiplexer.subscribe("/videos/v/subscribe", callback=late.append)
+    assert late == [CONNECTED]
+    assert multiplexer.channels() == 1
+
+def test_late_watch_polls_finished_resource(multiplexer):
+    path = "/videos/v/subscribe"
+    multiplexer.subscribe(path, callback=lambda item: None)
+    multiplexer.client.session.wait_for(1)
+
+    # Mirrors ApiClient._watch: the job is only checked on CONNECTED or an event
+    job = Job("analysis", {}, lambda: (True, "done"))
+    multiplexer.subscribe(path, callback=lambda item: job.poll() if item is CONNECTED else None)
+    assert job.result(timeout=1) == "done"
+
+def test_stale_last_event_id_gets_own_connection(multiplexer):
+    path = "/videos/v/subscribe"
+    multiplexer.subscribe(path, callback=lambda item: None)
+    stream = multiplexer.client.session.wait_for(1)
+    stream.lines.put("id: 5")
+    stream.lines.put("data: x")
+    stream.lines.put("")
+
+    received = queue.Queue()
+    multiplexer.subscribe(path, callback=lambda item: received.put(item) if item is not CONNECTED else None)
+    # Wait until the shared channel has seen event 5
+    assert received.get(timeout=5).id == "5"
+    multiplexer.subscribe(path, callback=lambda item: None, last_event_id="2")
+    resumed = multiplexer.client.session.wait_for(2)
+    assert resumed.headers["Last-Event-ID"] == "2"
+    assert multiplexer.channels() == 2
+
+def test_streams_have_no_read_timeout(multiplexer):
+    multiplexer.subscribe("/videos/v/subscribe", callback=lambda item: None)
+    assert multiplexer.client.session.wait_for(1).timeout == (5, None)
+    multiplexer.read_timeout = 300
+    multiplexer.subscribe("/assets/a/subscribe", callback=lambda item: None)
+    assert multiplexer.client.session.wait_for(2).timeout == (5, 300)
+
+class FakeAsyncStream:
+    def __init__(self):
+        self.opened = asyncio.Event()
+
+    def raise_for_status(self):
+        pass
+
+    async def aiter_lines(self):
+        self.opened.set()
+        await asyncio.Event().wait()
+        yield ""
+
+class FakeHTTP:
+    def __init__(self):
+        self.streams = []
+
+    @contextlib.asynccontextmanager
+    async def stream(self, method, url, headers, timeout):
+        response = FakeAsyncStream()
+        response.timeout = timeout
+        self.streams.append(response)
+        yield response
+
+def test_async_late_subscriber_receives_connected():
+    async def run():
+        client = FakeClient()
+        client.http = FakeHTTP()
+        multiplexer = AsyncEventMultiplexer(client)
+        first = multiplexer.subscribe("/videos/v/subscribe")
+        while not client.http.streams:
+            await asyncio.sleep(0)
+        await client.http.streams[0].opened.wait()
+        late = multiplexer.subscribe("/videos/v/subscribe")
+        assert await asyncio.wait_for(late._next(connects=True), 1) is CONNECTED
+        assert client.http.streams[0].timeout.read is None
+        first.close()
+        late.close()
+    asyncio.run(run())
@@ -0,0 +1,31 @@
+import threading
+import time
+
+from videojungle.jobs import Job, JobPoller
+
+def test_slow_check_does_not_stall_other_jobs():
+    poller = JobPoller(tick=0.01)
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return True, "slow"
+
+    slow_job = poller.submit(Job("render", {}, slow))
+    fast_job = poller.submit(Job("render", {}, lambda: (True, "fast")))
+    try:
+        assert fast_job.result(timeout=1) == "fast"
+        assert not slow_job.done()
+    finally:
+        release.set()
+    assert slow_job.result(timeout=5) == "slow"
+    poller.close()
+
+def test_poller_thread_exits_when_idle():
+    poller = JobPoller(tick=0.01)
+    poller.submit(Job("render", {}, lambda: (True, None))).result(timeout=1)
+    deadline = time.monotonic() + 1
+    while poller._thread is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert poller._thread is None
+    assert poller.pending() == 0
@@ -0,0 +1,48 @@
+import json
+import random
+
+import pytest
+
+from videojungle.listing import JSONArrayParser
+
+SAMPLES = [
+    [],
+    [-2.5, 1e10, -0.0, 3, 1.25e-7, 12345678901234567890],
+    [{"duration": 12.5, "score": 0.93, "start": -1.5e3, "label": "é☃"}, {"fps": 29.97, "size": 48000000}],
+    [True, False, None, "x", [], {}, [1.5, [2e-3]], {"a": {"b": [0.1]}}],
+]
+
+def parse(chunks):
+    parser = JSONArrayParser()
+    items = []
+    for chunk in chunks:
+        items += parser.feed(chunk)
+    return items + parser.close()
+
+@pytest.mark.parametrize("value", SAMPLES)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_every_split_offset(value, indent):
+    body = json.dumps(value, indent=indent).encode()
+    for offset in range(len(body) + 1):
+        assert parse([body[:offset], body[offset:]]) == json.loads(body), offset
+
+@pytest.mark.parametrize("value", SAMPLES)
+def test_byte_by_byte(value):
+    body = json.dumps(value).encode()
+    assert parse([body[i:i + 1] for i in range(len(body))]) == json.loads(body)
+
+def test_random_chunks():
+    rng = random.Random(7)
+    for _ in range(300):
+        value = [rng.choice([rng.uniform(-1e6, 1e6), rng.randint(-10**6, 10**6), rng.random() * 1e-9,
+                             {"t": rng.uniform(0, 3600), "n": [rng.random()]}, "s" * rng.randint(0, 5), None])
+                 for _ in range(rng.randint(0, 30))]
+        body = json.dumps(value).encode()
+        cuts = sorted(rng.sample(range(len(body) + 1), min(len(body) + 1, rng.randint(0, 10))))
+        chunks = [body[a:b] for a, b in zip([0] + cuts, cuts + [len(body)])]
+        assert parse(chunks) == json.loads(body)
+
+@pytest.mark.parametrize("body", [b"[1,2", b'{"a": 1}', b"[1,,2]", b"[1] x", b"[1.5x]", b"[-]"])
+def test_invalid(body):
+    with pytest.raises(ValueError):
+        parse([body])
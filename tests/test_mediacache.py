@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+
+import pytest
+
+from videojungle.mediacache import MediaCache, media_key
+
+class Origin:
+    # Counts downloads and writes `size` bytes to the requested path
+    def __init__(self, size=1000, delay=0.0):
+        self.size = size
+        self.delay = delay
+        self.downloads = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, path):
+        with self._lock:
+            self.downloads += 1
+        time.sleep(self.delay)
+        with open(path, "wb") as f:
+            f.write(b"v" * self.size)
+
+@pytest.fixture
+def cache(tmp_path):
+    media = MediaCache(str(tmp_path / "cache"), link="copy")
+    yield media
+    media.close()
+
+def test_media_key_includes_server_hash():
+    assert media_key("video_file", "v1", "ABC") == "video_file/v1/abc"
+    assert media_key("asset", "a1") == "asset/a1/-"
+    assert media_key("video_file", "v1", "abc") != media_key("video_file", "v1", "def")
+
+def test_second_fetch_is_served_from_cache(cache, tmp_path):
+    origin = Origin()
+    first, second = str(tmp_path / "first.mp4"), str(tmp_path / "second.mp4")
+    assert cache.fetch("asset/a1/-", first, origin) == first
+    assert cache.fetch("asset/a1/-", second, origin) == second
+    assert origin.downloads == 1
+    assert open(second, "rb").read() == b"v" * 1000
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (1, 1, 1, 1000)
+
+def test_concurrent_fetches_download_once(cache, tmp_path):
+    origin = Origin(delay=0.1)
+    threads = [threading.Thread(target=cache.fetch, args=("asset/a1/-", str(tmp_path / f"{n}.mp4"), origin)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert origin.downloads == 1
+    assert all(os.path.getsize(tmp_path / f"{n}.mp4") == 1000 for n in range(4))
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = MediaCache(str(tmp_path / "cache"), max_bytes=2500, link="copy")
+    origin = Origin()
+    target = str(tmp_path / "out.mp4")
+    cache.fetch("a", target, origin)
+    cache.fetch("b", target, origin)
+    cache.fetch("a", target, origin)
+    cache.fetch("c", target, origin)
+    assert cache.stats()["evictions"] == 1
+    assert cache.size() <= 2500
+    downloads = origin.downloads
+    cache.fetch("a", target, origin)
+    assert origin.downloads == downloads
+    cache.fetch("b", target, origin)
+    assert origin.downloads == downloads + 1
+    cache.close()
+
+def test_missing_object_is_downloaded_again(cache, tmp_path):
+    origin = Origin()
+    target = str(tmp_path / "out.mp4")
+    cache.fetch("a", target, origin)
+    os.remove(cache._object_path("a"))
+    cache.fetch("a", target, origin)
+    assert origin.downloads == 2
+    assert os.path.getsize(target) == 1000
+
+def test_failed_download_leaves_no_entry(cache, tmp_path):
+    def fail(path):
+        raise ConnectionError("reset")
+    with pytest.raises(ConnectionError):
+        cache.fetch("a", str(tmp_path / "out.mp4"), fail)
+    assert cache.stats()["entries"] == 0
+    assert not os.path.exists(tmp_path / "out.mp4")
+
+def test_link_modes(tmp_path):
+    origin = Origin()
+    hardlinked = MediaCache(str(tmp_path / "hard"), link="hardlink")
+    target = str(tmp_path / "hard.mp4")
+    hardlinked.fetch("a", target, origin)
+    assert os.path.samefile(target, hardlinked._object_path("a"))
+    hardlinked.close()
+    copied = MediaCache(str(tmp_path / "copy"), link="copy")
+    target = str(tmp_path / "copy.mp4")
+    copied.fetch("a", target, origin)
+    assert not os.path.samefile(target, copied._object_path("a"))
+    copied.close()
+    with pytest.raises(ValueError):
+        MediaCache(str(tmp_path / "bad"), link="symlink")
@@ -0,0 +1,91 @@
+import copy
+import json
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pydantic import ValidationError
+
+from videojungle.model import Project, load_model, validate_json_response
+from videojungle.uploads import BulkUploadResult
+
+def asset(n):
+    return {
+        "id": f"a{n}", "keyname": f"k{n}", "url": None, "download_url": f"https://cdn/{n}.mp4",
+        "asset_path": None, "asset_type": "video", "created_at": "2024-01-01", "description": None,
+        "generated_description": None, "create_parameters": '{"seed": %d}' % n, "status": "ready", "uploaded": True,
+    }
+
+def project(name="demo", assets=3):
+    return {
+        "id": "p1", "name": name, "description": None, "data": {"k": 1}, "created_at": "2024-01-01",
+        "owner_id": "u1", "asset_count": assets,
+        "assets": [asset(n) for n in range(assets)],
+        "prompts": [{"id": "pr1"}],
+        "scripts": [{"id": "s1", "project_id": "p1", "value": {}, "inputs": [], "name": "s", "created_at": "2024-01-01"}],
+    }
+
+def test_lazy_defers_nested_validation():
+    payload = project()
+    payload["assets"][1]["uploaded"] = "not a bool"
+    lazy = load_model(Project, payload, "lazy")
+    assert not lazy.is_hydrated
+    assert lazy.name == "demo"
+    with pytest.raises(ValidationError):
+        lazy.assets
+    with pytest.raises(ValidationError):
+        load_model(Project, payload, "full")
+
+@pytest.mark.parametrize("via_json", [False, True])
+def test_lazy_matches_full_on_first_access(via_json):
+    if via_json:
+        body = json.dumps(project()).encode()
+        full = validate_json_response(Project, body, "full")
+        lazy = validate_json_response(Project, body, "lazy")
+    else:
+        full, lazy = load_model(Project, project(), "full"), load_model(Project, project(), "lazy")
+    for name in Project.lazy_fields:
+        assert getattr(lazy, name) == getattr(full, name)
+    assert lazy.is_hydrated
+    assert lazy == full
+    assert lazy.assets[0].create_parameters == {"seed": 0}
+
+def test_lazy_dump_and_copy_match_full():
+    full, lazy = load_model(Project, project(), "full"), load_model(Project, project(), "lazy")
+    assert copy.deepcopy(load_model(Project, project(), "lazy")) == full
+    assert lazy.model_dump() == full.model_dump()
+    assert lazy.model_dump_json() == full.model_dump_json()
+
+def test_lazy_list_response():
+    body = json.dumps([project("a"), project("b", 1)]).encode()
+    full = validate_json_response(List[Project], body, "full")
+    lazy = validate_json_response(List[Project], body, "lazy")
+    assert [p.is_hydrated for p in lazy] == [False, False]
+    assert lazy == full
+
+@pytest.mark.parametrize("hydration", ["full", "lazy"])
+def test_refresh_from_matches_across_hydration(hydration):
+    expected = load_model(Project, project("renamed", 5), "full")
+    current = load_model(Project, project(), hydration)
+    current._client = expected._client = client = object()
+    current._refresh_from(load_model(Project, project("renamed", 5), hydration))
+    assert current._client is client
+    assert current == expected
+    assert [a.id for a in current.assets] == [f"a{n}" for n in range(5)]
+
+def test_refresh_from_overrides_unread_lazy_field():
+    # The refreshed value wins over a stale deferred payload that was never read
+    current = load_model(Project, project(), "lazy")
+    current._refresh_from(load_model(Project, project("renamed", 1), "lazy"))
+    current.hydrate()
+    assert len(current.assets) == 1 and current.asset_count == 1
+
+@pytest.mark.parametrize("hydration", ["full", "lazy"])
+def test_upload_assets_refreshes_every_lazy_field(hydration):
+    refreshed = load_model(Project, project("after", 4), hydration)
+    fake = SimpleNamespace(assets=SimpleNamespace(bulk_upload=lambda *args, **kwargs: BulkUploadResult([], refreshed, 0.0)))
+    current = load_model(Project, project(), hydration)
+    result = current.upload_assets([], client=fake)
+    assert result.project is refreshed
+    assert current == load_model(Project, project("after", 4), "full")
+    assert current.is_hydrated
@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import io
+import os
+from email.parser import BytesParser
+
+import pytest
+
+from videojungle.multipart import MultipartEncoder
+
+class Hasher:
+    # Minimal hasher with the update()/reset() interface the encoder feeds
+    def __init__(self):
+        self.reset()
+
+    def update(self, chunk):
+        self.digest.update(chunk)
+
+    def reset(self):
+        self.digest = hashlib.sha256()
+
+class Unsized(io.RawIOBase):
+    # A pipe-like stream: readable, but with no size and no seeking
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self.data.readinto(buffer)
+
+def parse(encoder, body):
+    message = BytesParser().parsebytes(f"Content-Type: {encoder.content_type}\r\n\r\n".encode() + body)
+    return {part.get_param("name", header="content-disposition"): part for part in message.get_payload()}
+
+def encode(encoder):
+    return b"".join(bytes(chunk) for chunk in encoder)
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(os.urandom(300000))
+    return path
+
+def test_body_round_trips(video):
+    with open(video, "rb") as f:
+        encoder = MultipartEncoder({"key": "uploads/clip.mp4", "raw": b"\x00\x01", "file": ("clip.mp4", f, "video/mp4")}, chunk_size=4096)
+        body = encode(encoder)
+    parts = parse(encoder, body)
+    assert parts["key"].get_payload(decode=True) == b"uploads/clip.mp4"
+    assert parts["raw"].get_payload(decode=True) == b"\x00\x01"
+    assert parts["file"].get_filename() == "clip.mp4"
+    assert parts["file"].get_content_type() == "video/mp4"
+    assert parts["file"].get_payload(decode=True) == video.read_bytes()
+    assert len(encoder) == encoder.length == len(body)
+    assert encoder.headers()["Content-Length"] == str(len(body))
+
+def test_file_is_sent_from_its_current_position(video):
+    with open(video, "rb") as f:
+        f.seek(1000)
+        encoder = MultipartEncoder({"file": f})
+        body = encode(encoder)
+    parts = parse(encoder, body)
+    assert parts["file"].get_filename() == "clip.mp4"
+    assert parts["file"].get_payload(decode=True) == video.read_bytes()[1000:]
+    assert encoder.length == len(body)
+
+def test_body_can_be_sent_again(video):
+    hasher = Hasher()
+    with open(video, "rb") as f:
+        encoder = MultipartEncoder({"file": f}, chunk_size=65536, hasher=hasher)
+        first = encode(encoder)
+        assert encode(encoder) == first
+    assert hasher.digest.hexdigest() == hashlib.sha256(video.read_bytes()).hexdigest()
+
+def test_unsized_stream_is_chunked():
+    data = os.urandom(5000)
+    encoder = MultipartEncoder({"file": ("clip.mp4", Unsized(data))}, chunk_size=1000)
+    assert encoder.length is None and len(encoder) == 0
+    assert "Content-Length" not in encoder.headers()
+    body = encode(encoder)
+    assert parse(encoder, body)["file"].get_payload(decode=True) == data
+    with pytest.raises(ValueError):
+        encode(encoder)
+
+def test_async_body_matches_sync(video):
+    async def collect(body):
+        return b"".join([chunk async for chunk in body])
+    with open(video, "rb") as f:
+        encoder = MultipartEncoder({"file": f}, boundary="b", chunk_size=8192)
+        expected = encode(encoder)
+        assert asyncio.run(collect(encoder.async_body())) == expected
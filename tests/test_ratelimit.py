@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import pytest
+
+from videojungle.ratelimit import FileLockBackend, InMemoryBackend, RateLimiter, RateLimitExceeded, classify_endpoint
+
+@pytest.mark.parametrize("method, endpoint, has_files, expected", [
+    ("POST", "/video-files/search", False, "search"),
+    ("GET", "/projects/p1", False, "reads"),
+    ("POST", "/assets/upload", False, "upload"),
+    ("POST", "/video-file", True, "upload"),
+    ("POST", "/projects/p1/generate", False, "generate"),
+    ("POST", "/video-edits/e1/render", False, "generate"),
+    ("PUT", "/projects/p1", False, "writes"),
+])
+def test_classify_endpoint(method, endpoint, has_files, expected):
+    assert classify_endpoint(method, endpoint, has_files) == expected
+
+def test_bucket_allows_burst_then_refills():
+    backend = InMemoryBackend()
+    assert [backend.take("b", 10.0, 3, 1) for _ in range(3)] == [0.0, 0.0, 0.0]
+    wait = backend.take("b", 10.0, 3, 1)
+    assert 0 < wait <= 0.1
+    time.sleep(wait + 0.01)
+    assert backend.take("b", 10.0, 3, 1) == 0.0
+
+def test_non_blocking_limiter_raises():
+    limiter = RateLimiter({"search": (1, 2)}, block=False)
+    limiter.acquire("search")
+    limiter.acquire("search")
+    with pytest.raises(RateLimitExceeded) as error:
+        limiter.acquire("search")
+    assert error.value.endpoint_class == "search" and error.value.retry_after > 0
+    assert limiter.stats()["rejected"] == 1
+    # Classes without a limit are never throttled
+    for _ in range(100):
+        limiter.acquire("reads")
+
+def test_blocking_limiter_paces_requests():
+    limiter = RateLimiter({"writes": (50, 1)})
+    started = time.monotonic()
+    for _ in range(6):
+        limiter.acquire("writes")
+    assert time.monotonic() - started >= 0.09
+    assert limiter.stats()["waited"] > 0
+
+def test_async_acquire_waits_without_blocking_loop():
+    limiter = RateLimiter({"generate": (20, 1)})
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+        task = asyncio.ensure_future(ticker())
+        for _ in range(3):
+            await limiter.acquire_async("generate")
+        task.cancel()
+        return ticks
+    assert asyncio.run(main()) > 3
+
+def test_file_backend_shares_state(tmp_path):
+    path = str(tmp_path / "buckets.json")
+    first, second = FileLockBackend(path), FileLockBackend(path)
+    assert first.take("vj:search", 1.0, 2, 1) == 0.0
+    assert second.take("vj:search", 1.0, 2, 1) == 0.0
+    assert first.take("vj:search", 1.0, 2, 1) > 0
+    # A corrupt state file is treated as empty
+    with open(path, "w") as f:
+        f.write("{not json")
+    assert second.take("vj:search", 1.0, 2, 1) == 0.0
+
+def test_invalid_limits_are_rejected():
+    with pytest.raises(ValueError):
+        RateLimiter({"downloads": (1, 1)})
+    with pytest.raises(ValueError):
+        RateLimiter({"reads": (0, 1)})
@@ -0,0 +1,93 @@
+import datetime
+import random
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from videojungle import ApiClient
+from videojungle.retry import AttemptRecord, RetryPolicy, RetryStats
+
+def test_full_jitter_bounds():
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=3.0)
+    random.seed(1)
+    for attempt, ceiling in [(1, 0.5), (2, 1.0), (3, 2.0), (4, 3.0), (10, 3.0)]:
+        delays = [policy.backoff(attempt) for _ in range(500)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        # Full jitter spreads over the whole range, not just near the ceiling
+        assert min(delays) < ceiling * 0.1 and max(delays) > ceiling * 0.9
+
+def test_retry_after_seconds_is_used():
+    policy = RetryPolicy(backoff_max=0.01)
+    assert policy.get_delay("GET", 1, 0.0, 503, {"Retry-After": "7"}) == 7.0
+    assert policy.get_delay("GET", 1, 0.0, 429, {"Retry-After": "-3"}) == 0.0
+
+def test_retry_after_http_date():
+    retry_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=30)
+    delay = RetryPolicy().get_delay("GET", 1, 0.0, 503, {"Retry-After": format_datetime(retry_at, usegmt=True)})
+    assert 25 <= delay <= 30
+
+def test_retry_after_can_be_ignored_or_unparseable():
+    assert RetryPolicy(backoff_base=0.1, respect_retry_after=False).get_delay("GET", 1, 0.0, 503, {"Retry-After": "60"}) <= 0.1
+    assert RetryPolicy(backoff_base=0.1).get_delay("GET", 1, 0.0, 503, {"Retry-After": "soon"}) <= 0.1
+
+def test_retry_after_past_budget_gives_up():
+    assert RetryPolicy(max_retry_time=10).get_delay("GET", 1, 5.0, 503, {"Retry-After": "6"}) is None
+
+@pytest.mark.parametrize("method", ["POST", "PATCH", "post"])
+def test_non_idempotent_methods_are_not_retried(method):
+    policy = RetryPolicy()
+    assert policy.get_delay(method, 1, 0.0, 503) is None
+    assert policy.get_delay(method, 1, 0.0, None) is None
+
+def test_retryable_statuses_and_attempt_limit():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.get_delay("GET", 1, 0.0, 502) is not None
+    assert policy.get_delay("GET", 1, 0.0, 500) is None
+    assert policy.get_delay("GET", 1, 0.0, 404) is None
+    assert policy.get_delay("GET", 2, 0.0, 503) is not None
+    assert policy.get_delay("GET", 3, 0.0, 503) is None
+    assert RetryPolicy(retry_connection_errors=False).get_delay("GET", 1, 0.0, None) is None
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+class FakeSession:
+    # Answers every request with the queued status codes
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.methods = []
+
+    def request(self, method, url, **kwargs):
+        self.methods.append(method)
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0)
+        response._content = b"{}"
+        response.request = requests.Request(method, url).prepare()
+        response.elapsed = datetime.timedelta(0)
+        return response
+
+def client(statuses):
+    vj = ApiClient(token="token", retry=RetryPolicy(backoff_base=0.001))
+    vj.session = FakeSession(statuses)
+    return vj
+
+def test_client_retries_get_until_success():
+    vj = client([503, 502, 200])
+    assert vj._make_request("GET", "/users/me") == {}
+    assert vj.session.methods == ["GET"] * 3
+    assert vj.retry_stats.snapshot()["retries"] == 2
+
+def test_client_does_not_retry_post():
+    vj = client([503, 200])
+    with pytest.raises(requests.exceptions.HTTPError):
+        vj._make_request("POST", "/projects", json={})
+    assert vj.session.methods == ["POST"]
+
+def test_retry_stats_counts_give_ups():
+    stats = RetryStats()
+    stats.record(AttemptRecord("GET", "/a", 1, 503, None, 0.1, 0.2), final=False)
+    stats.record(AttemptRecord("GET", "/a", 2, 503, None, 0.1, None), final=True)
+    snapshot = stats.snapshot()
+    assert snapshot["requests"] == 1 and snapshot["attempts"] == 2
+    assert snapshot["retries"] == 1 and snapshot["gave_up"] == 1
+    assert snapshot["retries_by_status"] == {"503": 1}
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from videojungle.singleflight import AsyncSingleFlight, SingleFlight, request_key
+from videojungle.timeouts import Deadline, DeadlineExceeded
+
+def test_request_key_ignores_order():
+    assert request_key("get", "u", {"b": 1, "a": 2}, {"X-A": "1", "Accept": "x"}) == \
+        request_key("GET", "u", {"a": 2, "b": 1}, {"accept": "x", "x-a": "1"})
+
+def test_followers_share_the_leaders_result():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", fn)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", fn))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+    assert results == ["result"] * 4
+    assert len(calls) == 1
+    assert flight.stats() == {"executed": 1, "shared": 3, "in_flight": 0}
+
+def test_follower_honours_its_deadline():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(5)
+        return "late"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", fn)))
+    leader.start()
+    started.wait(5)
+    began = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        flight.do("k", fn, Deadline(0.05))
+    assert time.monotonic() - began < 1
+    release.set()
+    leader.join(5)
+    assert results == ["late"]
+
+def test_async_follower_honours_its_deadline():
+    async def run():
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+
+        async def fn():
+            await release.wait()
+            return "late"
+
+        leader = asyncio.ensure_future(flight.do("k", fn))
+        await asyncio.sleep(0)
+        with pytest.raises(DeadlineExceeded):
+            await flight.do("k", fn, Deadline(0.05))
+        release.set()
+        assert await leader == "late"
+    asyncio.run(run())
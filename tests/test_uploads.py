@@ -0,0 +1,70 @@
+import os
+import time
+
+import pytest
+
+from videojungle import ApiClient
+from videojungle.uploads import DirectUploader, UploadJournal, UploadTargetRejected
+
+class FakeResponse:
+    headers = {}
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = "denied" if status_code >= 400 else ""
+
+class FakeSession:
+    # Answers storage POSTs with the queued status codes, reading each body fully
+    def __init__(self, codes):
+        self.codes = list(codes)
+        self.urls = []
+
+    def request(self, method, url, data, headers, timeout):
+        self.urls.append(url)
+        for _ in data:
+            pass
+        return FakeResponse(self.codes.pop(0))
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(os.urandom(10000))
+    return str(path)
+
+def test_progress_counts_encoded_body(video):
+    seen = []
+    progress = DirectUploader(FakeSession([204])).upload(video, {"url": "u", "fields": {"key": "k"}}, seen.append)
+    assert progress.sent_bytes == progress.total_bytes > 10000
+    assert seen[-1] is progress
+
+def test_rejected_target_raises(video):
+    with pytest.raises(UploadTargetRejected) as error:
+        DirectUploader(FakeSession([403])).upload(video, {"url": "u", "fields": {}})
+    assert error.value.status_code == 403
+
+def test_stale_journal_is_discarded(video, tmp_path):
+    journal = UploadJournal.for_file(video, str(tmp_path))
+    journal.start({"id": "v1"})
+    assert UploadJournal.for_file(video, str(tmp_path)).load()
+    journal.state["created_at"] = time.time() - 7200
+    journal._write()
+    stale = UploadJournal.for_file(video, str(tmp_path))
+    assert not stale.load()
+    assert not os.path.exists(stale.path)
+
+def test_expired_resume_creates_new_target(video, tmp_path):
+    UploadJournal.for_file(video, str(tmp_path)).start({"id": "old", "upload_url": {"url": "old-url", "fields": {}}})
+    vj = ApiClient(token="token")
+    vj.session = FakeSession([403, 204])
+    created = []
+
+    def make_request(method, endpoint, **kwargs):
+        created.append(endpoint)
+        return {"id": "new", "upload_url": {"url": "new-url", "fields": {}}}
+    vj._make_request = make_request
+    vj.video_files.get = lambda video_file_id: video_file_id
+
+    assert vj.video_files.direct_upload(video, run_analysis=False, journal_dir=str(tmp_path)) == "new"
+    assert vj.session.urls == ["old-url", "new-url"]
+    assert created == ["/video-file"]
+    assert not os.path.exists(UploadJournal.for_file(video, str(tmp_path)).path)
@@ -1,4 +1,18 @@
 from .client import ApiClient
+from .async_client import AsyncApiClient
+from .retry import RetryPolicy, RetryStats
+from .cache import ResponseCache, CacheBackend, LRUCacheBackend
+from .ratelimit import RateLimiter, RateLimitExceeded, FileLockBackend
+from .stats import StatsCollector, RequestEvent
+from .timeouts import Timeout, Deadline, DeadlineExceeded
+from .jobs import Job, JobFailed, JobPoller, PollSchedule
+from .events import ServerSentEvent, Subscription, AsyncSubscription, SubscriptionClosed
+from .multipart import MultipartEncoder
+from .uploads import DirectUploader, UploadJournal, UploadProgress, BulkUploadResult, UploadOutcome, UploadTargetRejected
+from .dedup import DedupIndex
+from .mediacache import MediaCache
+from .downloads import RangeDownloader, AsyncRangeDownloader, DownloadVerificationError, DownloadStream, AsyncDownloadStream, BulkDownloadResult, DownloadOutcome
+from .analysis import AnalysisTable, IntervalIndex, Segment
 from .model import VideoSearch, VideoFile, VideoEditAsset, VideoEditAudioAsset, VideoFilters, VideoEditCreate, VideoUpload, VideoAudioLevel
 
 try:
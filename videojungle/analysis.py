@@ -0,0 +1,444 @@
+import bisect
+import math
+import threading
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Keys a segment record may use for each column, in order of preference
+START_KEYS = ("start", "start_time", "startTime", "video_start_time", "begin")
+END_KEYS = ("end", "end_time", "endTime", "video_end_time", "stop")
+# Single-instant detections become zero-length segments
+POINT_KEYS = ("time", "timestamp")
+LABEL_KEYS = ("label", "name", "class", "category", "tag", "text", "description")
+SCORE_KEYS = ("score", "confidence", "probability")
+
+Seconds = Union[int, float, str]
+
+def to_seconds(value: Seconds) -> float:
+    '''
+    Seconds from a number or a "HH:MM:SS.fff" / "MM:SS" timestamp.
+    '''
+    if isinstance(value, (int, float)):
+        return float(value)
+    seconds = 0.0
+    for part in str(value).split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+def _first(record: dict, keys) -> Any:
+    for key in keys:
+        value = record.get(key)
+        if value is not None:
+            return value
+    return None
+
+def _is_segment(record: dict) -> bool:
+    return any(key in record for key in START_KEYS + POINT_KEYS)
+
+def iter_segments(analysis: Any) -> Iterator[dict]:
+    '''
+    Every segment record in an analysis payload, whether that is the flat
+    VideoFile.analysis list or the nested dict from VideoFileAPI.get_analysis.
+    A segment is any dict with a start (or single timestamp) key.
+    '''
+    stack = [analysis]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if _is_segment(node):
+                yield node
+            else:
+                stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+class Segment(NamedTuple):
+    start: float
+    end: float
+    label: str
+    score: float
+
+class AnalysisTable:
+    '''
+    Analysis segments stored column-wise: start and end (seconds) and score
+    as float64 columns, labels as int32 ids into an interned `labels` list.
+    Tens of thousands of segments take a few hundred kilobytes instead of one
+    dict per segment, and filters run over whole columns at once.
+
+        table = video.analysis_table
+        table.where(start=70, end=100, labels=["beach"], min_score=0.8)
+
+    Columns are NumPy arrays when NumPy is installed and array.array
+    otherwise; the API and results are the same, only NumPy filters are
+    vectorized. Missing scores are NaN and never pass a min_score filter.
+    '''
+
+    __slots__ = ("start", "end", "score", "label_ids", "labels", "_label_index")
+
+    def __init__(self, start, end, score, label_ids, labels: Sequence[str]):
+        self.start = start
+        self.end = end
+        self.score = score
+        self.label_ids = label_ids
+        self.labels = labels if isinstance(labels, list) else list(labels)
+        self._label_index: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "AnalysisTable":
+        '''
+        Builds a table from segment dicts, e.g. {"start": 1.0, "end": 2.5,
+        "label": "beach", "score": 0.9}. Times may be seconds or timestamps; a
+        record with a list under "labels" adds one row per label.
+        '''
+        start, end, score, label_ids = array("d"), array("d"), array("d"), array("i")
+        labels: List[str] = []
+        interned: Dict[str, int] = {}
+        for record in records:
+            point = _first(record, START_KEYS)
+            if point is None:
+                point = _first(record, POINT_KEYS)
+            if point is None:
+                continue
+            first = to_seconds(point)
+            last = _first(record, END_KEYS)
+            last = first if last is None else to_seconds(last)
+            value = _first(record, SCORE_KEYS)
+            value = math.nan if value is None else float(value)
+            names = record.get("labels")
+            if not isinstance(names, list):
+                names = [_first(record, LABEL_KEYS)]
+            for name in names:
+                name = "" if name is None else str(name)
+                label = interned.get(name)
+                if label is None:
+                    label = interned[name] = len(labels)
+                    labels.append(name)
+                start.append(first)
+                end.append(last)
+                score.append(value)
+                label_ids.append(label)
+        return cls._from_arrays(start, end, score, label_ids, labels)
+
+    @classmethod
+    def from_analysis(cls, analysis: Any) -> "AnalysisTable":
+        '''
+        Builds a table from VideoFile.analysis or a get_analysis() response.
+        '''
+        return cls.from_records(iter_segments(analysis))
+
+    @classmethod
+    def _from_arrays(cls, start: array, end: array, score: array, label_ids: array, labels) -> "AnalysisTable":
+        if np is not None:
+            # Zero-copy views of the arrays' buffers
+            return cls(np.frombuffer(start, np.float64), np.frombuffer(end, np.float64),
+                       np.frombuffer(score, np.float64), np.frombuffer(label_ids, np.intc), labels)
+        return cls(start, end, score, label_ids, labels)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __getitem__(self, row: int) -> Segment:
+        return Segment(float(self.start[row]), float(self.end[row]), self.labels[self.label_ids[row]], float(self.score[row]))
+
+    def __iter__(self) -> Iterator[Segment]:
+        labels = self.labels
+        for start, end, label, score in zip(self.start, self.end, self.label_ids, self.score):
+            yield Segment(float(start), float(end), labels[label], float(score))
+
+    def __repr__(self):
+        return f"<AnalysisTable {len(self)} segments, {len(self.labels)} labels>"
+
+    @property
+    def nbytes(self) -> int:
+        '''
+        Bytes used by the columns (not counting the label strings).
+        '''
+        return sum(len(column) * column.itemsize for column in (self.start, self.end, self.score, self.label_ids))
+
+    def label_id(self, label: str) -> Optional[int]:
+        if self._label_index is None:
+            self._label_index = {name: index for index, name in enumerate(self.labels)}
+        return self._label_index.get(label)
+
+    def take(self, rows) -> "AnalysisTable":
+        '''
+        New table of the given row numbers, in that order, sharing the label table.
+        '''
+        if np is not None:
+            rows = np.asarray(rows, dtype=np.intp)
+            table = AnalysisTable(self.start[rows], self.end[rows], self.score[rows], self.label_ids[rows], self.labels)
+        else:
+            table = AnalysisTable(array("d", (self.start[row] for row in rows)), array("d", (self.end[row] for row in rows)),
+                                  array("d", (self.score[row] for row in rows)), array("i", (self.label_ids[row] for row in rows)),
+                                  self.labels)
+        table._label_index = self._label_index
+        return table
+
+    def where(self, start: Optional[Seconds] = None, end: Optional[Seconds] = None, labels: Optional[Iterable[str]] = None,
+              min_score: Optional[float] = None, contained: bool = False) -> "AnalysisTable":
+        '''
+        Rows that overlap the window [start, end] (lie entirely inside it with
+        contained=True), carry any of `labels` and score at least min_score.
+        Criteria left as None don't filter; intervals are closed, so segments
+        touching the window count as overlapping.
+        '''
+        low = None if start is None else to_seconds(start)
+        high = None if end is None else to_seconds(end)
+        if isinstance(labels, str):
+            labels = [labels]
+        ids = None if labels is None else [index for index in map(self.label_id, labels) if index is not None]
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            if low is not None:
+                mask &= (self.start >= low) if contained else (self.end >= low)
+            if high is not None:
+                mask &= (self.end <= high) if contained else (self.start <= high)
+            if ids is not None:
+                mask &= np.isin(self.label_ids, ids)
+            if min_score is not None:
+                mask &= self.score >= min_score
+            return self.take(np.flatnonzero(mask))
+        wanted = None if ids is None else set(ids)
+        rows = []
+        for row, (first, last, label, score) in enumerate(zip(self.start, self.end, self.label_ids, self.score)):
+            if low is not None and (first if contained else last) < low:
+                continue
+            if high is not None and (last if contained else first) > high:
+                continue
+            if wanted is not None and label not in wanted:
+                continue
+            if min_score is not None and not score >= min_score:
+                continue
+            rows.append(row)
+        return self.take(rows)
+
+    def between(self, start: Seconds, end: Seconds, contained: bool = False) -> "AnalysisTable":
+        return self.where(start=start, end=end, contained=contained)
+
+    def with_labels(self, *labels: str) -> "AnalysisTable":
+        return self.where(labels=labels)
+
+    def min_score(self, score: float) -> "AnalysisTable":
+        return self.where(min_score=score)
+
+    def to_records(self) -> List[dict]:
+        '''
+        The segments as {"start", "end", "label", "score"} dicts (score None when missing).
+        '''
+        return [{"start": segment.start, "end": segment.end, "label": segment.label,
+                 "score": None if math.isnan(segment.score) else segment.score} for segment in self]
+
+Window = Tuple[Seconds, Seconds]
+
+class IntervalIndex:
+    '''
+    Static index over an AnalysisTable's segments for answering many window
+    queries against the same video:
+
+        index = vj.video_files.analysis_index(video_id)
+        index.overlapping("00:01:10", "00:01:40")
+        index.containing(70, 100, labels=["beach"])
+        index.nearest(95.0)
+        index.overlapping_many([(0, 10), (70, 100), (300, 330)])
+
+    Built once in O(n log n). overlapping() and containing() take
+    O(log n + k) for k results and nearest() O(log n). Intervals are
+    closed, as in AnalysisTable.where. Results come back in start order.
+
+    Overlaps are segments that contain the window start, found with a
+    centered interval tree, plus segments that start inside the window, found
+    by bisecting the sorted starts. Containment is a range-minimum search
+    over the ends of the segments that start inside the window. Passing
+    labels= answers from a sub-index of just those labels, built on first use.
+    '''
+
+    def __init__(self, table: AnalysisTable):
+        order = sorted(range(len(table)), key=lambda row: (table.start[row], table.end[row]))
+        self.table = table.take(order)
+        self._starts = [float(value) for value in self.table.start]
+        self._ends = [float(value) for value in self.table.end]
+        self._end_order = sorted(range(len(self._ends)), key=self._ends.__getitem__)
+        self._sorted_ends = [self._ends[row] for row in self._end_order]
+        self._tree = self._build_tree(list(range(len(self._starts))))
+        self._min_end = self._build_sparse_table()
+        self._by_labels: Dict[frozenset, "IntervalIndex"] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __repr__(self):
+        return f"<IntervalIndex {len(self)} segments>"
+
+    def _build_tree(self, rows: List[int]):
+        # Centered interval tree; rows arrive in start order. Splitting at the
+        # median start leaves at most half the rows on either side.
+        if not rows:
+            return None
+        starts, ends = self._starts, self._ends
+        center = starts[rows[len(rows) // 2]]
+        left = [row for row in rows if ends[row] < center]
+        right = [row for row in rows if starts[row] > center]
+        here = [row for row in rows if starts[row] <= center <= ends[row]]
+        by_end = sorted(here, key=ends.__getitem__, reverse=True)
+        return (center, here, [starts[row] for row in here], by_end, [-ends[row] for row in by_end],
+                self._build_tree(left), self._build_tree(right))
+
+    def _build_sparse_table(self) -> list:
+        # levels[j][i] is the row with the smallest end among rows i .. i + 2**j - 1
+        count = len(self._ends)
+        if np is not None:
+            ends = np.asarray(self._ends)
+            levels = [np.arange(count, dtype=np.intp)]
+            width = 1
+            while 2 * width <= count:
+                previous = levels[-1]
+                first, second = previous[:count - 2 * width + 1], previous[width:count - width + 1]
+                levels.append(np.where(ends[first] <= ends[second], first, second))
+                width *= 2
+            return [level.tolist() for level in levels]
+        ends = self._ends
+        levels = [list(range(count))]
+        width = 1
+        while 2 * width <= count:
+            previous = levels[-1]
+            levels.append([a if ends[a] <= ends[b] else b
+                           for a, b in zip(previous[:count - 2 * width + 1], previous[width:count - width + 1])])
+            width *= 2
+        return levels
+
+    def _argmin_end(self, low: int, high: int) -> int:
+        level = (high - low + 1).bit_length() - 1
+        a, b = self._min_end[level][low], self._min_end[level][high - (1 << level) + 1]
+        return a if self._ends[a] <= self._ends[b] else b
+
+    def _stab(self, point: float, before: bool = False) -> List[int]:
+        # Rows with start <= point <= end (start < point with before=True)
+        find = bisect.bisect_left if before else bisect.bisect_right
+        rows = []
+        node = self._tree
+        while node is not None:
+            center, here, here_starts, by_end, negated_ends, left, right = node
+            if point < center:
+                rows.extend(here[:find(here_starts, point)])
+                node = left
+            elif point > center:
+                # Every row here starts at or before the center, so before the point
+                rows.extend(by_end[:bisect.bisect_right(negated_ends, -point)])
+                node = right
+            else:
+                rows.extend(here[:find(here_starts, point)])
+                break
+        return rows
+
+    def _overlapping_rows(self, low: float, high: float) -> List[int]:
+        rows = self._stab(low, before=True)
+        rows.sort()
+        first, last = bisect.bisect_left(self._starts, low), bisect.bisect_right(self._starts, high)
+        rows.extend(range(first, last))
+        return rows
+
+    def _containing_rows(self, low: float, high: float) -> List[int]:
+        first, last = bisect.bisect_left(self._starts, low), bisect.bisect_right(self._starts, high)
+        rows = []
+        pending = [(first, last - 1)] if first < last else []
+        while pending:
+            a, b = pending.pop()
+            row = self._argmin_end(a, b)
+            if self._ends[row] > high:
+                continue
+            rows.append(row)
+            if a < row:
+                pending.append((a, row - 1))
+            if row < b:
+                pending.append((row + 1, b))
+        rows.sort()
+        return rows
+
+    def _for_labels(self, labels: Optional[Iterable[str]]) -> "IntervalIndex":
+        if labels is None:
+            return self
+        key = frozenset([labels] if isinstance(labels, str) else labels)
+        with self._lock:
+            index = self._by_labels.get(key)
+            if index is None:
+                index = self._by_labels[key] = IntervalIndex(self.table.where(labels=key))
+        return index
+
+    @staticmethod
+    def _window(start: Seconds, end: Seconds) -> Tuple[float, float]:
+        low, high = to_seconds(start), to_seconds(end)
+        if high < low:
+            raise ValueError(f"Window ends ({end}) before it starts ({start})")
+        return low, high
+
+    def overlapping(self, start: Seconds, end: Seconds, labels: Optional[Iterable[str]] = None) -> AnalysisTable:
+        '''
+        Segments that overlap [start, end].
+        '''
+        index = self._for_labels(labels)
+        return index.table.take(index._overlapping_rows(*self._window(start, end)))
+
+    def containing(self, start: Seconds, end: Seconds, labels: Optional[Iterable[str]] = None) -> AnalysisTable:
+        '''
+        Segments that lie entirely within [start, end].
+        '''
+        index = self._for_labels(labels)
+        return index.table.take(index._containing_rows(*self._window(start, end)))
+
+    def at(self, time: Seconds, labels: Optional[Iterable[str]] = None) -> AnalysisTable:
+        '''
+        Segments that contain the instant `time`.
+        '''
+        index = self._for_labels(labels)
+        return index.table.take(sorted(index._stab(to_seconds(time))))
+
+    def nearest(self, time: Seconds, labels: Optional[Iterable[str]] = None) -> Optional[Segment]:
+        '''
+        The segment closest to `time`: one containing it if any, otherwise the
+        one with the nearest start or end. Ties go to the earlier start. None
+        when the index is empty.
+        '''
+        index = self._for_labels(labels)
+        row = index._nearest_row(to_seconds(time))
+        return None if row is None else index.table[row]
+
+    def _nearest_row(self, point: float) -> Optional[int]:
+        containing = self._stab(point)
+        if containing:
+            return min(containing)
+        best, distance = None, math.inf
+        position = bisect.bisect_left(self._sorted_ends, point) - 1
+        if position >= 0:
+            best, distance = self._end_order[position], point - self._sorted_ends[position]
+        following = bisect.bisect_right(self._starts, point)
+        if following < len(self._starts) and self._starts[following] - point < distance:
+            best = following
+        return best
+
+    def overlapping_many(self, windows: Iterable[Window], labels: Optional[Iterable[str]] = None) -> List[AnalysisTable]:
+        '''
+        overlapping() for each (start, end) window, e.g. every clip of an edit, in one call.
+        '''
+        index = self._for_labels(labels)
+        return [index.table.take(index._overlapping_rows(*self._window(start, end))) for start, end in windows]
+
+    def containing_many(self, windows: Iterable[Window], labels: Optional[Iterable[str]] = None) -> List[AnalysisTable]:
+        '''
+        containing() for each (start, end) window.
+        '''
+        index = self._for_labels(labels)
+        return [index.table.take(index._containing_rows(*self._window(start, end))) for start, end in windows]
+
+    def nearest_many(self, times: Iterable[Seconds], labels: Optional[Iterable[str]] = None) -> List[Optional[Segment]]:
+        '''
+        nearest() for each time.
+        '''
+        index = self._for_labels(labels)
+        rows = [index._nearest_row(to_seconds(time)) for time in times]
+        return [None if row is None else index.table[row] for row in rows]
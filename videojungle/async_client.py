@@ -0,0 +1,1004 @@
+import asyncio
+import httpx
+from urllib import parse
+from typing import AsyncIterator, List, Optional, Any, Tuple
+from .model import VideoFile, Script, ScriptTemplate, Prompt, Project, Asset, User, VideoSearch, VideoEditCreate, VideoEditAsset, CustomPromptGeneration, CropSettings, Collaborator, CollaboratorRequest, validate_json_response, load_model, HYDRATION_MODES
+from .utils import is_youtube_url, endpoint_template
+from .retry import RetryPolicy, RetryStats, AttemptRecord
+from .singleflight import AsyncSingleFlight, request_key
+from .cache import ResponseCache, LRUCacheBackend, MUTATING_METHODS
+from .ratelimit import RateLimiter, classify_endpoint
+from .stats import Hooks, RequestEvent, StatsCollector
+from .timeouts import Timeout, Deadline, DeadlineExceeded
+from .jobs import PollSchedule, asset_finished, analysis_finished
+from .multipart import MultipartEncoder, AsyncMultipartBody
+from .events import AsyncEventMultiplexer, AsyncSubscription, subscription_path
+from .downloads import AsyncRangeDownloader, AsyncDownloadStream, format_checksum
+from .analysis import AnalysisTable, IntervalIndex
+from .listing import ListBody, LIST_CHUNK_SIZE, next_page_url, same_origin
+from datetime import datetime
+import json
+import time
+from uuid import UUID
+
+class AsyncApiClient:
+    '''
+    Asyncio counterpart of ApiClient. Every sub-API mirrors its synchronous
+    version, but each call is awaitable and returns the same pydantic models,
+    so many calls can run concurrently on one event loop:
+
+        async with AsyncApiClient(token) as vj:
+            projects = await asyncio.gather(*(vj.projects.get(pid) for pid in ids))
+
+    Project helper methods (has_analyzing_assets, upload_asset, ...) are
+    synchronous, so projects returned here are not bound to this client.
+    '''
+    BASE_URL = "https://api.video-jungle.com"
+
+    def __init__(
+        self,
+        token,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        http2: bool = False,
+        client: Optional[httpx.AsyncClient] = None,
+        retry: Optional[RetryPolicy] = None,
+        coalesce_requests: bool = False,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        collect_stats: bool = False,
+        timeout: Optional[Timeout] = None,
+        hydration: str = "full",
+    ):
+        '''
+        Args:
+            token: Video Jungle API key
+            max_connections: Maximum number of concurrent connections in the pool
+            max_keepalive_connections: Maximum number of idle keep-alive connections
+            http2: Negotiate HTTP/2 when the server supports it (requires the `h2` package)
+            client: Optional pre-configured httpx.AsyncClient to use instead
+            retry: Retry policy for transient failures, see ApiClient
+            coalesce_requests: Share one in-flight HTTP call between concurrent identical GET requests
+            cache: Optional ResponseCache for GET responses; may be shared with an ApiClient
+            rate_limiter: Optional RateLimiter pacing requests per endpoint class; may be shared with an ApiClient
+            collect_stats: Keep per-endpoint latency and byte histograms in client.stats,
+                including connect and TLS handshake times
+            timeout: Connect / read / total timeouts for every request, see ApiClient
+            hydration: "full" or "lazy" model hydration, see ApiClient
+        '''
+        if hydration not in HYDRATION_MODES:
+            raise ValueError(f"hydration must be one of {', '.join(HYDRATION_MODES)}")
+        self.token = token
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.retry_stats = RetryStats()
+        self.coalescer = AsyncSingleFlight() if coalesce_requests else None
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.hooks = Hooks()
+        self.stats = StatsCollector() if collect_stats else None
+        self.timeout = timeout if timeout is not None else Timeout()
+        self.hydration = hydration
+        self.poll_schedule = PollSchedule()
+        self.events = AsyncEventMultiplexer(self)
+        self._owns_client = client is None
+        if client is None:
+            limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+            client = httpx.AsyncClient(limits=limits, http2=http2, timeout=None)
+        self.http = client
+        self.downloader = AsyncRangeDownloader(self.http, self._attempt_timeout)
+        # IntervalIndex per video file id, see video_files.analysis_index
+        self.analysis_indexes = LRUCacheBackend(max_entries=64)
+        self.projects = AsyncProjectsAPI(self)
+        self.video_files = AsyncVideoFileAPI(self)
+        self.prompts = AsyncPromptsAPI(self)
+        self.scripts = AsyncScriptsAPI(self)
+        self.assets = AsyncAssetsAPI(self)
+        self.user_account = AsyncUserAPI(self)
+        self.edits = AsyncEditAPI(self)
+
+    async def aclose(self):
+        '''
+        Close event subscriptions and the pooled connections. Clients passed in
+        by the caller are left open.
+        '''
+        self.events.close()
+        if self._owns_client:
+            await self.http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def _make_request(self, method, endpoint, response_model=None, deadline=None, use_cache=True, **kwargs):
+        '''
+        Sends a request to the API and returns the decoded JSON body, validated
+        into response_model (a model class or List[Model]) when one is given.
+        The call, including retries, must finish before `deadline` (seconds or a Deadline).
+        use_cache=False always asks the server, even when a cached GET is still fresh.
+        '''
+        headers = {
+            "X-API-Key": self.token
+        }
+        if 'headers' in kwargs:
+            user_headers = kwargs.pop('headers')
+            headers.update(user_headers)
+
+        url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
+        deadline = self.timeout.deadline(Deadline.coerce(deadline))
+        # Only plain GETs (no body, no streaming) are coalesced and cached
+        plain_get = method.upper() == "GET" and not kwargs.keys() - {"params"}
+        cache_key = None
+        cached = None
+        if self.cache is not None and plain_get:
+            cache_key = request_key(method, url, kwargs.get("params"), headers)
+            cached = self.cache.lookup(cache_key, use_fresh=use_cache)
+            if cached is not None:
+                if use_cache and cached.is_fresh():
+                    return self._decode(method, endpoint, cached.body, response_model)
+                headers.update(cached.conditional_headers())
+
+        if self.coalescer is not None and plain_get:
+            key = request_key(method, url, kwargs.get("params"), headers)
+            response = await self.coalescer.do(key, lambda: self._send_with_retries(method, url, endpoint, deadline, headers=headers, **kwargs), deadline)
+        else:
+            response = await self._send_with_retries(method, url, endpoint, deadline, headers=headers, **kwargs)
+
+        if self.cache is not None:
+            if cached is not None and response.status_code == 304:
+                cached = self.cache.refresh(cache_key, endpoint, cached, response.headers)
+                return self._decode(method, endpoint, cached.body, response_model)
+            if method.upper() in MUTATING_METHODS:
+                self.cache.invalidate(endpoint)
+
+        try:
+            response.raise_for_status()
+            if cache_key is not None:
+                self.cache.store(cache_key, endpoint, response.content, response.headers)
+            return self._decode(method, endpoint, response.content, response_model)
+        except httpx.HTTPStatusError as e:
+            if response.status_code == 422:
+                try:
+                    error_detail = response.json()
+                    print(f"422 Unprocessable Entity: {error_detail}")
+                    # This will show the validation errors FastAPI returns
+                except ValueError:
+                    print("422 Unprocessable Entity: Could not parse error response")
+
+            # Re-raise the original exception after printing details
+            raise e
+
+    def _decode(self, method, endpoint, body: bytes, response_model=None):
+        # JSON decoding and model validation are timed apart from the network phases.
+        # With a response_model the body is validated straight from bytes, so both
+        # happen in one pass and are recorded as the validate phase.
+        started = time.perf_counter()
+        if response_model is not None:
+            obj = validate_json_response(response_model, body, self.hydration)
+            phase = "validate"
+        else:
+            obj = json.loads(body)
+            phase = "decode"
+        if self.stats is not None:
+            self.stats.record_phase(method, endpoint_template(endpoint), phase, time.perf_counter() - started)
+        return obj
+
+    def _attempt_timeout(self, deadline: Optional[Deadline]) -> httpx.Timeout:
+        connect, read = self.timeout.for_attempt(deadline)
+        return httpx.Timeout(connect=connect, read=read, write=read, pool=connect)
+
+    async def _send_with_retries(self, method, url, endpoint, deadline: Optional[Deadline], **kwargs) -> httpx.Response:
+        started = time.monotonic()
+        attempt = 0
+        has_files = "files" in kwargs or isinstance(kwargs.get("content"), AsyncMultipartBody)
+        endpoint_class = classify_endpoint(method, endpoint, has_files)
+        template = endpoint_template(endpoint)
+        instrumented = self.stats is not None or self.hooks.response or self.hooks.error
+        explicit_timeout = "timeout" in kwargs
+        while True:
+            attempt += 1
+            if deadline is not None:
+                deadline.check(f"{method} {endpoint}")
+            if not explicit_timeout:
+                kwargs["timeout"] = self._attempt_timeout(deadline)
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(endpoint_class)
+            event = RequestEvent(method, endpoint, template, url, attempt)
+            Hooks.fire(self.hooks.request, event)
+            marks = {}
+            if instrumented:
+                async def trace(name, info, marks=marks):
+                    marks[name] = time.monotonic()
+                kwargs["extensions"] = {**kwargs.get("extensions", {}), "trace": trace}
+            attempt_started = time.monotonic()
+            try:
+                if deadline is not None:
+                    # Unlike per-read socket timeouts, this also bounds slowly trickling responses
+                    try:
+                        response = await asyncio.wait_for(self.http.request(method, url, **kwargs), deadline.remaining())
+                    except asyncio.TimeoutError:
+                        raise DeadlineExceeded(f"Deadline of {deadline.seconds:g}s exceeded during {method} {endpoint}")
+                else:
+                    response = await self.http.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                now = time.monotonic()
+                event.error = e
+                event.phases = _trace_phases(marks, attempt_started, now)
+                self._record_attempt(event, self.hooks.error)
+                delay = self._retry_delay(deadline, method, attempt, now - started)
+                self.retry_stats.record(AttemptRecord(method, endpoint, attempt, None, type(e).__name__, now - attempt_started, delay), final=delay is None)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            now = time.monotonic()
+            event.status_code = response.status_code
+            event.phases = _trace_phases(marks, attempt_started, now)
+            event.bytes_sent = int(response.request.headers.get("Content-Length", 0))
+            event.bytes_received = len(response.content)
+            self._record_attempt(event, self.hooks.response)
+
+            delay = None
+            if response.status_code >= 400:
+                delay = self._retry_delay(deadline, method, attempt, now - started, response.status_code, response.headers)
+            self.retry_stats.record(AttemptRecord(method, endpoint, attempt, response.status_code, None, now - attempt_started, delay), final=delay is None)
+            if delay is None:
+                return response
+            await asyncio.sleep(delay)
+
+    def _retry_delay(self, deadline: Optional[Deadline], method, attempt, elapsed, status_code=None, headers=None) -> Optional[float]:
+        delay = self.retry.get_delay(method, attempt, elapsed, status_code, headers)
+        # Don't sleep past the deadline only to give up afterwards
+        if delay is not None and deadline is not None and delay >= deadline.remaining():
+            return None
+        return delay
+
+    def _record_attempt(self, event: RequestEvent, callbacks):
+        if self.stats is not None:
+            self.stats.record_attempt(event)
+        Hooks.fire(callbacks, event)
+
+    async def _send_download(self, url: str, deadline: Optional[Deadline] = None) -> httpx.Response:
+        # Streaming GET of a download URL; the body is read by an AsyncDownloadStream
+        request = self.http.build_request("GET", url, timeout=self._attempt_timeout(deadline))
+        return await self.http.send(request, stream=True)
+
+    async def _send_stream(self, url: str, endpoint: str, deadline: Optional[Deadline], headers: dict) -> httpx.Response:
+        # Streaming GET with the client's retry policy; only the status line and
+        # headers are read, so a retry never re-reads a body
+        started = time.monotonic()
+        attempt = 0
+        endpoint_class = classify_endpoint("GET", endpoint, False)
+        while True:
+            attempt += 1
+            if deadline is not None:
+                deadline.check(f"GET {endpoint}")
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(endpoint_class)
+            request = self.http.build_request("GET", url, headers=headers, timeout=self._attempt_timeout(deadline))
+            attempt_started = time.monotonic()
+            try:
+                response = await self.http.send(request, stream=True)
+            except httpx.TransportError as e:
+                now = time.monotonic()
+                delay = self._retry_delay(deadline, "GET", attempt, now - started)
+                self.retry_stats.record(AttemptRecord("GET", endpoint, attempt, None, type(e).__name__, now - attempt_started, delay), final=delay is None)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            now = time.monotonic()
+            delay = None
+            if response.status_code >= 400:
+                delay = self._retry_delay(deadline, "GET", attempt, now - started, response.status_code, response.headers)
+            self.retry_stats.record(AttemptRecord("GET", endpoint, attempt, response.status_code, None, now - attempt_started, delay), final=delay is None)
+            if delay is None:
+                return response
+            await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def _iter_list(self, endpoint: str, response_model=None, deadline=None, chunk_size: int = LIST_CHUNK_SIZE) -> AsyncIterator[Any]:
+        '''
+        Yields the items of a list endpoint as they arrive; see ApiClient._iter_list.
+        '''
+        deadline = self.timeout.deadline(Deadline.coerce(deadline))
+        url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
+        while url is not None:
+            # Page links pointing elsewhere don't get the API key
+            headers = {"X-API-Key": self.token} if same_origin(url, self.BASE_URL) else {}
+            response = await self._send_stream(url, parse.urlsplit(url).path, deadline, headers)
+            try:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                body = ListBody()
+                async for chunk in response.aiter_bytes(chunk_size):
+                    if deadline is not None:
+                        deadline.check(f"GET {endpoint}")
+                    for item in body.feed(chunk):
+                        yield load_model(response_model, item, self.hydration) if response_model is not None else item
+                for item in body.close():
+                    yield load_model(response_model, item, self.hydration) if response_model is not None else item
+                url = next_page_url(url, response.links, body)
+            finally:
+                await response.aclose()
+
+    async def _download_url(self, url: str, filename: str, deadline: Optional[Deadline] = None,
+                            expected_size: Optional[int] = None, expected_hash: Optional[str] = None):
+        # Written to filename.part, resumed after interruptions and verified when size / hash are known
+        return await self.downloader.download(url, filename, deadline, expected_size, expected_hash)
+
+    async def _poll_until(self, kind: str, check, deadline: Optional[Deadline] = None):
+        # Polls check() on the adaptive schedule until it reports (True, result)
+        started = time.monotonic()
+        polls = 0
+        while True:
+            finished, result = await check()
+            polls += 1
+            age = time.monotonic() - started
+            if finished:
+                self.poll_schedule.observe(kind, age)
+                return result
+            if deadline is not None:
+                deadline.check(f"waiting for {kind}")
+            await asyncio.sleep(self.poll_schedule.next_delay(kind, polls, age, deadline))
+
+    async def _watch(self, path: str, check, deadline: Optional[Deadline] = None):
+        # Push-based alternative to _poll_until(): check() runs when the event
+        # stream (re)connects and whenever an event arrives, never on a timer
+        subscription = self.events.subscribe(path)
+
+        async def run():
+            while True:
+                await subscription._next(connects=True)
+                finished, result = await check()
+                if finished:
+                    return result
+
+        try:
+            if deadline is None:
+                return await run()
+            try:
+                return await asyncio.wait_for(run(), deadline.remaining())
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"Deadline of {deadline.seconds:g}s exceeded waiting on {path}")
+        finally:
+            subscription.close()
+
+    async def _upload(self, endpoint: str, fields: dict, hasher=None, **kwargs):
+        # POSTs fields as a streamed multipart/form-data body instead of buffering files in memory
+        encoder = MultipartEncoder(fields, hasher=hasher)
+        headers = dict(kwargs.pop("headers", {}), **encoder.headers())
+        return await self._make_request("POST", endpoint, content=encoder.async_body(), headers=headers, **kwargs)
+
+    async def _wait_for_asset(self, asset_id: str, print_progress: bool = False, deadline: Optional[Deadline] = None) -> Asset:
+        async def check():
+            asset = await self._make_request("GET", f"/assets/{asset_id}", response_model=Asset, deadline=deadline, use_cache=False)
+            return asset_finished(asset), asset
+
+        if print_progress:
+            print("Waiting for asset to be ready...")
+        return await self._poll_until("asset", check, deadline)
+
+def _trace_phases(marks: dict, started: float, finished: float) -> dict:
+    # Turns httpcore trace timestamps into per-phase durations
+    phases = {"total": finished - started}
+    for phase, begin, end in (("connect", "connection.connect_tcp.started", "connection.connect_tcp.complete"),
+                              ("tls", "connection.start_tls.started", "connection.start_tls.complete")):
+        if begin in marks and end in marks:
+            phases[phase] = marks[end] - marks[begin]
+    for protocol in ("http11", "http2"):
+        headers_done = marks.get(f"{protocol}.receive_response_headers.complete")
+        if headers_done is not None:
+            phases["time_to_headers"] = headers_done - started
+            phases["download"] = max(0.0, marks.get(f"{protocol}.receive_response_body.complete", finished) - headers_done)
+            break
+    return phases
+
+class AsyncProjectsAPI:
+    def __init__(self, client):
+        self.client = client
+
+    async def get(self, project_id: str):
+        return await self.client._make_request("GET", f"/projects/{project_id}", response_model=Project)
+
+    async def list(self):
+        return await self.client._make_request("GET", "/projects", response_model=List[Project])
+
+    def iter_list(self, deadline=None) -> AsyncIterator[Project]:
+        return self.client._iter_list("/projects", Project, deadline=deadline)
+
+    async def create(self, name: str, description: str, prompt_id=None, generation_method: str = "prompt-to-video"):
+        project_params = {
+            "name": name,
+            "description": description,
+            "data": generation_method,
+            "template_key": generation_method
+        }
+
+        if prompt_id:
+            project_params["prompt_id"] = prompt_id
+
+        project_data = await self.client._make_request("POST", "/projects", json=project_params)
+        return await self.get(project_data["id"])
+
+    async def delete(self, project_id: str):
+        return await self.client._make_request("DELETE", f"/projects/{project_id}")
+
+    async def update_project_data(self, project_id: str) -> Project:
+        '''
+        Updates the project data by fetching the latest information from the server
+        Returns the updated project
+        '''
+        return await self.get(project_id)
+
+    async def generate(self, project_id: str, script_id: str, parameters: dict):
+        '''
+        Generate a video using the specified project and script
+        Parameters is a dictionary of the parameters required by the prompt
+        '''
+        parsed_parameters = parse.urlencode(parameters)
+        return await self.client._make_request("POST", f"/projects/{project_id}/{script_id}/generate?{parsed_parameters}")
+
+    async def generate_from_prompt(self, project_id: str, script_id: str, prompt: str, prompt_persona: Optional[str] = None):
+        '''
+        Generate a video using a custom prompt without rendering it
+        Returns the prompt information without generating the video
+        '''
+        custom_prompt = CustomPromptGeneration(
+            prompt=prompt,
+            prompt_persona=prompt_persona if prompt_persona is not None else "",
+            render_prompt=False
+        )
+        return await self.client._make_request("POST", f"/projects/{project_id}/{script_id}/prompt", json=custom_prompt.model_dump())
+
+    async def generate_with_custom_prompt(self, project_id: str, script_id: str, prompt: str, prompt_persona: Optional[str] = None, render_prompt: bool = False, **params):
+        '''
+        Generate a video asset using custom prompt and parameters
+        See ProjectsAPI.generate_with_custom_prompt for details
+        '''
+        custom_prompt = CustomPromptGeneration(
+            prompt=prompt,
+            prompt_persona=prompt_persona if prompt_persona is not None else "",
+            render_prompt=render_prompt
+        )
+
+        query_params = {k: str(v) for k, v in params.items() if v is not None}
+        query_string = ""
+        if query_params:
+            query_string = "?" + parse.urlencode(query_params)
+
+        return await self.client._make_request(
+            "POST",
+            f"/projects/{project_id}/{script_id}/generate{query_string}",
+            json=custom_prompt.model_dump()
+        )
+
+    async def render_edit(self, project_id: str, create_edit: dict):
+        '''
+        Render a video using the specified project and script
+        Returns: {"asset_id": "ffff-ffff-ffff-ffff", "asset_key": "asset-key", "edit_id": "4444-4444-4444-4444"}
+        '''
+        return await self.client._make_request("POST", f"/projects/{project_id}/create-edit", json=create_edit)
+
+    async def update_edit(self, project_id: str, edit_id: str, edit: dict):
+        '''
+        Update an existing edit within a project
+        Returns the updated edit
+        '''
+        return await self.client._make_request("PUT", f"/projects/{project_id}/edits/{edit_id}", json=edit)
+
+    async def create_edit(self, project_id: str, create_edit: VideoEditCreate):
+        '''
+        Create a new edit within a project for editing before rendering
+        '''
+        return await self.client._make_request("POST", f"/projects/{project_id}/create-edit", json=create_edit.model_dump())
+
+    async def get_edit(self, project_id: str, edit_id: str):
+        '''
+        Returns an edit from an edit id and a project id
+        '''
+        return await self.client._make_request("GET", f"/projects/{project_id}/edits/{edit_id}")
+
+    async def list_edits(self, project_id: str):
+        '''
+        Returns a list of edits within a project
+        '''
+        return await self.client._make_request("GET", f"/projects/{project_id}/edits")
+
+    async def add_collaborator(self, project_id: str, edit_id: str, collaborator_email: str):
+        '''
+        Add a collaborator to a video edit. Only the owner can add collaborators.
+
+        Raises:
+            ValueError: If the user is already a collaborator or other business logic error
+        '''
+        request_data = CollaboratorRequest(collaborator_email=collaborator_email)
+        try:
+            return await self.client._make_request(
+                "POST",
+                f"/projects/{project_id}/edits/{edit_id}/collaborators",
+                json=request_data.model_dump()
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 400:
+                try:
+                    error_detail = e.response.json()
+                    error_message = error_detail.get('detail', 'Bad request')
+                    raise ValueError(error_message)
+                except ValueError as json_error:
+                    if "Bad request" in str(json_error):
+                        raise json_error
+                    raise ValueError("Bad request - unable to parse error details")
+            else:
+                raise e
+
+    async def list_collaborators(self, project_id: str, edit_id: str):
+        '''
+        List all collaborators for a video edit. Accessible by owner and collaborators.
+        '''
+        response = await self.client._make_request("GET", f"/projects/{project_id}/edits/{edit_id}/collaborators")
+        return [Collaborator(**collaborator) for collaborator in response["collaborators"]]
+
+    async def remove_collaborator(self, project_id: str, edit_id: str, user_id: str):
+        '''
+        Remove a collaborator from a video edit. Only the owner can remove collaborators.
+        '''
+        return await self.client._make_request(
+            "DELETE",
+            f"/projects/{project_id}/edits/{edit_id}/collaborators/{user_id}"
+        )
+
+
+class AsyncAssetsAPI:
+    def __init__(self, client):
+        self.client = client
+
+    async def check(self, asset_id: str):
+        return await self.client._make_request("GET", f"/assets/check/{asset_id}")
+
+    async def status(self, asset_id: str):
+        return await self.client._make_request("GET", f"/assets/{asset_id}/status")
+
+    async def get(self, asset_id: str):
+        return await self.client._make_request("GET", f"/assets/{asset_id}", response_model=Asset)
+
+    async def list_for_project(self, project_id: str):
+        return await self.client._make_request("GET", f"/projects/{project_id}/asset", response_model=List[Asset])
+
+    def iter_list_for_project(self, project_id: str, deadline=None) -> AsyncIterator[Asset]:
+        return self.client._iter_list(f"/projects/{project_id}/asset", Asset, deadline=deadline)
+
+    def subscribe(self, asset_id: str, last_event_id: Optional[str] = None) -> AsyncSubscription:
+        '''
+        Subscribes to Server-Sent-Events status updates for an asset; see
+        AsyncVideoFileAPI.subscribe. Must be called from a running event loop.
+        '''
+        return self.client.events.subscribe(subscription_path("asset", asset_id), last_event_id=last_event_id)
+
+    async def wait_until_ready(self, asset_id: str, deadline=None) -> Asset:
+        '''
+        Waits until the asset is uploaded, driven by its event stream instead of polling.
+        The optional deadline (seconds or a Deadline) raises DeadlineExceeded when it runs out.
+        '''
+        deadline = Deadline.coerce(deadline)
+
+        async def check():
+            asset = await self.client._make_request("GET", f"/assets/{asset_id}", response_model=Asset, deadline=deadline, use_cache=False)
+            return asset_finished(asset), asset
+
+        return await self.client._watch(subscription_path("asset", asset_id), check, deadline)
+
+    async def list_generated_for_project(self, project_id: str):
+        return await self.client._make_request("GET", f"/projects/{project_id}/asset/generated", response_model=List[Asset])
+
+    def iter_list_generated_for_project(self, project_id: str, deadline=None) -> AsyncIterator[Asset]:
+        return self.client._iter_list(f"/projects/{project_id}/asset/generated", Asset, deadline=deadline)
+
+    async def add_videofile_to_project(self, project_id: str, video_file_id: str, description: str = ""):
+        return await self.upload_asset(name=video_file_id, description=description, project_id=project_id, filename="", upload_method="video-reference")
+
+    async def upload_asset(self, name: str, description: str, project_id: str, filename: str, upload_method: str = "file-no-chunk"):
+        if upload_method == "video-reference":
+            # name should be uuid of asset
+            link = await self.client._make_request("POST", f"/projects/{project_id}/asset", json={"upload_method": upload_method,
+                                                                                                    "asset_type": "video-reference",
+                                                                                                    "keyname": name,
+                                                                                                    "description": description})
+            return await self.get(link['id'])
+        if is_youtube_url(filename):
+            asset_type = "youtube-url"
+        else:
+            asset_type = "user"
+
+        upload_link = await self.client._make_request("POST", f"/projects/{project_id}/asset", json={"upload_method": upload_method,
+                                                                                                     "asset_type": asset_type,
+                                                                                                     "keyname": name,
+                                                                                                     "description": description})
+
+        with open(filename, 'rb') as file_object:
+            uploaded = await self.client._upload(upload_link["upload_url"]["url"], {"file": (filename, file_object)})
+
+        return await self.get(uploaded["id"])
+
+    async def delete(self, asset_id: str):
+        return await self.client._make_request("DELETE", f"/assets/{asset_id}")
+
+    def open(self, asset_id: str, deadline=None, chunk_size: int = 1024 * 1024) -> AsyncDownloadStream:
+        '''
+        Returns a stream of the asset's content, opened once the asset is ready:
+        `async with vj.assets.open(asset_id) as stream` or `stream = await vj.assets.open(asset_id)`.
+        '''
+        deadline = Deadline.coerce(deadline)
+
+        async def send():
+            asset = await self.client._wait_for_asset(asset_id, False, deadline)
+            return await self.client._send_download(asset.download_url, deadline)
+        return AsyncDownloadStream(send, asset_id, deadline, chunk_size=chunk_size)
+
+    async def iter_bytes(self, asset_id: str, chunk_size: int = 1024 * 1024, deadline=None) -> AsyncIterator[bytes]:
+        async with self.open(asset_id, deadline, chunk_size) as stream:
+            async for chunk in stream:
+                yield chunk
+
+    async def download(self, asset_id: str, filename: str, print_progress: bool = False, deadline=None):
+        deadline = Deadline.coerce(deadline)
+        asset = await self.client._wait_for_asset(asset_id, print_progress, deadline)
+        return await self.client._download_url(asset.download_url, filename, deadline)
+
+class AsyncVideoFileAPI:
+    def __init__(self, client):
+        self.client = client
+
+    async def get(self, video_file_id: str):
+        return await self.client._make_request("GET", f"/video-file/{video_file_id}", response_model=VideoFile)
+
+    async def list(self):
+        return await self.client._make_request("GET", "/video-file", response_model=List[VideoFile])
+
+    def iter_list(self, deadline=None) -> AsyncIterator[VideoFile]:
+        '''
+        Async iterator over video files as they arrive: `async for video in vj.video_files.iter_list()`.
+        '''
+        return self.client._iter_list("/video-file", VideoFile, deadline=deadline)
+
+    async def delete(self, video_file_id: str):
+        self.client.analysis_indexes.delete(video_file_id)
+        return await self.client._make_request("DELETE", f"/video-file/{video_file_id}")
+
+    async def search(
+        self,
+        query: Optional[str] = None,
+        limit: int = 10,
+        project_id: Optional[str] = None,
+        duration_min: Optional[float] = None,
+        duration_max: Optional[float] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+        min_relevance: Optional[float] = None,
+        include_segments: bool = True,
+        include_related: bool = False,
+        query_audio: Optional[str] = None,
+        query_img: Optional[str] = None,
+    ):
+        """
+        Search for videos with advanced filtering options.
+        See VideoFileAPI.search for the meaning of each argument.
+        """
+        vs = VideoSearch.create(
+            query=query,
+            limit=limit,
+            project_id=project_id,
+            tags=tags,
+            duration_min=duration_min,
+            duration_max=duration_max,
+            created_after=created_after,
+            created_before=created_before,
+            min_relevance=min_relevance,
+            include_segments=include_segments,
+            include_related=include_related,
+            query_audio=query_audio,
+            query_img=query_img
+        )
+        return await self.client._make_request("POST", "/video-file/search", json=vs.model_dump(mode='json'))
+
+    async def download(self, video_id: str, filename: str, deadline=None, checksum: Optional[Tuple[str, str]] = None):
+        '''
+        Downloads the video file to filename; see VideoFileAPI.download for checksum.
+        '''
+        deadline = Deadline.coerce(deadline)
+        video = await self.client._make_request("GET", f"/video-file/{video_id}", response_model=VideoFile, deadline=deadline)
+        url = video.download_url
+        if not url:
+            raise Exception("Video file has no download URL")
+        await self.client._download_url(url, filename, deadline, video.size, format_checksum(checksum, video.hash))
+        return True
+
+    def open(self, video_id: str, deadline=None, chunk_size: int = 1024 * 1024, checksum: Optional[Tuple[str, str]] = None) -> AsyncDownloadStream:
+        '''
+        Returns a stream of the video file's content, verified against its size and checksum (see VideoFileAPI.download):
+        `async with vj.video_files.open(video_id) as stream` or `stream = await vj.video_files.open(video_id)`.
+        '''
+        deadline = Deadline.coerce(deadline)
+
+        async def send():
+            video = await self.client._make_request("GET", f"/video-file/{video_id}", response_model=VideoFile, deadline=deadline)
+            if not video.download_url:
+                raise Exception("Video file has no download URL")
+            stream.expect(video.size, format_checksum(checksum, video.hash))
+            return await self.client._send_download(video.download_url, deadline)
+        stream = AsyncDownloadStream(send, video_id, deadline, chunk_size=chunk_size)
+        return stream
+
+    async def iter_bytes(self, video_id: str, chunk_size: int = 1024 * 1024, deadline=None) -> AsyncIterator[bytes]:
+        async with self.open(video_id, deadline, chunk_size) as stream:
+            async for chunk in stream:
+                yield chunk
+
+    async def get_analysis(self, video_file_id: str):
+        return await self.client._make_request("GET", f"/video-file/{video_file_id}/analysis")
+
+    async def get_analysis_table(self, video_file_id: str) -> AnalysisTable:
+        return AnalysisTable.from_analysis(await self.get_analysis(video_file_id))
+
+    async def analysis_index(self, video_file_id: str, refresh: bool = False) -> IntervalIndex:
+        '''
+        IntervalIndex over the video file's analysis segments, cached on the client; see VideoFileAPI.analysis_index.
+        '''
+        index = None if refresh else self.client.analysis_indexes.get(video_file_id)
+        if index is None:
+            index = IntervalIndex(await self.get_analysis_table(video_file_id))
+            self.client.analysis_indexes.set(video_file_id, index)
+        return index
+
+    async def create(self, name: str, filename: str, upload_method: str = "file-no-chunk", run_analysis: bool = True):
+        '''
+        Create a video file
+        Expects an upload method of either: 'url', 'direct', or 'file-no-chunk'
+        See VideoFileAPI.create for details
+        '''
+        if upload_method == "file-no-chunk":
+            upload_link = await self.client._make_request("POST", "/video-file", json={"name": name, "filename": filename, "upload_method": upload_method})
+            with open(filename, 'rb') as file_obj:
+                uploaded = await self.client._upload(f"/video-file/{upload_link['video']['id']}/upload-video", {"file": file_obj})
+            if run_analysis:
+                await self.client._make_request("POST", f"/video-file/{uploaded['id']}/analysis")
+            return await self.get(uploaded["id"])
+        elif upload_method == "url":
+            print("Downloading from URL...")
+            return await self.client._make_request("POST", "/video-file", json={"name": name, "filename": filename, "upload_method": upload_method})
+
+        vf = await self.client._make_request("POST", "/video-file", json={"name": name, "filename": filename, "upload_method": upload_method})
+        if run_analysis:
+            await self.client._make_request("POST", f"/video-file/{vf['id']}/analysis")
+        return vf
+
+    async def upload_direct(self, video_file_id, file):
+        return await self.client._upload(f"/video-file/{video_file_id}/upload-video", {"file": file})
+
+    async def create_analysis(self, video_file_id):
+        '''
+        Starts analysis of a video file. Wait for it with wait_for_analysis, which
+        also drops any analysis_index built while the analysis was running.
+        '''
+        self.client.analysis_indexes.delete(video_file_id)
+        return await self.client._make_request("POST", f"/video-file/{video_file_id}/analysis")
+
+    def subscribe(self, video_file_id: str, last_event_id: Optional[str] = None) -> AsyncSubscription:
+        '''
+        Subscribes to Server-Sent-Events status updates for a video file:
+
+            async with vj.video_files.subscribe(video_file_id) as events:
+                async for event in events:
+                    print(event.json())
+
+        Subscriptions to the same video share one connection, which reconnects
+        automatically and resumes from the last event id it saw. Must be called
+        from a running event loop.
+        '''
+        return self.client.events.subscribe(subscription_path("video", video_file_id), last_event_id=last_event_id)
+
+    async def wait_for_analysis(self, video_file_id: str, deadline=None) -> VideoFile:
+        '''
+        Waits until the video file has been analyzed, driven by its event stream instead of polling.
+        The optional deadline (seconds or a Deadline) raises DeadlineExceeded when it runs out.
+        '''
+        deadline = Deadline.coerce(deadline)
+
+        async def check():
+            video = await self.client._make_request("GET", f"/video-file/{video_file_id}", response_model=VideoFile, deadline=deadline, use_cache=False)
+            return analysis_finished(video), video
+
+        try:
+            return await self.client._watch(subscription_path("video", video_file_id), check, deadline)
+        finally:
+            # An index built while the analysis was running is missing its results
+            self.client.analysis_indexes.delete(video_file_id)
+
+class AsyncPromptsAPI:
+    def __init__(self, client):
+        self.client = client
+
+    async def list(self):
+        return await self.client._make_request("GET", "/prompts", response_model=List[Prompt])
+
+    async def create(self, prompt: str, parameters: List[str], name: str = "", persona: str = "", task: str = ""):
+        return await self.client._make_request("POST", "/prompts", json={"value": prompt, "parameters": parameters, "persona": persona, "task": task, "name": name}, response_model=Prompt)
+
+    async def generate(self, task: str, parameters: List[str], deadline=None):
+        '''
+        Generates a prompt for video generation process
+        Parameters is a list of the parameters required by the prompt to generate a video
+        The optional deadline (seconds or a Deadline) bounds the whole generation.
+        '''
+        deadline = Deadline.coerce(deadline)
+        res = await self.client._make_request("POST", "/prompts/generate", json={"task": task, "parameters": parameters}, deadline=deadline)
+
+        async def check():
+            prompt = await self.client._make_request("GET", f"/prompts/{res['id']}", response_model=Prompt, deadline=deadline, use_cache=False)
+            return prompt.value != "generating...", prompt
+
+        print("Generating prompt...")
+        return await self.client._poll_until("prompt", check, deadline)
+
+    async def get(self, prompt_id: str):
+        return await self.client._make_request("GET", f"/prompts/{prompt_id}", response_model=Prompt)
+
+    async def delete(self, prompt_id: str):
+        return await self.client._make_request("DELETE", f"/prompts/{prompt_id}")
+
+class AsyncScriptsAPI:
+    def __init__(self, client):
+        self.client = client
+
+    async def list_options(self):
+        return await self.client._make_request("GET", "/scripts", response_model=List[ScriptTemplate])
+
+    async def list(self, project_id: str):
+        return await self.client._make_request("GET", f"/projects/{project_id}/scripts", response_model=List[Script])
+
+    async def get(self, project_id: str, script_id: str):
+        return await self.client._make_request("GET", f"/scripts/{project_id}/{script_id}", response_model=Script)
+
+    async def create(self, project_id: str, name: str, data: dict, inputs: dict):
+        return await self.client._make_request("POST", f"/scripts/{project_id}/scripts", json={"name": name, "data": data, "inputs": inputs}, response_model=Script)
+
+    async def delete(self, project_id: str, script_id: str):
+        return await self.client._make_request("DELETE", f"/scripts/{project_id}/{script_id}")
+
+class AsyncUserAPI:
+    def __init__(self, client):
+        self.client = client
+
+    async def info(self):
+        return await self.client._make_request("GET", "/users/me", response_model=User)
+
+class AsyncEditAPI:
+    def __init__(self, client):
+        self.client = client
+
+    def get_edit_schema(self) -> dict[str, Any]:
+        '''
+        Get the schema for the edit object
+        Returns a JSON schema
+        '''
+        return VideoEditCreate.model_json_schema()
+
+    async def create_edit(self, project_id: str, create_edit: VideoEditCreate):
+        '''
+        Create a new edit within a project for editing before rendering
+        '''
+        return await self.client._make_request("POST", f"/projects/{project_id}/create-edit", json=create_edit.model_dump())
+
+    async def create_edit_from_clips(
+                    self,
+                    project_id: str,
+                    clips: list[dict],
+                    name: str = "",
+                    description: str = "",
+                    output_format: str = "mp4",
+                    output_resolution: str = "1920x1080",
+                    output_fps: float = 30.0,
+                    skip_rendering: bool = False,
+                    subtitle_from_audio_overlay: bool = True,
+                    auto_vertical_crop: Optional[str] = None
+                ) -> dict:
+        """
+        Create a video edit with multiple clips.
+        See EditAPI.create_edit_from_clips for the clip dictionary format.
+        """
+        video_series = []
+        for clip in clips:
+            video_id = clip.get("id")
+            start_time = clip.get("start_time")
+            end_time = clip.get("end_time")
+            crop = clip.get("crop")
+
+            if not video_id:
+                raise ValueError("Each clip must include an id")
+            if not start_time:
+                raise ValueError("Each clip must include a start_time")
+            if not end_time:
+                raise ValueError("Each clip must include an end_time")
+
+            try:
+                video_uuid = UUID(video_id) if isinstance(video_id, str) else video_id
+            except ValueError:
+                raise ValueError(f"Invalid id: {video_id}")
+
+            crop_settings = None
+            if crop:
+                crop_settings = CropSettings(
+                    zoom=crop.get("zoom", 1.0),
+                    position_x=crop.get("position_x", 0.0),
+                    position_y=crop.get("position_y", 0.0)
+                )
+
+            video_series.append(VideoEditAsset(
+                video_id=video_uuid,
+                type=clip.get("type", "videofile"),
+                video_start_time=start_time,
+                video_end_time=end_time,
+                audio_levels=[],
+                crop=crop_settings
+            ))
+
+        edit = VideoEditCreate(
+            name=name,
+            description=description,
+            video_edit_version="1.0",
+            video_output_format=output_format,
+            video_output_resolution=output_resolution,
+            video_output_fps=output_fps,
+            video_output_filename=f"{name or 'video'}.{output_format}",
+            video_series_sequential=video_series,
+            audio_overlay=[],
+            skip_rendering=skip_rendering,
+            subtitle_from_audio_overlay=subtitle_from_audio_overlay,
+            auto_vertical_crop=auto_vertical_crop
+        )
+
+        return await self.create_edit(project_id, edit)
+
+    async def get(self, project_id: str, edit_id: str):
+        return await self.client._make_request("GET", f"/projects/{project_id}/edits/{edit_id}")
+
+    def open_in_browser(self, project_id: str, edit_id: str):
+        """
+        Open the edit in the browser.
+        """
+        url = f"https://app.video-jungle.com/projects/{project_id}/edits/{edit_id}"
+        import webbrowser
+        webbrowser.open(url)
+        return
+
+    async def list(self, project_id: str):
+        return await self.client._make_request("GET", f"/projects/{project_id}/edits")
+
+    def iter_list(self, project_id: str, deadline=None) -> AsyncIterator[dict]:
+        return self.client._iter_list(f"/projects/{project_id}/edits", deadline=deadline)
+
+    async def render_edit(self, project_id: str, edit_id: str) -> dict:
+        """
+        Returns a dictionary with asset_id, asset_key, and original edit_id
+        """
+        return await self.client._make_request("POST", f"/projects/{project_id}/edits/{edit_id}/render")
+
+    async def download_edit_render(self, project_id: str, edit_id: str, filename: str, print_progress: bool = False, deadline=None):
+        """
+        Download an edit render, rendering and waiting for rendered file if
+        not already rendered. Optionally print progress to console.
+        The optional deadline (seconds or a Deadline) covers rendering, polling and the download.
+        """
+        deadline = Deadline.coerce(deadline)
+        edit = await self.client._make_request("GET", f"/projects/{project_id}/edits/{edit_id}", deadline=deadline)
+        url = edit.get("download_url")
+
+        if not url:
+            render = await self.client._make_request("POST", f"/projects/{project_id}/edits/{edit_id}/render", deadline=deadline)
+            asset = await self.client._wait_for_asset(render["asset_id"], print_progress, deadline)
+            url = asset.download_url
+        return await self.client._download_url(url, filename, deadline)
@@ -0,0 +1,221 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Mapping, Optional
+from .utils import endpoint_path, endpoint_template
+
+MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+class CacheEntry:
+    '''
+    A cached GET response body together with its freshness and validators.
+    '''
+    __slots__ = ("path", "body", "etag", "last_modified", "expires_at")
+
+    def __init__(self, path: str, body: bytes, etag: Optional[str], last_modified: Optional[str], expires_at: float):
+        self.path = path
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def has_validators(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def json(self):
+        # Decode on every hit so callers never share (and mutate) the same objects
+        return json.loads(self.body)
+
+class CacheBackend:
+    '''
+    Storage interface used by ResponseCache. Subclass this to keep entries
+    somewhere other than process memory; implementations must be thread-safe.
+    '''
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    def set(self, key: Hashable, entry: CacheEntry):
+        raise NotImplementedError
+
+    def delete(self, key: Hashable):
+        raise NotImplementedError
+
+    def items(self):
+        '''
+        Returns a snapshot list of (key, entry) pairs.
+        '''
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+class LRUCacheBackend(CacheBackend):
+    '''
+    In-memory backend that evicts the least recently used entry once
+    max_entries is exceeded.
+    '''
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def items(self):
+        with self._lock:
+            return list(self._entries.items())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class ResponseCache:
+    '''
+    Response cache for GET requests made through ApiClient / AsyncApiClient.
+
+    Entries are served without a request while younger than their TTL. TTLs are
+    configured per endpoint template, e.g. {"/scripts": 300, "/projects/{id}": 5};
+    endpoints without one use default_ttl. Once an entry is stale, and if the
+    server sent an ETag or Last-Modified header, the next request is made
+    conditional and a 304 response is served from the cache.
+
+    Any POST/PUT/PATCH/DELETE invalidates cached entries for the same path,
+    its parents (e.g. the collection it belongs to) and its children.
+    '''
+
+    def __init__(self, ttls: Optional[Mapping[str, float]] = None, default_ttl: float = 0.0, max_entries: int = 1024, backend: Optional[CacheBackend] = None):
+        '''
+        Args:
+            ttls: Seconds to keep responses fresh, keyed by endpoint template
+            default_ttl: TTL for endpoints not listed in ttls; with 0 they are always
+                revalidated when the server provides validators, and not cached otherwise
+            max_entries: Capacity of the default in-memory LRU backend
+            backend: Optional storage backend to use instead of the in-memory LRU
+        '''
+        self.ttls = {endpoint_template(k): v for k, v in (ttls or {}).items()}
+        self.default_ttl = default_ttl
+        self.backend = backend if backend is not None else LRUCacheBackend(max_entries)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.invalidations = 0
+
+    def ttl_for(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint_template(endpoint), self.default_ttl)
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def lookup(self, key: Hashable, use_fresh: bool = True) -> Optional[CacheEntry]:
+        '''
+        Returns a fresh entry, a stale entry that can be revalidated, or None.
+        With use_fresh=False (the caller will ask the server regardless) a fresh
+        entry is only returned for revalidation and is not counted as a hit.
+        '''
+        entry = self.backend.get(key)
+        if entry is not None and entry.is_fresh() and use_fresh:
+            self._count("hits")
+            return entry
+        if entry is None or not entry.has_validators():
+            self._count("misses")
+            return None
+        return entry
+
+    def store(self, key: Hashable, endpoint: str, body: bytes, headers: Mapping[str, str]):
+        '''
+        Stores a successful GET response if it has a TTL or validators.
+        '''
+        cache_control = headers.get("Cache-Control", "").lower()
+        if "no-store" in cache_control:
+            self.backend.delete(key)
+            return
+        ttl = 0.0 if "no-cache" in cache_control else self.ttl_for(endpoint)
+        entry = CacheEntry(
+            path=endpoint_path(endpoint),
+            body=body,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            expires_at=time.time() + ttl,
+        )
+        if ttl > 0 or entry.has_validators():
+            self.backend.set(key, entry)
+
+    def refresh(self, key: Hashable, endpoint: str, entry: CacheEntry, headers: Mapping[str, str]) -> CacheEntry:
+        '''
+        Marks a stale entry fresh again after a 304 Not Modified response.
+        '''
+        self._count("revalidated")
+        refreshed = CacheEntry(
+            path=entry.path,
+            body=entry.body,
+            etag=headers.get("ETag", entry.etag),
+            last_modified=headers.get("Last-Modified", entry.last_modified),
+            expires_at=time.time() + self.ttl_for(endpoint),
+        )
+        self.backend.set(key, refreshed)
+        return refreshed
+
+    def invalidate(self, endpoint: str):
+        '''
+        Drops entries whose path is the given path, one of its parents, or one of its children.
+        '''
+        path = endpoint_path(endpoint)
+        for key, entry in self.backend.items():
+            if _related(entry.path, path):
+                self.backend.delete(key)
+                self._count("invalidations")
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "invalidations": self.invalidations,
+            }
+
+def _related(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    return longer.startswith(shorter.rstrip("/") + "/")
@@ -1,18 +1,102 @@
 import requests
+from requests.adapters import HTTPAdapter
 from urllib import parse
-from typing import List, Optional, Any
-from .model import VideoFile, Script, ScriptTemplate, Prompt, Project, Asset, User, VideoSearch, VideoFilters, DurationFilter, VideoEditCreate, VideoEditAsset, CustomPromptGeneration, CropSettings, Collaborator, CollaboratorRequest
-from .utils import is_youtube_url
+from typing import Callable, Iterator, List, Optional, Any, Tuple
+from .model import VideoFile, Script, ScriptTemplate, Prompt, Project, Asset, User, VideoSearch, VideoFilters, DurationFilter, VideoEditCreate, VideoEditAsset, CustomPromptGeneration, CropSettings, Collaborator, CollaboratorRequest, validate_json_response, load_model, HYDRATION_MODES
+from .utils import is_youtube_url, endpoint_template
+from .retry import RetryPolicy, RetryStats, AttemptRecord
+from .singleflight import SingleFlight, request_key
+from .cache import ResponseCache, LRUCacheBackend, MUTATING_METHODS
+from .ratelimit import RateLimiter, classify_endpoint
+from .stats import Hooks, RequestEvent, StatsCollector
+from .timeouts import Timeout, Deadline
+from .jobs import Job, JobPoller, asset_finished, asset_ready_check, analysis_complete_check, prompt_ready_check
+from .multipart import MultipartEncoder
+from .uploads import DirectUploader, UploadJournal, UploadProgress, UploadOutcome, UploadTargetRejected, BulkUploadResult, presigned_upload_info, created_video_id
+from .dedup import DedupIndex
+from .events import EventMultiplexer, ServerSentEvent, Subscription, CONNECTED, subscription_path
+from .mediacache import MediaCache, media_key
+from .downloads import RangeDownloader, DownloadStream, DownloadOutcome, BulkDownloadResult, download_complete, format_checksum
+from .analysis import AnalysisTable, IntervalIndex
+from .listing import ListBody, LIST_CHUNK_SIZE, next_page_url, same_origin
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
 import time
 from datetime import datetime
 from uuid import UUID
-import httpx
 
 class ApiClient:
     BASE_URL = "https://api.video-jungle.com"
 
-    def __init__(self, token):
+    def __init__(
+        self,
+        token,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        session: Optional[requests.Session] = None,
+        retry: Optional[RetryPolicy] = None,
+        coalesce_requests: bool = False,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        collect_stats: bool = False,
+        timeout: Optional[Timeout] = None,
+        dedup: Optional[DedupIndex] = None,
+        media_cache: Optional[MediaCache] = None,
+        hydration: str = "full",
+    ):
+        '''
+        Create an API client backed by a single pooled, keep-alive HTTP session
+        shared by every sub-API (projects, assets, video files, edits, ...).
+
+        Args:
+            token: Video Jungle API key
+            pool_connections: Number of distinct hosts to keep connection pools for
+            pool_maxsize: Maximum number of idle connections kept per host; set this
+                to at least the number of threads sharing the client
+            session: Optional pre-configured requests.Session to use instead
+            retry: Retry policy for transient failures. Defaults to RetryPolicy(), which
+                retries idempotent methods on 429/502/503/504 and connection errors;
+                pass RetryPolicy(max_attempts=1) to disable retries
+            coalesce_requests: Share one in-flight HTTP call between concurrent identical
+                GET requests (e.g. many threads polling the same project)
+            cache: Optional ResponseCache for GET responses, with per-endpoint TTLs and
+                ETag / Last-Modified revalidation
+            rate_limiter: Optional RateLimiter pacing requests per endpoint class (search,
+                generate, upload, reads, writes); share one instance between clients
+            collect_stats: Keep per-endpoint latency and byte histograms in client.stats
+            timeout: Connect / read / total timeouts for every request. Defaults to
+                Timeout(connect=10, read=120); pass Timeout(None, None) to wait forever
+            dedup: Optional DedupIndex; uploads of files whose content was uploaded
+                before reuse the existing video file or asset instead
+            media_cache: Optional MediaCache; asset and video file downloads are served
+                from it when the same file was downloaded before on this host
+            hydration: "full" (default) validates whole responses up front; "lazy" validates
+                a project's assets, prompts and scripts only when they are first read,
+                which makes listing projects much cheaper when only their scalars are used
+        '''
+        if hydration not in HYDRATION_MODES:
+            raise ValueError(f"hydration must be one of {', '.join(HYDRATION_MODES)}")
         self.token = token
+        self._owns_session = session is None
+        self.session = session if session is not None else self._create_session(pool_connections, pool_maxsize)
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.retry_stats = RetryStats()
+        self.coalescer = SingleFlight() if coalesce_requests else None
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.hooks = Hooks()
+        self.stats = StatsCollector() if collect_stats else None
+        self.timeout = timeout if timeout is not None else Timeout()
+        self.dedup = dedup
+        self.media_cache = media_cache
+        self.hydration = hydration
+        self.jobs = JobPoller()
+        self.events = EventMultiplexer(self)
+        self.downloader = RangeDownloader(self.session, self.timeout.for_attempt)
+        # IntervalIndex per video file id, see video_files.analysis_index
+        self.analysis_indexes = LRUCacheBackend(max_entries=64)
         self.projects = ProjectsAPI(self)
         self.video_files = VideoFileAPI(self)
         self.prompts = PromptsAPI(self)
@@ -21,7 +105,37 @@ class ApiClient:
         self.user_account = UserAPI(self)
         self.edits = EditAPI(self)
 
-    def _make_request(self, method, endpoint, **kwargs):
+    @staticmethod
+    def _create_session(pool_connections: int, pool_maxsize: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self):
+        '''
+        Stop polling outstanding jobs, close event subscriptions and the pooled
+        connections. Sessions passed in by the caller are left open.
+        '''
+        self.jobs.close()
+        self.events.close()
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _make_request(self, method, endpoint, response_model=None, deadline=None, use_cache=True, **kwargs):
+        '''
+        Sends a request to the API and returns the decoded JSON body, validated
+        into response_model (a model class or List[Model]) when one is given.
+        The call, including retries, must finish before `deadline` (seconds or a Deadline).
+        use_cache=False always asks the server, even when a cached GET is still fresh.
+        '''
         headers = {
             "X-API-Key": self.token
         }
@@ -30,11 +144,37 @@ class ApiClient:
             headers.update(user_headers)
 
         url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
-        response = requests.request(method, url, headers=headers, **kwargs)
-        
+        deadline = self.timeout.deadline(Deadline.coerce(deadline))
+        # Only plain GETs (no body, no streaming) are coalesced and cached
+        plain_get = method.upper() == "GET" and not kwargs.keys() - {"params"}
+        cache_key = None
+        cached = None
+        if self.cache is not None and plain_get:
+            cache_key = request_key(method, url, kwargs.get("params"), headers)
+            cached = self.cache.lookup(cache_key, use_fresh=use_cache)
+            if cached is not None:
+                if use_cache and cached.is_fresh():
+                    return self._decode(method, endpoint, cached.body, response_model)
+                headers.update(cached.conditional_headers())
+
+        if self.coalescer is not None and plain_get:
+            key = request_key(method, url, kwargs.get("params"), headers)
+            response = self.coalescer.do(key, lambda: self._send_with_retries(method, url, endpoint, deadline, headers=headers, **kwargs), deadline)
+        else:
+            response = self._send_with_retries(method, url, endpoint, deadline, headers=headers, **kwargs)
+
+        if self.cache is not None:
+            if cached is not None and response.status_code == 304:
+                cached = self.cache.refresh(cache_key, endpoint, cached, response.headers)
+                return self._decode(method, endpoint, cached.body, response_model)
+            if method.upper() in MUTATING_METHODS:
+                self.cache.invalidate(endpoint)
+
         try:
             response.raise_for_status()
-            return response.json()
+            if cache_key is not None:
+                self.cache.store(cache_key, endpoint, response.content, response.headers)
+            return self._decode(method, endpoint, response.content, response_model)
         except requests.exceptions.HTTPError as e:
             if response.status_code == 422:
                 try:
@@ -46,23 +186,239 @@ class ApiClient:
             
             # Re-raise the original exception after printing details
             raise e
-    
+
+    def _decode(self, method, endpoint, body: bytes, response_model=None):
+        # JSON decoding and model validation are timed apart from the network phases.
+        # With a response_model the body is validated straight from bytes, so both
+        # happen in one pass and are recorded as the validate phase.
+        started = time.perf_counter()
+        if response_model is not None:
+            obj = validate_json_response(response_model, body, self.hydration)
+            phase = "validate"
+        else:
+            obj = json.loads(body)
+            phase = "decode"
+        if self.stats is not None:
+            self.stats.record_phase(method, endpoint_template(endpoint), phase, time.perf_counter() - started)
+        return obj
+
+    def _send_with_retries(self, method, url, endpoint, deadline: Optional[Deadline], **kwargs) -> requests.Response:
+        started = time.monotonic()
+        attempt = 0
+        has_files = "files" in kwargs or isinstance(kwargs.get("data"), MultipartEncoder)
+        endpoint_class = classify_endpoint(method, endpoint, has_files)
+        template = endpoint_template(endpoint)
+        explicit_timeout = "timeout" in kwargs
+        while True:
+            attempt += 1
+            # requests can't be interrupted mid-call, so the deadline is checked
+            # here and only bounds each attempt through its per-read timeouts
+            if deadline is not None:
+                deadline.check(f"{method} {endpoint}")
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint_class)
+            if not explicit_timeout:
+                kwargs["timeout"] = self.timeout.for_attempt(deadline)
+            event = RequestEvent(method, endpoint, template, url, attempt)
+            Hooks.fire(self.hooks.request, event)
+            attempt_started = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                now = time.monotonic()
+                event.error = e
+                event.phases["total"] = now - attempt_started
+                self._record_attempt(event, self.hooks.error)
+                delay = self._retry_delay(deadline, method, attempt, now - started)
+                self.retry_stats.record(AttemptRecord(method, endpoint, attempt, None, type(e).__name__, now - attempt_started, delay), final=delay is None)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+
+            now = time.monotonic()
+            event.status_code = response.status_code
+            event.phases["total"] = now - attempt_started
+            event.bytes_sent = int(response.request.headers.get("Content-Length", 0))
+            if kwargs.get("stream"):
+                event.phases["time_to_headers"] = event.phases["total"]
+            else:
+                # requests reads the body before returning; elapsed stops at the headers
+                event.phases["time_to_headers"] = response.elapsed.total_seconds()
+                event.phases["download"] = max(0.0, event.phases["total"] - event.phases["time_to_headers"])
+                event.bytes_received = len(response.content)
+            self._record_attempt(event, self.hooks.response)
+
+            delay = None
+            if response.status_code >= 400:
+                delay = self._retry_delay(deadline, method, attempt, now - started, response.status_code, response.headers)
+            self.retry_stats.record(AttemptRecord(method, endpoint, attempt, response.status_code, None, now - attempt_started, delay), final=delay is None)
+            if delay is None:
+                return response
+            response.close()
+            time.sleep(delay)
+
+    def _retry_delay(self, deadline: Optional[Deadline], method, attempt, elapsed, status_code=None, headers=None) -> Optional[float]:
+        delay = self.retry.get_delay(method, attempt, elapsed, status_code, headers)
+        # Don't sleep past the deadline only to give up afterwards
+        if delay is not None and deadline is not None and delay >= deadline.remaining():
+            return None
+        return delay
+
+    def _record_attempt(self, event: RequestEvent, callbacks):
+        if self.stats is not None:
+            self.stats.record_attempt(event)
+        Hooks.fire(callbacks, event)
+
+    def _asset_job(self, kind: str, response: dict, subscribe: bool = False, deadline: Optional[Deadline] = None) -> Job:
+        # Responses without an asset id have nothing to wait for
+        asset_id = response.get("asset_id")
+        job = Job(kind, response, asset_ready_check(self, asset_id, deadline), deadline=deadline, key=("asset", asset_id))
+        if not asset_id:
+            job.set_result(None)
+            return job
+        if subscribe:
+            return self._watch(job, subscription_path("asset", asset_id))
+        return self.jobs.submit(job)
+
+    def _watch(self, job: Job, path: str) -> Job:
+        # Push-based alternative to self.jobs.submit(): the job is checked when its
+        # event stream (re)connects and whenever an event arrives, never on a timer
+        def on_item(item):
+            if isinstance(item, BaseException):
+                job._finish(error=item)
+            elif item is CONNECTED or isinstance(item, ServerSentEvent):
+                job.poll()
+
+        subscription = self.events.subscribe(path, callback=on_item)
+        job.add_done_callback(lambda _: subscription.close())
+        if job.deadline is not None:
+            # Fails the job if no event completes it in time
+            timer = threading.Timer(job.deadline.remaining(), job.poll)
+            timer.daemon = True
+            timer.start()
+            job.add_done_callback(lambda _: timer.cancel())
+        return job
+
+    def _upload(self, endpoint: str, fields: dict, hasher=None, **kwargs):
+        # POSTs fields as a streamed multipart/form-data body instead of buffering files in memory
+        encoder = MultipartEncoder(fields, hasher=hasher)
+        headers = dict(kwargs.pop("headers", {}), **{"Content-Type": encoder.content_type})
+        return self._make_request("POST", endpoint, data=encoder, headers=headers, **kwargs)
+
+    def _wait_for_asset(self, asset_id: str, print_progress: bool = False, deadline: Optional[Deadline] = None) -> Asset:
+        # Polled by the shared scheduler, batched with every other job waiting on an asset
+        job = Job("asset", {"asset_id": asset_id}, asset_ready_check(self, asset_id, deadline), deadline=deadline, key=("asset", asset_id))
+        self.jobs.submit(job)
+        if print_progress and not job.done():
+            print("Waiting for asset to be ready...")
+        return job.result()
+
+    def _download_many(self, items: list, concurrency: int, deadline: Optional[Deadline], print_progress: bool) -> BulkDownloadResult:
+        # items are (id, filename, source) where source is a download URL, a Job
+        # resolving to an Asset, or the exception that stopped the item early.
+        # URLs start downloading at once, jobs as soon as they finish. Files
+        # already on disk are skipped when their size matches the server's.
+        started = time.monotonic()
+        outcomes: List[Optional[DownloadOutcome]] = [None] * len(items)
+
+        def download(index, url):
+            item_id, filename, _ = items[index]
+            try:
+                if os.path.isfile(filename) and download_complete(filename, self.downloader.remote_size(url, deadline)):
+                    outcomes[index] = DownloadOutcome(item_id, filename, skipped=True)
+                    return
+                self._download_url(url, filename, deadline)
+                outcomes[index] = DownloadOutcome(item_id, filename)
+                if print_progress:
+                    print(f"Downloaded {filename}")
+            except Exception as e:
+                outcomes[index] = DownloadOutcome(item_id, filename, error=e)
+                if print_progress:
+                    print(f"Failed to download {filename}: {e}")
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="videojungle-bulk-download") as pool:
+            jobs = {}
+            for index, (item_id, filename, source) in enumerate(items):
+                if isinstance(source, BaseException):
+                    outcomes[index] = DownloadOutcome(item_id, filename, error=source)
+                elif isinstance(source, Job):
+                    jobs[source] = index
+                else:
+                    pool.submit(download, index, source)
+            if print_progress and jobs:
+                print(f"Waiting for {len(jobs)} render(s)...")
+            for job in as_completed(jobs):
+                index = jobs[job]
+                try:
+                    asset = job.result()
+                except Exception as e:
+                    outcomes[index] = DownloadOutcome(items[index][0], items[index][1], error=e)
+                    continue
+                pool.submit(download, index, asset.download_url)
+        return BulkDownloadResult(outcomes, time.monotonic() - started)
+
+    def _open_url(self, url: str, name: str, deadline: Optional[Deadline] = None,
+                  expected_size: Optional[int] = None, expected_hash: Optional[str] = None) -> DownloadStream:
+        response = self.session.get(url, stream=True, timeout=self.timeout.for_attempt(deadline))
+        if response.status_code != 200:
+            response.close()
+            raise Exception(f"Failed to download asset: {response.text}")
+        return DownloadStream(response, name, deadline, expected_size, expected_hash)
+
+    def _download_url(self, url: str, filename: str, deadline: Optional[Deadline] = None,
+                      expected_size: Optional[int] = None, expected_hash: Optional[str] = None):
+        # Written to filename.part, resumed after interruptions and verified when size / hash are known
+        return self.downloader.download(url, filename, deadline, expected_size, expected_hash)
+
+    def _iter_list(self, endpoint: str, response_model=None, deadline=None, chunk_size: int = LIST_CHUNK_SIZE) -> Iterator[Any]:
+        '''
+        Yields the items of a list endpoint as they arrive, validated into
+        response_model when one is given. Follows the server's pages when it
+        sends them (Link: rel="next", or an {"items", "next"} envelope); a plain
+        JSON array is parsed incrementally from the response body. Streams
+        bypass the response cache and request coalescing.
+        '''
+        deadline = self.timeout.deadline(Deadline.coerce(deadline))
+        url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
+        while url is not None:
+            # Page links pointing elsewhere don't get the API key
+            headers = {"X-API-Key": self.token} if same_origin(url, self.BASE_URL) else {}
+            response = self._send_with_retries("GET", url, parse.urlsplit(url).path, deadline, headers=headers, stream=True)
+            with response:
+                response.raise_for_status()
+                body = ListBody()
+                for chunk in response.iter_content(chunk_size):
+                    if deadline is not None:
+                        deadline.check(f"GET {endpoint}")
+                    for item in body.feed(chunk):
+                        yield load_model(response_model, item, self.hydration) if response_model is not None else item
+                for item in body.close():
+                    yield load_model(response_model, item, self.hydration) if response_model is not None else item
+                url = next_page_url(url, response.links, body)
+
 class ProjectsAPI:
     def __init__(self, client):
         self.client = client
 
     def get(self, project_id: str):
-        obj = self.client._make_request("GET", f"/projects/{project_id}")
-        project = Project(**obj)
+        project = self.client._make_request("GET", f"/projects/{project_id}", response_model=Project)
         project._client = self.client
         return project
     
     def list(self):
-        obj = self.client._make_request("GET", "/projects")
-        projects = [Project(**project) for project in obj]
+        projects = self.client._make_request("GET", "/projects", response_model=List[Project])
         for project in projects:
             project._client = self.client
         return projects
+
+    def iter_list(self, deadline=None) -> Iterator[Project]:
+        '''
+        Like list(), but yields projects as they arrive instead of building the whole list.
+        '''
+        for project in self.client._iter_list("/projects", Project, deadline=deadline):
+            project._client = self.client
+            yield project
     
     def create(self, name: str, description: str, prompt_id=None, generation_method: str = "prompt-to-video"):
         project_params = {
@@ -93,13 +449,16 @@ class ProjectsAPI:
         updated_project._client = self.client
         return updated_project
     
-    def generate(self, project_id: str, script_id: str, parameters: dict):
+    def generate(self, project_id: str, script_id: str, parameters: dict) -> Job:
         '''
         Generate a video using the specified project and script
         Parameters is a dictionary of the parameters required by the prompt
+        Returns a Job that resolves to the generated Asset once it is uploaded;
+        job["asset_id"] etc. still give access to the API response
         '''
         parsed_parameters = parse.urlencode(parameters)
-        return self.client._make_request("POST", f"/projects/{project_id}/{script_id}/generate?{parsed_parameters}")
+        response = self.client._make_request("POST", f"/projects/{project_id}/{script_id}/generate?{parsed_parameters}")
+        return self.client._asset_job("generate", response)
     
     def generate_from_prompt(self, project_id: str, script_id: str, prompt: str, prompt_persona: Optional[str] = None):
         '''
@@ -126,7 +485,8 @@ class ProjectsAPI:
             **params: Additional query parameters (e.g., burn_subtitles, vj_media_gen, vj_video_1, vj_audio_1)
             
         Returns:
-            dict: Asset generation response containing asset_id, file_key, and asset_key
+            Job: Resolves to the generated Asset once it is uploaded. Indexing the job
+                gives the generation response (asset_id, file_key, and asset_key)
         '''
         custom_prompt = CustomPromptGeneration(
             prompt=prompt,
@@ -142,11 +502,12 @@ class ProjectsAPI:
         if query_params:
             query_string = "?" + parse.urlencode(query_params)
         
-        return self.client._make_request(
+        response = self.client._make_request(
             "POST", 
             f"/projects/{project_id}/{script_id}/generate{query_string}",
             json=custom_prompt.model_dump()
         )
+        return self.client._asset_job("generate", response)
     
     def render_edit(self, project_id: str, create_edit: dict):
         '''
@@ -260,23 +621,50 @@ class AssetsAPI:
         return self.client._make_request("GET", f"/assets/{asset_id}/status")
 
     def get(self, asset_id: str):
-        obj = self.client._make_request("GET", f"/assets/{asset_id}")
-        return Asset(**obj)
+        return self.client._make_request("GET", f"/assets/{asset_id}", response_model=Asset)
     
     def list_for_project(self, project_id: str):
-        obj = self.client._make_request("GET", f"/projects/{project_id}/asset")
-        return [Asset(**asset) for asset in obj]
+        return self.client._make_request("GET", f"/projects/{project_id}/asset", response_model=List[Asset])
+
+    def iter_list_for_project(self, project_id: str, deadline=None) -> Iterator[Asset]:
+        '''
+        Like list_for_project(), but yields assets as they arrive instead of building the whole list.
+        '''
+        return self.client._iter_list(f"/projects/{project_id}/asset", Asset, deadline=deadline)
+
+    def subscribe(self, asset_id: str, last_event_id: Optional[str] = None) -> Subscription:
+        '''
+        Subscribes to Server-Sent-Events status updates for an asset.
+        Subscriptions to the same asset share one connection, which reconnects
+        automatically and resumes from the last event id it saw.
+        '''
+        return self.client.events.subscribe(subscription_path("asset", asset_id), last_event_id=last_event_id)
+
+    def wait_until_ready(self, asset_id: str, deadline=None) -> Asset:
+        '''
+        Blocks until the asset is uploaded, driven by its event stream instead of polling.
+        The optional deadline (seconds or a Deadline) raises DeadlineExceeded when it runs out.
+        '''
+        deadline = Deadline.coerce(deadline)
+        job = Job("asset", {"asset_id": asset_id}, asset_ready_check(self.client, asset_id, deadline), deadline=deadline)
+        return self.client._watch(job, subscription_path("asset", asset_id)).result()
     
     def list_generated_for_project(self, project_id: str):
-        obj = self.client._make_request("GET", f"/projects/{project_id}/asset/generated")
-        return [Asset(**asset) for asset in obj]
+        return self.client._make_request("GET", f"/projects/{project_id}/asset/generated", response_model=List[Asset])
+
+    def iter_list_generated_for_project(self, project_id: str, deadline=None) -> Iterator[Asset]:
+        '''
+        Like list_generated_for_project(), but yields assets as they arrive.
+        '''
+        return self.client._iter_list(f"/projects/{project_id}/asset/generated", Asset, deadline=deadline)
     
-    def add_videofile_to_project(self, project_id: str, video_file_id: str, description: str = ""):
+    def add_videofile_to_project(self, project_id: str, video_file_id: str, description: str = "", refresh_project: bool = True):
         # The upload_asset method already updates project data internally
-        obj = self.upload_asset(name=video_file_id, description=description, project_id=project_id, filename="", upload_method="video-reference")
+        obj = self.upload_asset(name=video_file_id, description=description, project_id=project_id, filename="", upload_method="video-reference",
+                                refresh_project=refresh_project)
         return obj
     
-    def upload_asset(self, name: str, description: str, project_id: str, filename: str, upload_method: str = "file-no-chunk"):
+    def upload_asset(self, name: str, description: str, project_id: str, filename: str, upload_method: str = "file-no-chunk", refresh_project: bool = True):
         # filetype = detect_file_type(filename)
         if upload_method == "video-reference":
             # name should be uuid of asset
@@ -286,12 +674,30 @@ class AssetsAPI:
                                                                                                "keyname": name,
                                                                                                "description": description})
             # Update project data after upload
-            self.client.projects.update_project_data(project_id)
+            if refresh_project:
+                self.client.projects.update_project_data(project_id)
             return self.get(link['id'])
         if is_youtube_url(filename):
             asset_type = "youtube-url"
         else:
             asset_type = "user"
+
+        dedup = self.client.dedup if asset_type == "user" else None
+        hasher = None
+        if dedup is not None:
+            file_hash, asset_id, video_file_id = dedup.match_asset(self.client, filename, project_id)
+            if asset_id is not None:
+                try:
+                    return self.get(asset_id)
+                except requests.exceptions.HTTPError as e:
+                    if e.response is None or e.response.status_code != 404:
+                        raise
+                    dedup.forget("asset", asset_id)
+            elif video_file_id is not None:
+                # Same content as an existing video file: reference it, no bytes moved
+                return self.add_videofile_to_project(project_id, video_file_id, description, refresh_project)
+            if file_hash is None:
+                hasher = dedup.hasher()
         
         upload_link = self.client._make_request("POST", f"/projects/{project_id}/asset", json={"upload_method": upload_method, 
                                                                                                "asset_type": asset_type,
@@ -300,13 +706,43 @@ class AssetsAPI:
 
         # Open the file in binary mode and pass the file object
         with open(filename, 'rb') as file_object:
-            uploaded = self.client._make_request("POST", upload_link["upload_url"]["url"], 
-                                                files={"file": (filename, file_object)})
-        
+            uploaded = self.client._upload(upload_link["upload_url"]["url"], {"file": (filename, file_object)}, hasher=hasher)
+        if dedup is not None:
+            dedup.record(file_hash or hasher.hexdigest(), filename, "asset", uploaded["id"], project_id)
         
         # Get the newly uploaded asset
         return self.get(uploaded["id"])
     
+    def bulk_upload(self, project_id: str, paths: List[str], concurrency: int = 4, description: str = "",
+                    upload_method: str = "file-no-chunk") -> BulkUploadResult:
+        '''
+        Uploads many files to a project in parallel, with at most `concurrency`
+        uploads in flight. A failed file does not stop the batch; the project is
+        refreshed once at the end instead of after every file.
+
+        Args:
+            project_id: Project to add the assets to
+            paths: Files to upload; each asset is named after its file
+            concurrency: Maximum number of simultaneous uploads
+            description: Description given to every asset
+
+        Returns:
+            BulkUploadResult: Per-file outcomes in the order of paths, and the refreshed project
+        '''
+        started = time.monotonic()
+
+        def upload(path):
+            try:
+                asset = self.upload_asset(os.path.basename(path), description, project_id, path, upload_method, refresh_project=False)
+                return UploadOutcome(path, asset)
+            except Exception as e:
+                return UploadOutcome(path, error=e)
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="videojungle-bulk-upload") as pool:
+            outcomes = list(pool.map(upload, paths))
+        project = self.client.projects.update_project_data(project_id)
+        return BulkUploadResult(outcomes, project, time.monotonic() - started)
+
     def add_asset_from_video_file(self, video_file_id: str, project_id: str, start_time: Optional[float] = None, end_time: Optional[float] = None):
         # TODO: Implement this method
         pass
@@ -314,37 +750,91 @@ class AssetsAPI:
     def delete(self, asset_id: str):
         return self.client._make_request("DELETE", f"/assets/{asset_id}")
     
-    def download(self, asset_id: str, filename: str, print_progress: bool = False):
-        while True:
-            asset = self.client._make_request("GET", f"/assets/{asset_id}")
-            if asset["uploaded"]:
-                break
-            time.sleep(.5)
-            if print_progress:
-                print("Waiting for asset to be ready...")
-        url = asset["download_url"]
-        response = requests.get(url, stream=True)
-        if response.status_code == 200:
-            with open(filename, 'wb') as f:
-                for chunk in response.iter_content(8192):
-                    f.write(chunk)
-            return filename
-        else:
-            raise Exception(f"Failed to download asset: {response.text}")
+    def download(self, asset_id: str, filename: str, print_progress: bool = False, deadline=None):
+        '''
+        Waits for the asset to be ready and downloads it to filename.
+        The optional deadline (seconds or a Deadline) covers both the wait and the download.
+        '''
+        deadline = Deadline.coerce(deadline)
+        asset = self.client._wait_for_asset(asset_id, print_progress, deadline)
+        if self.client.media_cache is not None:
+            download = lambda path: self.client._download_url(asset.download_url, path, deadline)
+            return self.client.media_cache.fetch(media_key("asset", asset.id), filename, download)
+        return self.client._download_url(asset.download_url, filename, deadline)
+
+    def open(self, asset_id: str, print_progress: bool = False, deadline=None) -> DownloadStream:
+        '''
+        Waits for the asset to be ready and returns a read-only file object
+        streaming its content, without writing it to disk.
+        '''
+        deadline = Deadline.coerce(deadline)
+        asset = self.client._wait_for_asset(asset_id, print_progress, deadline)
+        return self.client._open_url(asset.download_url, asset_id, deadline)
+
+    def iter_bytes(self, asset_id: str, chunk_size: int = 1024 * 1024, deadline=None) -> Iterator[bytes]:
+        '''
+        Yields the asset's content in chunks of up to chunk_size bytes.
+        '''
+        with self.open(asset_id, deadline=deadline) as stream:
+            yield from stream.iter_chunks(chunk_size)
+
+    def download_all(self, project_id: str, dest: str, concurrency: int = 4, generated_only: bool = False,
+                     filename: Optional[Callable[[Asset], str]] = None, print_progress: bool = False,
+                     deadline=None) -> BulkDownloadResult:
+        '''
+        Downloads every asset of a project into dest. Assets that are still being
+        processed are waited on through the client's shared job poller, while
+        ready ones download right away, at most `concurrency` at a time. Files
+        already in dest are skipped when their size matches the server's, so an
+        interrupted run can simply be repeated.
+
+        Args:
+            project_id: Project whose assets to download
+            dest: Directory to download into (created if missing)
+            concurrency: Maximum number of simultaneous downloads
+            generated_only: Only download the project's generated assets
+            filename: Name of the file for an asset; defaults to the asset id plus
+                the extension of its keyname
+            deadline: Optional seconds or Deadline covering the whole batch
+
+        Returns:
+            BulkDownloadResult: Per-asset outcomes in the order the assets are listed
+        '''
+        deadline = Deadline.coerce(deadline)
+        os.makedirs(dest, exist_ok=True)
+        assets = self.list_generated_for_project(project_id) if generated_only else self.list_for_project(project_id)
+        items = []
+        for asset in assets:
+            name = filename(asset) if filename is not None else asset.id + os.path.splitext(asset.keyname)[1]
+            path = os.path.join(dest, name)
+            if asset.download_url and asset_finished(asset):
+                source = asset.download_url
+            else:
+                job = Job("asset", {"asset_id": asset.id}, asset_ready_check(self.client, asset.id, deadline),
+                          deadline=deadline, key=("asset", asset.id))
+                source = self.client.jobs.submit(job)
+            items.append((asset.id, path, source))
+        return self.client._download_many(items, concurrency, deadline, print_progress)
     
 class VideoFileAPI:
     def __init__(self, client):
         self.client = client
 
     def get(self, video_file_id: str):
-        obj = self.client._make_request("GET", f"/video-file/{video_file_id}")
-        return VideoFile(**obj)
+        return self.client._make_request("GET", f"/video-file/{video_file_id}", response_model=VideoFile)
     
     def list(self):
-        obj = self.client._make_request("GET", "/video-file")
-        return [VideoFile(**video_file) for video_file in obj]
+        return self.client._make_request("GET", "/video-file", response_model=List[VideoFile])
+
+    def iter_list(self, deadline=None) -> Iterator[VideoFile]:
+        '''
+        Like list(), but yields video files as they arrive, so memory stays bounded
+        for libraries of any size and the first file is available right away.
+        '''
+        return self.client._iter_list("/video-file", VideoFile, deadline=deadline)
     
     def delete(self, video_file_id: str):
+        self.client.analysis_indexes.delete(video_file_id)
         return self.client._make_request("DELETE", f"/video-file/{video_file_id}")
     
     def search(
@@ -402,23 +892,67 @@ class VideoFileAPI:
         # Make the request - use mode='json' to ensure proper serialization
         return self.client._make_request("POST", "/video-file/search", json=vs.model_dump(mode='json'))
     
-    def download(self, video_id: str, filename: str):
-        video = self.get(video_id)
+    def download(self, video_id: str, filename: str, deadline=None, checksum: Optional[Tuple[str, str]] = None):
+        '''
+        Downloads the video file to filename, checked against its size. Pass
+        checksum=(algorithm, hex digest), e.g. ("sha256", "9f86..."), to verify
+        the content too; the video's own hash field is only used when it names
+        its algorithm ("sha256:9f86...").
+        '''
+        deadline = Deadline.coerce(deadline)
+        video = self.client._make_request("GET", f"/video-file/{video_id}", response_model=VideoFile, deadline=deadline)
         url = video.download_url
         if not url:
             raise Exception("Video file has no download URL")
-        with httpx.Client() as client:
-                # Stream the response
-                with client.stream('GET', url) as response:
-                    response.raise_for_status()
-                    # Open file in binary write mode
-                    with open(filename, 'wb') as f:
-                        for chunk in response.iter_bytes():
-                            f.write(chunk)    
+        expected_hash = format_checksum(checksum, video.hash)
+        if self.client.media_cache is not None:
+            download = lambda path: self.client._download_url(url, path, deadline, video.size, expected_hash)
+            self.client.media_cache.fetch(media_key("video_file", video_id, video.hash), filename, download)
+        else:
+            self.client._download_url(url, filename, deadline, video.size, expected_hash)
         return True
 
+    def open(self, video_id: str, deadline=None, checksum: Optional[Tuple[str, str]] = None) -> DownloadStream:
+        '''
+        Returns a read-only file object streaming the video file's content,
+        verified against its size, and checksum when known (see download), as it is read.
+        '''
+        deadline = Deadline.coerce(deadline)
+        video = self.client._make_request("GET", f"/video-file/{video_id}", response_model=VideoFile, deadline=deadline)
+        if not video.download_url:
+            raise Exception("Video file has no download URL")
+        return self.client._open_url(video.download_url, video_id, deadline, video.size, format_checksum(checksum, video.hash))
+
+    def iter_bytes(self, video_id: str, chunk_size: int = 1024 * 1024, deadline=None) -> Iterator[bytes]:
+        '''
+        Yields the video file's content in chunks of up to chunk_size bytes,
+        e.g. to pipe a render into another process without a temporary file.
+        '''
+        with self.open(video_id, deadline) as stream:
+            yield from stream.iter_chunks(chunk_size)
+
     def get_analysis(self, video_file_id: str):
         return self.client._make_request("GET", f"/video-file/{video_file_id}/analysis")
+
+    def get_analysis_table(self, video_file_id: str) -> AnalysisTable:
+        '''
+        The video file's analysis segments as a column-wise AnalysisTable; the
+        decoded response is dropped once the table is built.
+        '''
+        return AnalysisTable.from_analysis(self.get_analysis(video_file_id))
+
+    def analysis_index(self, video_file_id: str, refresh: bool = False) -> IntervalIndex:
+        '''
+        IntervalIndex over the video file's analysis segments, for repeated
+        overlap / containment / nearest queries. It is built once per video and
+        cached on the client (the 64 most recently used videos); create_analysis
+        drops the cached index, and refresh=True rebuilds it.
+        '''
+        index = None if refresh else self.client.analysis_indexes.get(video_file_id)
+        if index is None:
+            index = IntervalIndex(self.get_analysis_table(video_file_id))
+            self.client.analysis_indexes.set(video_file_id, index)
+        return index
     
     def create(self, name: str, filename: str, upload_method: str = "file-no-chunk", run_analysis: bool = True):
         '''
@@ -428,11 +962,28 @@ class VideoFileAPI:
         'direct' returns a signed AWS URL to upload the video file
         'file-no-chunk' expects the video file to be uploaded to Video Jungle via the
         /video-file/{video_file_id}/upload-video endpoint
+        With a DedupIndex on the client, 'file-no-chunk' returns the existing
+        video file when the same content was uploaded before.
         '''
         if upload_method == "file-no-chunk":
+            dedup = self.client.dedup
+            hasher = None
+            if dedup is not None:
+                file_hash, video_file_id = dedup.match_video_file(self.client, filename)
+                if video_file_id is not None:
+                    try:
+                        return self.get(video_file_id)
+                    except requests.exceptions.HTTPError as e:
+                        if e.response is None or e.response.status_code != 404:
+                            raise
+                        dedup.forget("video_file", video_file_id)
+                if file_hash is None:
+                    hasher = dedup.hasher()
             upload_link = self.client._make_request("POST", "/video-file", json={"name": name, "filename": filename, "upload_method": upload_method})
             with open(filename, 'rb') as file_obj:
-                uploaded = self.client._make_request("POST", f"/video-file/{upload_link['video']['id']}/upload-video", files={"file": file_obj})
+                uploaded = self.client._upload(f"/video-file/{upload_link['video']['id']}/upload-video", {"file": file_obj}, hasher=hasher)
+            if dedup is not None:
+                dedup.record(file_hash or hasher.hexdigest(), filename, "video_file", uploaded["id"])
             if run_analysis:
                 self.client._make_request("POST", f"/video-file/{uploaded['id']}/analysis")
             return self.get(uploaded["id"])
@@ -447,42 +998,125 @@ class VideoFileAPI:
         else:
             return self.client._make_request("POST", "/video-file", json={"name": name, "filename": filename, "upload_method": upload_method})
 
+    def direct_upload(self, filename: str, name: Optional[str] = None, run_analysis: bool = True,
+                      resume: bool = True, journal_dir: Optional[str] = None, progress: Optional[Callable[[UploadProgress], None]] = None,
+                      print_progress: bool = False) -> VideoFile:
+        '''
+        Creates a video file with the 'direct' upload method and uploads filename
+        straight to the presigned storage target in a single POST. There are no
+        parts, so an interrupted upload is sent again from the start.
+
+        Args:
+            filename: Path of the video to upload
+            name: Name of the video file; defaults to the file's base name
+            run_analysis: Start analysis once the upload has finished
+            resume: Keep a journal so a retry of an interrupted upload sends the file
+                to the same video file while its presigned target is still valid,
+                instead of creating another; False always creates a new one
+            journal_dir: Where journals are kept (default: <tmp>/videojungle-uploads)
+            progress: Called with an UploadProgress as bytes are sent
+            print_progress: Print the size and throughput once the upload finishes
+
+        Returns:
+            VideoFile: The uploaded video file
+        '''
+        basename = os.path.basename(filename)
+        journal = UploadJournal.for_file(filename, journal_dir) if resume else None
+        resumed = journal is not None and journal.load()
+        uploader = DirectUploader(self.client.session, self.client.retry, self.client.timeout.for_attempt())
+        while True:
+            if resumed:
+                create_response = journal.state["create_response"]
+            else:
+                create_response = self.client._make_request("POST", "/video-file", json={"name": name or basename, "filename": basename, "upload_method": "direct"})
+                if journal is not None:
+                    journal.start(create_response)
+            try:
+                result = uploader.upload(filename, presigned_upload_info(create_response), progress)
+                break
+            except UploadTargetRejected:
+                if journal is not None:
+                    journal.discard()
+                if not resumed:
+                    raise
+                # The journal's presigned target has expired; start over with a new one
+                resumed = False
+        video_file_id = created_video_id(create_response)
+        if journal is not None:
+            journal.discard()
+        if print_progress:
+            print(f"Uploaded {result.total_bytes / 1e6:.1f} MB in {result.elapsed:.1f}s ({result.throughput / 1e6:.1f} MB/s)")
+        if run_analysis:
+            self.client._make_request("POST", f"/video-file/{video_file_id}/analysis")
+        return self.get(video_file_id)
+
     def upload_direct(self, video_file_id, file):
-        return self.client._make_request("POST", f"/video-file/{video_file_id}/upload-video", files={"file": file})
+        return self.client._upload(f"/video-file/{video_file_id}/upload-video", {"file": file})
     
-    def create_analysis(self, video_file_id):
-        return self.client._make_request("POST", f"/video-file/{video_file_id}/analysis")
+    def create_analysis(self, video_file_id, subscribe: bool = False) -> Job:
+        '''
+        Starts analysis of a video file
+        Returns a Job that resolves to the analyzed VideoFile. With subscribe=True
+        the job is completed from the video's event stream instead of by polling.
+        '''
+        self.client.analysis_indexes.delete(video_file_id)
+        response = self.client._make_request("POST", f"/video-file/{video_file_id}/analysis")
+        job = Job("analysis", response, analysis_complete_check(self.client, video_file_id))
+        # An index built while the analysis was running is missing its results
+        job.add_done_callback(lambda _: self.client.analysis_indexes.delete(video_file_id))
+        if subscribe:
+            return self.client._watch(job, subscription_path("video", video_file_id))
+        return self.client.jobs.submit(job)
+
+    def subscribe(self, video_file_id: str, last_event_id: Optional[str] = None) -> Subscription:
+        '''
+        Subscribes to Server-Sent-Events status updates for a video file:
+
+            with vj.video_files.subscribe(video_file_id) as events:
+                for event in events:
+                    print(event.json())
+
+        Subscriptions to the same video share one connection, which reconnects
+        automatically and resumes from the last event id it saw.
+        '''
+        return self.client.events.subscribe(subscription_path("video", video_file_id), last_event_id=last_event_id)
+
+    def wait_for_analysis(self, video_file_id: str, deadline=None) -> VideoFile:
+        '''
+        Blocks until the video file has been analyzed, driven by its event stream instead of polling.
+        The optional deadline (seconds or a Deadline) raises DeadlineExceeded when it runs out.
+        '''
+        deadline = Deadline.coerce(deadline)
+        job = Job("analysis", {"video_file_id": video_file_id}, analysis_complete_check(self.client, video_file_id, deadline), deadline=deadline)
+        return self.client._watch(job, subscription_path("video", video_file_id)).result()
 
 class PromptsAPI:
     def __init__(self, client):
         self.client = client
     
     def list(self):
-        obj = self.client._make_request("GET", "/prompts")
-        return [Prompt(**prompt) for prompt in obj]
+        return self.client._make_request("GET", "/prompts", response_model=List[Prompt])
     
     def create(self, prompt: str, parameters: List[str], name: str = "", persona: str = "", task: str = ""):
-        obj = self.client._make_request("POST", "/prompts", json={"value": prompt, "parameters": parameters, "persona": persona, "task": task, "name": name})
-        return Prompt(**obj)
+        return self.client._make_request("POST", "/prompts", json={"value": prompt, "parameters": parameters, "persona": persona, "task": task, "name": name}, response_model=Prompt)
     
-    def generate(self, task: str, parameters: List[str]):
+    def generate(self, task: str, parameters: List[str], deadline=None):
         '''
         Generates a prompt for video generation process
         Parameters is a list of the parameters required by the prompt to generate a video
         IE: ["zodiac sign", "lucky number", "lucky color"] for a horoscope reader
+        The optional deadline (seconds or a Deadline) bounds the whole generation.
         '''
-        res = self.client._make_request("POST", "/prompts/generate", json={"task": task, "parameters": parameters})
-        while True:
-            prompt = self.get(res["id"])
-            if prompt.value != "generating...":
-                break
-            time.sleep(.2)
+        deadline = Deadline.coerce(deadline)
+        res = self.client._make_request("POST", "/prompts/generate", json={"task": task, "parameters": parameters}, deadline=deadline)
+        job = Job("prompt", res, prompt_ready_check(self.client, res["id"], deadline), deadline=deadline)
+        self.client.jobs.submit(job)
+        if not job.done():
             print("Generating prompt...")
-        return prompt
+        return job.result()
     
     def get(self, prompt_id: str):
-        obj = self.client._make_request("GET", f"/prompts/{prompt_id}")
-        return Prompt(**obj)
+        return self.client._make_request("GET", f"/prompts/{prompt_id}", response_model=Prompt)
     
     def delete(self, prompt_id: str):
         return self.client._make_request("DELETE", f"/prompts/{prompt_id}")
@@ -492,20 +1126,16 @@ class ScriptsAPI:
         self.client = client
     
     def list_options(self):
-        obj = self.client._make_request("GET", "/scripts")
-        return [ScriptTemplate(**script) for script in obj]
+        return self.client._make_request("GET", "/scripts", response_model=List[ScriptTemplate])
     
     def list(self, project_id: str):
-        obj = self.client._make_request("GET", f"/projects/{project_id}/scripts")
-        return [Script(**script) for script in obj]
+        return self.client._make_request("GET", f"/projects/{project_id}/scripts", response_model=List[Script])
     
     def get(self, project_id: str, script_id: str):
-        obj = self.client._make_request("GET", f"/scripts/{project_id}/{script_id}")
-        return Script(**obj)
+        return self.client._make_request("GET", f"/scripts/{project_id}/{script_id}", response_model=Script)
     
     def create(self, project_id: str, name: str, data: dict, inputs: dict):
-        obj = self.client._make_request("POST", f"/scripts/{project_id}/scripts", json={"name": name, "data": data, "inputs": inputs})
-        return Script(**obj)
+        return self.client._make_request("POST", f"/scripts/{project_id}/scripts", json={"name": name, "data": data, "inputs": inputs}, response_model=Script)
     
     def delete(self, project_id: str, script_id: str):
         return self.client._make_request("DELETE", f"/scripts/{project_id}/{script_id}")
@@ -515,8 +1145,7 @@ class UserAPI:
         self.client = client 
     
     def info(self):
-        obj = self.client._make_request("GET", "/users/me")
-        return User(**obj)
+        return self.client._make_request("GET", "/users/me", response_model=User)
     
 class EditAPI:
     def __init__(self, client):
@@ -655,41 +1284,79 @@ class EditAPI:
     def list(self, project_id: str):
         obj = self.client._make_request("GET", f"/projects/{project_id}/edits")
         return obj
+
+    def iter_list(self, project_id: str, deadline=None) -> Iterator[dict]:
+        '''
+        Like list(), but yields edits as they arrive instead of building the whole list.
+        '''
+        return self.client._iter_list(f"/projects/{project_id}/edits", deadline=deadline)
     
-    def render_edit(self, project_id: str, edit_id: str) -> dict:
+    def render_edit(self, project_id: str, edit_id: str, subscribe: bool = False) -> Job:
         """
-        Returns a dictionary with asset_id, asset_key, and original edit_id
+        Starts rendering an edit
+        Returns a Job that resolves to the rendered Asset; indexing the job gives
+        the render response with asset_id, asset_key, and original edit_id.
+        With subscribe=True the job is completed from the asset's event stream
+        instead of by polling.
         """
-        return self.client._make_request("POST", f"/projects/{project_id}/edits/{edit_id}/render")
+        response = self.client._make_request("POST", f"/projects/{project_id}/edits/{edit_id}/render")
+        return self.client._asset_job("render", response, subscribe)
     
-    def download_edit_render(self, project_id: str, edit_id: str, filename: str, print_progress: bool = False):
+    def download_edit_render(self, project_id: str, edit_id: str, filename: str, print_progress: bool = False, deadline=None):
         """
         Download an edit render, rendering and waiting for rendered file if
-        not already rendered. Optionally print progress to console.se
+        not already rendered. Optionally print progress to console.
+        The optional deadline (seconds or a Deadline) covers rendering, polling and the download.
         """
-
-        edit = self.get(project_id=project_id, edit_id=edit_id)
+        deadline = Deadline.coerce(deadline)
+        edit = self.client._make_request("GET", f"/projects/{project_id}/edits/{edit_id}", deadline=deadline)
         print(edit)
-        download_url = edit.get("download_url")
+        url = edit.get("download_url")
 
-        if not download_url:
-            render = self.render_edit(project_id=project_id, edit_id=edit_id)
-            asset_id = render["asset_id"]
+        if not url:
+            render = self.client._make_request("POST", f"/projects/{project_id}/edits/{edit_id}/render", deadline=deadline)
+            asset = self.client._wait_for_asset(render["asset_id"], print_progress, deadline)
+            url = asset.download_url
+        return self.client._download_url(url, filename, deadline)
 
-            while True:
-                asset = self.client._make_request("GET", f"/assets/{asset_id}")
-                if asset["uploaded"]:
-                    break
-                time.sleep(.5)
-                if print_progress:
-                    print("Waiting for asset to be ready...")
-            
-            url = asset["download_url"]
-        response = requests.get(url, stream=True)
-        if response.status_code == 200:
-            with open(filename, 'wb') as f:
-                for chunk in response.iter_content(8192):
-                    f.write(chunk)
-            return filename
-        else:
-            raise Exception(f"Failed to download asset: {response.text}")
\ No newline at end of file
+    def download_all(self, project_id: str, dest: str, concurrency: int = 4,
+                     filename: Optional[Callable[[dict], str]] = None, print_progress: bool = False,
+                     deadline=None) -> BulkDownloadResult:
+        """
+        Downloads the renders of every edit in a project into dest.
+
+        Renders for all edits without a download URL are started up front and
+        waited on together through the client's shared job poller. Each render
+        downloads as soon as it is ready, at most `concurrency` at a time, so the
+        batch takes about as long as the slowest render rather than the sum of
+        all of them. Files already in dest are skipped when their size matches
+        the server's, so an interrupted run can simply be repeated; an edit
+        without a download URL is rendered first to find that size.
+
+        Args:
+            project_id: Project whose edits to download
+            dest: Directory to download into (created if missing)
+            concurrency: Maximum number of simultaneous downloads
+            filename: Name of the file for an edit (the dict returned by list());
+                defaults to "<edit id>.mp4"
+            deadline: Optional seconds or Deadline covering renders and downloads
+
+        Returns:
+            BulkDownloadResult: Per-edit outcomes in the order the edits are listed
+        """
+        deadline = Deadline.coerce(deadline)
+        os.makedirs(dest, exist_ok=True)
+        items = []
+        for edit in self.list(project_id):
+            name = filename(edit) if filename is not None else f"{edit['id']}.mp4"
+            path = os.path.join(dest, name)
+            if edit.get("download_url"):
+                source = edit["download_url"]
+            else:
+                try:
+                    response = self.client._make_request("POST", f"/projects/{project_id}/edits/{edit['id']}/render", deadline=deadline)
+                    source = self.client._asset_job("render", response, deadline=deadline)
+                except Exception as e:
+                    source = e
+            items.append((edit["id"], path, source))
+        return self.client._download_many(items, concurrency, deadline, print_progress)
\ No newline at end of file
@@ -0,0 +1,191 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+class StreamingHash:
+    '''
+    Incremental content hash that can be fed the chunks of an upload as they
+    are read, so hashing costs no extra pass over the file.
+    '''
+
+    def __init__(self, algorithm: str = "sha256"):
+        self.algorithm = algorithm
+        self.reset()
+
+    def reset(self):
+        self._hash = hashlib.new(self.algorithm)
+        self.size = 0
+
+    def update(self, chunk):
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+def hash_file(path: str, algorithm: str = "sha256") -> str:
+    hasher = StreamingHash(algorithm)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                return hasher.hexdigest()
+            hasher.update(chunk)
+
+class DedupIndex:
+    '''
+    Opt-in local index from file content hash to the video files and assets
+    already uploaded with it, kept in SQLite so it survives restarts:
+
+        vj = ApiClient(token=VJ_API_KEY, dedup=DedupIndex())
+
+    With an index, VideoFileAPI.create returns the existing video file for a
+    file that was uploaded before, and AssetsAPI.upload_asset reuses the
+    project's asset or adds the existing video file as a 'video-reference'
+    asset, without moving any bytes.
+
+    Files are only hashed up front when the local index or the server
+    already has a file of the same size. Otherwise the hash is computed
+    while the upload reads the file. Hashes of known paths are cached by
+    size and modification time.
+
+    With check_server=True the hashes of every video file in the library are
+    also used, streamed with video_files.iter_list() and refreshed at most every
+    server_ttl seconds, and local entries for video files that no longer exist
+    are dropped. This walks the whole library, so it is off by default. Server
+    hashes only match when the server uses the same algorithm.
+    '''
+
+    def __init__(self, path: Optional[str] = None, algorithm: str = "sha256", check_server: bool = False, server_ttl: float = 300):
+        if path is None:
+            directory = os.path.join(os.path.expanduser("~"), ".cache", "videojungle")
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, "dedup.sqlite3")
+        self.path = path
+        self.algorithm = algorithm
+        self.check_server = check_server
+        self.server_ttl = server_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS uploads (algorithm TEXT, hash TEXT, size INTEGER, kind TEXT, resource_id TEXT, project_id TEXT, PRIMARY KEY (algorithm, hash, kind, resource_id))")
+        self._db.execute("CREATE INDEX IF NOT EXISTS uploads_size ON uploads (size)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS paths (path TEXT, algorithm TEXT, size INTEGER, mtime_ns INTEGER, hash TEXT, PRIMARY KEY (path, algorithm))")
+        self._server: Optional[Tuple[float, Dict[str, str], set]] = None
+
+    def hasher(self) -> StreamingHash:
+        return StreamingHash(self.algorithm)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _query(self, sql: str, *args):
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def _known_hash(self, path: str, stat: os.stat_result) -> Optional[str]:
+        rows = self._query("SELECT hash FROM paths WHERE path = ? AND algorithm = ? AND size = ? AND mtime_ns = ?",
+                           os.path.abspath(path), self.algorithm, stat.st_size, stat.st_mtime_ns)
+        return rows[0][0] if rows else None
+
+    def _remember_path(self, path: str, file_hash: str):
+        stat = os.stat(path)
+        self._query("INSERT OR REPLACE INTO paths VALUES (?, ?, ?, ?, ?)",
+                    os.path.abspath(path), self.algorithm, stat.st_size, stat.st_mtime_ns, file_hash)
+
+    def _has_size(self, size: int) -> bool:
+        return bool(self._query("SELECT 1 FROM uploads WHERE algorithm = ? AND size = ? LIMIT 1", self.algorithm, size))
+
+    def _find(self, file_hash: str, kind: str, project_id: Optional[str] = None) -> Optional[str]:
+        if project_id is None:
+            rows = self._query("SELECT resource_id FROM uploads WHERE algorithm = ? AND hash = ? AND kind = ?", self.algorithm, file_hash, kind)
+        else:
+            rows = self._query("SELECT resource_id FROM uploads WHERE algorithm = ? AND hash = ? AND kind = ? AND project_id = ?",
+                               self.algorithm, file_hash, kind, project_id)
+        return rows[0][0] if rows else None
+
+    def record(self, file_hash: str, path: str, kind: str, resource_id: str, project_id: Optional[str] = None):
+        '''
+        Records that the file at path, with this hash, was uploaded as resource_id
+        (kind 'video_file' or 'asset').
+        '''
+        self._query("INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?)",
+                    self.algorithm, file_hash, os.path.getsize(path), kind, resource_id, project_id)
+        self._remember_path(path, file_hash)
+
+    def forget(self, kind: str, resource_id: str):
+        self._query("DELETE FROM uploads WHERE kind = ? AND resource_id = ?", kind, resource_id)
+
+    def _server_files(self, client) -> Tuple[Dict[str, str], set]:
+        # (hash -> video_file_id, sizes) from video_files.iter_list(), refreshed every server_ttl
+        now = time.monotonic()
+        if self._server is None or now - self._server[0] > self.server_ttl:
+            digest_length = hashlib.new(self.algorithm).digest_size * 2
+            by_hash, sizes, ids = {}, set(), set()
+            for video in client.video_files.iter_list():
+                ids.add(video.id)
+                if video.size is not None:
+                    sizes.add(video.size)
+                if video.hash and len(video.hash) == digest_length:
+                    by_hash[video.hash.lower()] = video.id
+            for (resource_id,) in self._query("SELECT resource_id FROM uploads WHERE kind = 'video_file'"):
+                if resource_id not in ids:
+                    self.forget("video_file", resource_id)
+            self._server = (now, by_hash, sizes)
+        return self._server[1], self._server[2]
+
+    def _hash_if_candidate(self, client, path: str) -> Tuple[Optional[str], Dict[str, str]]:
+        stat = os.stat(path)
+        server_hashes, server_sizes = self._server_files(client) if self.check_server else ({}, set())
+        file_hash = self._known_hash(path, stat)
+        if file_hash is None and (self._has_size(stat.st_size) or stat.st_size in server_sizes):
+            file_hash = hash_file(path, self.algorithm)
+            self._remember_path(path, file_hash)
+        return file_hash, server_hashes
+
+    def match_video_file(self, client, path: str) -> Tuple[Optional[str], Optional[str]]:
+        '''
+        Returns (hash, video_file_id) for a file about to be uploaded. The id is
+        None when no video file has the same content; the hash is None when the
+        file still has to be hashed during the upload.
+        '''
+        file_hash, server_hashes = self._hash_if_candidate(client, path)
+        video_file_id = None
+        if file_hash is not None:
+            video_file_id = self._find(file_hash, "video_file") or server_hashes.get(file_hash)
+        self._count(video_file_id)
+        return file_hash, video_file_id
+
+    def match_asset(self, client, path: str, project_id: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        '''
+        Returns (hash, asset_id, video_file_id) for a file about to be uploaded as an
+        asset of project_id: an asset of the same project with the same content,
+        or else a video file with the same content.
+        '''
+        file_hash, server_hashes = self._hash_if_candidate(client, path)
+        asset_id = video_file_id = None
+        if file_hash is not None:
+            asset_id = self._find(file_hash, "asset", project_id)
+            if asset_id is None:
+                video_file_id = self._find(file_hash, "video_file") or server_hashes.get(file_hash)
+        self._count(asset_id or video_file_id)
+        return file_hash, asset_id, video_file_id
+
+    def _count(self, match):
+        with self._lock:
+            if match is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
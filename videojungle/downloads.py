@@ -0,0 +1,830 @@
+import asyncio
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+import requests
+from .timeouts import Deadline
+
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+READ_SIZE = 1024 * 1024
+
+class DownloadVerificationError(IOError):
+    '''
+    Raised when a finished download does not have the expected size or checksum.
+    The partial file is removed, so the next attempt starts from scratch.
+    '''
+
+def parse_content_range(value: Optional[str]) -> Optional[Tuple[int, int, Optional[int]]]:
+    '''
+    Parses a Content-Range header into (first, last, total); total is None when unknown.
+    '''
+    match = _CONTENT_RANGE.match(value or "")
+    if not match:
+        return None
+    first, last, total = match.groups()
+    return int(first), int(last), None if total == "*" else int(total)
+
+def split_ranges(size: int, part_size: int) -> List[Tuple[int, int]]:
+    '''
+    Splits [0, size) into inclusive (first, last) byte ranges of at most part_size.
+    '''
+    return [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+
+def hash_algorithm(expected_hash: Optional[str]) -> Optional[Tuple[str, str]]:
+    '''
+    Returns (algorithm, hex digest) for a checksum given as "algorithm:hexdigest",
+    or None when the checksum is not usable. A bare digest is not used: its
+    algorithm can't be known for sure, and a wrong guess would reject every
+    correctly downloaded file.
+    '''
+    if not expected_hash:
+        return None
+    algorithm, _, digest = expected_hash.rpartition(":")
+    digest = digest.strip().lower()
+    algorithm = algorithm.lower().replace("-", "")
+    if not algorithm or not re.fullmatch(r"[0-9a-f]+", digest) or algorithm not in hashlib.algorithms_available:
+        return None
+    return algorithm, digest
+
+def format_checksum(checksum: Optional[Tuple[str, str]], fallback: Optional[str] = None) -> Optional[str]:
+    '''
+    "algorithm:hexdigest" for an explicit (algorithm, hex digest) checksum, else fallback.
+    '''
+    return f"{checksum[0]}:{checksum[1]}" if checksum is not None else fallback
+
+def _preallocate(fd: int, size: int):
+    # Reserve the blocks up front where supported, so parallel writes don't fragment the file
+    if size <= 0:
+        return
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass
+    os.ftruncate(fd, size)
+
+def _pwrite_all(fd: int, data, offset: int):
+    while data:
+        written = os.pwrite(fd, data, offset)
+        data = data[written:]
+        offset += written
+
+def _content_length(headers) -> Optional[int]:
+    # The body size on disk, when the server states it and does not compress
+    if headers.get("Content-Encoding", "identity") != "identity":
+        return None
+    try:
+        return int(headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+
+def _validators(headers) -> Dict[str, Optional[str]]:
+    etag = headers.get("ETag")
+    if etag is not None and etag.startswith("W/"):
+        # Weak validators are not allowed in If-Range
+        etag = None
+    return {"etag": etag, "last_modified": headers.get("Last-Modified")}
+
+def _if_range(identity: dict) -> dict:
+    validator = identity.get("etag") or identity.get("last_modified")
+    return {"If-Range": validator} if validator else {}
+
+def _range_start(response) -> Optional[int]:
+    content_range = parse_content_range(response.headers.get("Content-Range"))
+    return content_range[0] if content_range is not None else None
+
+def download_complete(filename: str, size: Optional[int]) -> bool:
+    '''
+    True when filename holds a finished download of an object of `size` bytes:
+    no .part file next to it and the same size. A file of unknown expected
+    size, e.g. one written by another tool, never counts as complete.
+    '''
+    if size is None or not os.path.isfile(filename) or os.path.exists(f"{filename}.part"):
+        return False
+    return os.path.getsize(filename) == size
+
+class DownloadOutcome(NamedTuple):
+    '''
+    Result of one file in a bulk download: skipped when it was already complete
+    on disk, the exception when it failed.
+    '''
+    id: str
+    path: str
+    error: Optional[BaseException] = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+class BulkDownloadResult:
+    '''
+    Per-file outcomes of EditAPI.download_all / AssetsAPI.download_all, in
+    the order the server listed the edits or assets.
+    '''
+
+    def __init__(self, outcomes: List[DownloadOutcome], elapsed: float = 0.0):
+        self.outcomes = outcomes
+        self.elapsed = elapsed
+
+    @property
+    def downloaded(self) -> List[DownloadOutcome]:
+        return [outcome for outcome in self.outcomes if outcome.ok and not outcome.skipped]
+
+    @property
+    def skipped(self) -> List[DownloadOutcome]:
+        return [outcome for outcome in self.outcomes if outcome.skipped]
+
+    @property
+    def failed(self) -> List[DownloadOutcome]:
+        return [outcome for outcome in self.outcomes if not outcome.ok]
+
+    @property
+    def paths(self) -> List[str]:
+        return [outcome.path for outcome in self.outcomes if outcome.ok]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def __iter__(self):
+        return iter(self.outcomes)
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def __repr__(self):
+        return (f"<BulkDownloadResult {len(self.downloaded)} downloaded, {len(self.skipped)} skipped, "
+                f"{len(self.failed)} failed in {self.elapsed:.1f}s>")
+
+class _StreamVerifier:
+    # Checks the size and checksum of a stream as it is read
+    def __init__(self, name: str, expected_size: Optional[int], expected_hash: Optional[str]):
+        self.name = name
+        self.expected_size = expected_size
+        self.checksum = hash_algorithm(expected_hash)
+        self.hash = hashlib.new(self.checksum[0]) if self.checksum is not None else None
+        self.size = 0
+
+    def update(self, data):
+        self.size += len(data)
+        if self.hash is not None:
+            self.hash.update(data)
+
+    def finish(self):
+        if self.expected_size is not None and self.size != self.expected_size:
+            raise DownloadVerificationError(f"{self.name}: read {self.size} bytes, expected {self.expected_size}")
+        if self.hash is not None and self.hash.hexdigest() != self.checksum[1]:
+            raise DownloadVerificationError(f"{self.name}: {self.checksum[0]} {self.hash.hexdigest()} does not match {self.checksum[1]}")
+
+class DownloadStream(io.RawIOBase):
+    '''
+    Read-only file object over a download, for consuming media without
+    writing it to disk first:
+
+        with vj.assets.open(asset_id) as stream:
+            buffer = bytearray(4 * 1024 * 1024)
+            while (count := stream.readinto(buffer)):
+                process(memoryview(buffer)[:count])
+
+    readinto() fills the caller's buffer through urllib3, which reads each
+    chunk into its own buffer and copies it over (and decodes it first when
+    the response is compressed), so memory stays bounded by the buffers in use. read(), iteration and
+    io.BufferedReader work as for any raw file. When the expected size or
+    checksum is known it is checked as the stream is read, and reaching the
+    end of a stream that does not match raises DownloadVerificationError.
+    '''
+
+    def __init__(self, response: requests.Response, name: str = "download", deadline: Optional[Deadline] = None,
+                 expected_size: Optional[int] = None, expected_hash: Optional[str] = None):
+        super().__init__()
+        self.response = response
+        self.name = name
+        self.deadline = deadline
+        self.size = _content_length(response.headers)
+        self._raw = response.raw
+        self._raw.decode_content = True
+        self._verifier = _StreamVerifier(name, expected_size, expected_hash)
+        self._position = 0
+        self._finished = False
+
+    def readable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed download stream")
+        if self.deadline is not None:
+            self.deadline.check(f"download of {self.name}")
+        count = self._raw.readinto(buffer)
+        if count:
+            self._position += count
+            with memoryview(buffer) as view:
+                self._verifier.update(view[:count])
+        elif not self._finished and len(buffer):
+            self._finished = True
+            self._verifier.finish()
+        return count
+
+    def iter_chunks(self, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        '''
+        Yields the remaining content in chunks of up to chunk_size bytes.
+        '''
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        if not self.closed:
+            self.response.close()
+        super().close()
+
+class AsyncDownloadStream:
+    '''
+    Asyncio counterpart of DownloadStream. The request is sent when the
+    stream is entered or first read:
+
+        async with vj.assets.open(asset_id) as stream:
+            async for chunk in stream:
+                process(chunk)
+
+    readinto() copies into the caller's buffer from httpx's receive chunks,
+    so at most one chunk is held besides the caller's buffers.
+    '''
+
+    def __init__(self, send: Callable[[], Awaitable[Any]], name: str = "download", deadline: Optional[Deadline] = None,
+                 expected_size: Optional[int] = None, expected_hash: Optional[str] = None, chunk_size: int = 1024 * 1024):
+        self.name = name
+        self.deadline = deadline
+        self.chunk_size = chunk_size
+        self.response = None
+        self.size: Optional[int] = None
+        self.closed = False
+        self._send = send
+        self._chunks: Optional[AsyncIterator[bytes]] = None
+        self._pending = memoryview(b"")
+        self._verifier = _StreamVerifier(name, expected_size, expected_hash)
+        self._position = 0
+        self._finished = False
+
+    def expect(self, expected_size: Optional[int] = None, expected_hash: Optional[str] = None):
+        '''
+        Sets the size and checksum the content is verified against; call before reading.
+        '''
+        self._verifier = _StreamVerifier(self.name, expected_size, expected_hash)
+
+    def __await__(self):
+        # `stream = await vj.assets.open(...)` as well as `async with vj.assets.open(...)`
+        return self.open().__await__()
+
+    async def open(self) -> "AsyncDownloadStream":
+        if self.response is None:
+            response = await self._send()
+            if response.status_code != 200:
+                await response.aread()
+                await response.aclose()
+                raise Exception(f"Failed to download asset: {response.text}")
+            self.response = response
+            self.size = _content_length(response.headers)
+            self._chunks = response.aiter_bytes(self.chunk_size)
+        return self
+
+    def tell(self) -> int:
+        return self._position
+
+    async def _next_chunk(self) -> memoryview:
+        # The unread rest of the current chunk, fetching the next one when it is used up
+        if not self._pending:
+            if self.closed:
+                raise ValueError("I/O operation on closed download stream")
+            await self.open()
+            if self.deadline is not None:
+                self.deadline.check(f"download of {self.name}")
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                if not self._finished:
+                    self._finished = True
+                    self._verifier.finish()
+                return memoryview(b"")
+            self._verifier.update(chunk)
+            self._pending = memoryview(chunk)
+        return self._pending
+
+    async def readinto(self, buffer) -> int:
+        pending = await self._next_chunk()
+        count = min(len(pending), len(buffer))
+        with memoryview(buffer) as view:
+            view[:count] = pending[:count]
+        self._pending = pending[count:]
+        self._position += count
+        return count
+
+    async def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            parts = []
+            while True:
+                chunk = await self.read(self.chunk_size)
+                if not chunk:
+                    return b"".join(parts)
+                parts.append(chunk)
+        pending = await self._next_chunk()
+        data = bytes(pending[:size])
+        self._pending = pending[len(data):]
+        self._position += len(data)
+        return data
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        chunk = await self.read(self.chunk_size)
+        if not chunk:
+            raise StopAsyncIteration
+        return chunk
+
+    async def aclose(self):
+        if not self.closed:
+            self.closed = True
+            if self.response is not None:
+                await self.response.aclose()
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+class DownloadJournal:
+    '''
+    Sidecar of a .part file recording which byte ranges are already on disk,
+    along with the identity (size, ETag / Last-Modified, checksum, layout) of
+    the object they came from. It is rewritten atomically after each range,
+    so an interrupted download resumes where it stopped, and only when the
+    object is unchanged.
+    '''
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def load(self, identity: dict) -> bool:
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        if state.get("identity") != identity:
+            return False
+        self.state = state
+        return True
+
+    def start(self, identity: dict):
+        with self._lock:
+            self.state = {"identity": identity, "done": []}
+            self._write()
+
+    def done(self) -> List[Tuple[int, int]]:
+        with self._lock:
+            return [tuple(byte_range) for byte_range in self.state.get("done", [])]
+
+    def record(self, first: int, last: int):
+        with self._lock:
+            self.state.setdefault("done", []).append([first, last])
+            self._write()
+
+    def discard(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _write(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.path)
+
+def _contiguous_end(done: List[Tuple[int, int]]) -> int:
+    # Number of bytes from the start of the file covered by the recorded ranges
+    end = 0
+    for first, last in sorted(done):
+        if first > end:
+            break
+        end = max(end, last + 1)
+    return end
+
+class _OrderedHash:
+    # Feeds a hash the file's bytes in order while ranges land out of order:
+    # bytes written at the hashed offset go straight in, later ones are read
+    # back (from the page cache) once everything before them has arrived
+    def __init__(self, algorithm: str, fd: int):
+        self.algorithm = algorithm
+        self.fd = fd
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._hash = hashlib.new(self.algorithm)
+            self.offset = 0
+            self._pending: Dict[int, int] = {}
+
+    def written(self, offset: int, data):
+        with self._lock:
+            if offset == self.offset:
+                self._hash.update(data)
+                self.offset += len(data)
+            elif offset > self.offset:
+                self._pending[offset] = max(self._pending.get(offset, 0), offset + len(data))
+            self._drain()
+
+    def have(self, first: int, last: int):
+        # Marks bytes that are already on disk, e.g. from before a resume
+        with self._lock:
+            if last >= self.offset:
+                self._pending[first] = max(self._pending.get(first, 0), last + 1)
+            self._drain()
+
+    def _drain(self):
+        while True:
+            covering = [start for start in self._pending if start <= self.offset]
+            if not covering:
+                return
+            end = max(self._pending.pop(start) for start in covering)
+            while self.offset < end:
+                chunk = os.pread(self.fd, min(READ_SIZE, end - self.offset), self.offset)
+                if not chunk:
+                    raise IOError("Partial download is shorter than recorded")
+                self._hash.update(chunk)
+                self.offset += len(chunk)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+class _PartFile:
+    # The .part file a download is written to, its journal and its running checksum
+    def __init__(self, filename: str, expected_size: Optional[int], expected_hash: Optional[str]):
+        self.filename = filename
+        self.path = f"{filename}.part"
+        self.journal = DownloadJournal(f"{self.path}.json")
+        self.expected_size = expected_size
+        self.checksum = hash_algorithm(expected_hash)
+        self.identity: Optional[dict] = None
+        self.fd: Optional[int] = None
+        self.hash: Optional[_OrderedHash] = None
+
+    def open(self, identity: Optional[dict], size: Optional[int]) -> List[Tuple[int, int]]:
+        '''
+        Opens the .part file, resuming it when the journal matches identity, and
+        returns the byte ranges already on disk. A None identity never resumes.
+        '''
+        if self.expected_size is not None and size is not None and size != self.expected_size:
+            raise DownloadVerificationError(f"{self.filename}: server reports {size} bytes, expected {self.expected_size}")
+        self.identity = identity
+        resumed = identity is not None and os.path.exists(self.path) and self.journal.load(identity)
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT | (0 if resumed else os.O_TRUNC), 0o644)
+        if self.checksum is not None:
+            self.hash = _OrderedHash(self.checksum[0], self.fd)
+        if not resumed:
+            if identity is not None:
+                self.journal.start(identity)
+            else:
+                self.journal.discard()
+            if size:
+                _preallocate(self.fd, size)
+            return []
+        done = self.journal.done()
+        if self.hash is not None:
+            for first, last in sorted(done):
+                self.hash.have(first, last)
+        return done
+
+    def restart(self):
+        # The server sent the whole object instead of the requested range
+        os.ftruncate(self.fd, 0)
+        if self.hash is not None:
+            self.hash.reset()
+        if self.identity is not None:
+            self.journal.start(self.identity)
+
+    def write(self, data, offset: int):
+        _pwrite_all(self.fd, data, offset)
+        if self.hash is not None:
+            self.hash.written(offset, data)
+
+    def record(self, first: int, last: int):
+        if self.identity is not None:
+            self.journal.record(first, last)
+
+    def finish(self, size: int) -> str:
+        '''
+        Verifies size and checksum, then atomically renames the .part file into place.
+        '''
+        os.ftruncate(self.fd, size)
+        try:
+            if self.expected_size is not None and size != self.expected_size:
+                raise DownloadVerificationError(f"{self.filename}: downloaded {size} bytes, expected {self.expected_size}")
+            if self.hash is not None:
+                if size:
+                    self.hash.have(0, size - 1)
+                digest = self.hash.hexdigest()
+                if digest != self.checksum[1]:
+                    raise DownloadVerificationError(f"{self.filename}: {self.checksum[0]} {digest} does not match {self.checksum[1]}")
+        except DownloadVerificationError:
+            self.close()
+            self.discard()
+            raise
+        self.close()
+        os.replace(self.path, self.filename)
+        self.journal.discard()
+        return self.filename
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def discard(self):
+        for path in (self.path, self.journal.path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+class RangeDownloader:
+    '''
+    Downloads a URL into a file with parallel HTTP Range requests.
+
+    A first request for bytes=0-0 probes whether the server honours ranges
+    and how large the object is. Objects of at least `min_parallel_size` are
+    then split into `part_size` ranges fetched by `max_workers` threads, each
+    reading into its own reusable `buffer_size` buffer and writing it with
+    os.pwrite into a preallocated file. Servers without range support, and
+    small objects, are read as a single stream through the same kind of buffer.
+
+    Data goes to `<filename>.part`, next to a journal of the ranges already
+    written. An interrupted download of the same object resumes from there
+    (guarded by If-Range), and the file is renamed into place only once it
+    is complete. When expected_size / expected_hash are given they are
+    checked in the same pass, without reading the file again afterwards.
+
+    `timeout` maps the download's Deadline to the per-request timeout.
+    '''
+
+    def __init__(self, session: requests.Session, timeout: Optional[Callable[[Optional[Deadline]], Any]] = None, max_workers: int = 4,
+                 part_size: int = 32 * 1024 * 1024, buffer_size: int = 4 * 1024 * 1024, min_parallel_size: int = 64 * 1024 * 1024):
+        self.session = session
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.part_size = part_size
+        self.buffer_size = buffer_size
+        self.min_parallel_size = min_parallel_size
+
+    def _timeout(self, deadline: Optional[Deadline]):
+        return self.timeout(deadline) if self.timeout is not None else None
+
+    def remote_size(self, url: str, deadline: Optional[Deadline] = None) -> Optional[int]:
+        '''
+        Size of the object at url from a bytes=0-0 probe, or None when the server doesn't say.
+        '''
+        with self.session.get(url, headers={"Range": "bytes=0-0"}, stream=True, timeout=self._timeout(deadline)) as probe:
+            if probe.status_code == 200:
+                return _content_length(probe.headers)
+            content_range = parse_content_range(probe.headers.get("Content-Range"))
+            return content_range[2] if probe.status_code == 206 and content_range is not None else None
+
+    def download(self, url: str, filename: str, deadline: Optional[Deadline] = None,
+                 expected_size: Optional[int] = None, expected_hash: Optional[str] = None) -> str:
+        '''
+        Downloads url to filename and returns filename. Raises DownloadVerificationError
+        when the result does not match expected_size or expected_hash.
+        '''
+        if deadline is not None:
+            deadline.check(f"download of {filename}")
+        target = _PartFile(filename, expected_size, expected_hash)
+        try:
+            with self.session.get(url, headers={"Range": "bytes=0-0"}, stream=True, timeout=self._timeout(deadline)) as probe:
+                if probe.status_code == 200:
+                    # No range support: the probe already is the whole file, and nothing can be resumed
+                    target.open(None, _content_length(probe.headers))
+                    return self._stream(probe, target, 0, deadline)
+                if probe.status_code not in (206, 416):
+                    raise Exception(f"Failed to download asset: {probe.text}")
+                content_range = parse_content_range(probe.headers.get("Content-Range"))
+                size = content_range[2] if content_range is not None else None
+                validators = _validators(probe.headers)
+            if size is not None and size >= self.min_parallel_size:
+                identity = dict(validators, size=size, hash=expected_hash, part_size=self.part_size)
+                return self._download_ranges(url, target, identity, size, deadline)
+            identity = dict(validators, size=size, hash=expected_hash, part_size=None) if size else None
+            offset = _contiguous_end(target.open(identity, size))
+            headers = dict(_if_range(identity), Range=f"bytes={offset}-") if offset else {}
+            with self.session.get(url, headers=headers, stream=True, timeout=self._timeout(deadline)) as response:
+                if offset and response.status_code == 206 and _range_start(response) == offset:
+                    return self._stream(response, target, offset, deadline)
+                if response.status_code != 200:
+                    raise Exception(f"Failed to download asset: {response.text}")
+                if offset:
+                    target.restart()
+                return self._stream(response, target, 0, deadline)
+        finally:
+            target.close()
+
+    def _stream(self, response, target: _PartFile, offset: int, deadline: Optional[Deadline]) -> str:
+        length = _content_length(response.headers)
+        written = self._copy(response, target, offset, bytearray(self.buffer_size), deadline, checkpoint=self.part_size)
+        if length is not None and written != length:
+            raise IOError(f"Download of {target.filename} ended after {written} of {length} bytes")
+        return target.finish(offset + written)
+
+    def _copy(self, response, target: _PartFile, offset: int, buffer: bytearray, deadline: Optional[Deadline],
+              checkpoint: Optional[int] = None) -> int:
+        # Fills the buffer through urllib3's readinto (which copies out of its own read
+        # buffer) and flushes it with one pwrite per buffer;
+        # with a checkpoint interval, progress is journaled every `checkpoint` bytes
+        raw = response.raw
+        raw.decode_content = True
+        view = memoryview(buffer)
+        filled = 0
+        written = 0
+        journaled = 0
+        while True:
+            count = raw.readinto(view[filled:])
+            filled += count
+            if filled == len(buffer) or (not count and filled):
+                if deadline is not None:
+                    deadline.check(f"download of {target.filename}")
+                target.write(view[:filled], offset + written)
+                written += filled
+                filled = 0
+                if checkpoint is not None and written - journaled >= checkpoint:
+                    target.record(offset + journaled, offset + written - 1)
+                    journaled = written
+            if not count:
+                return written
+
+    def _download_ranges(self, url: str, target: _PartFile, identity: dict, size: int, deadline: Optional[Deadline]) -> str:
+        done = set(target.open(identity, size))
+        local = threading.local()
+        if_range = _if_range(identity)
+
+        def fetch(byte_range):
+            first, last = byte_range
+            # One buffer per worker thread, reused for every range it fetches
+            if not hasattr(local, "buffer"):
+                local.buffer = bytearray(min(self.buffer_size, self.part_size))
+            headers = dict(if_range, Range=f"bytes={first}-{last}")
+            with self.session.get(url, headers=headers, stream=True, timeout=self._timeout(deadline)) as response:
+                if response.status_code == 200:
+                    target.discard()
+                    raise IOError(f"{target.filename} changed on the server during the download")
+                if response.status_code != 206:
+                    raise Exception(f"Range request for {target.filename} failed with status {response.status_code}")
+                written = self._copy(response, target, first, local.buffer, deadline)
+            if written != last - first + 1:
+                raise IOError(f"Range {first}-{last} of {target.filename} ended after {written} bytes")
+            target.record(first, last)
+
+        pending = [byte_range for byte_range in split_ranges(size, self.part_size) if byte_range not in done]
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="videojungle-download")
+        try:
+            for _ in pool.map(fetch, pending):
+                pass
+        finally:
+            # A failed range stops the ranges that have not started yet
+            pool.shutdown(wait=True, cancel_futures=True)
+        return target.finish(size)
+
+class AsyncRangeDownloader:
+    '''
+    Asyncio counterpart of RangeDownloader on an httpx.AsyncClient: ranges
+    are fetched by up to `max_workers` concurrent tasks, and each filled
+    buffer is written with os.pwrite in the default executor. Downloads go
+    through the same .part files and journals, so either client can resume
+    a download the other started.
+    '''
+
+    def __init__(self, http, timeout: Optional[Callable[[Optional[Deadline]], Any]] = None, max_workers: int = 4,
+                 part_size: int = 32 * 1024 * 1024, buffer_size: int = 4 * 1024 * 1024, min_parallel_size: int = 64 * 1024 * 1024):
+        self.http = http
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.part_size = part_size
+        self.buffer_size = buffer_size
+        self.min_parallel_size = min_parallel_size
+
+    def _timeout(self, deadline: Optional[Deadline]):
+        return self.timeout(deadline) if self.timeout is not None else None
+
+    async def download(self, url: str, filename: str, deadline: Optional[Deadline] = None,
+                       expected_size: Optional[int] = None, expected_hash: Optional[str] = None) -> str:
+        if deadline is not None:
+            deadline.check(f"download of {filename}")
+        target = _PartFile(filename, expected_size, expected_hash)
+        try:
+            async with self.http.stream("GET", url, headers={"Range": "bytes=0-0"}, timeout=self._timeout(deadline)) as probe:
+                if probe.status_code == 200:
+                    target.open(None, _content_length(probe.headers))
+                    return await self._stream(probe, target, 0, deadline)
+                if probe.status_code not in (206, 416):
+                    await probe.aread()
+                    raise Exception(f"Failed to download asset: {probe.text}")
+                content_range = parse_content_range(probe.headers.get("Content-Range"))
+                size = content_range[2] if content_range is not None else None
+                validators = _validators(probe.headers)
+            if size is not None and size >= self.min_parallel_size:
+                identity = dict(validators, size=size, hash=expected_hash, part_size=self.part_size)
+                return await self._download_ranges(url, target, identity, size, deadline)
+            identity = dict(validators, size=size, hash=expected_hash, part_size=None) if size else None
+            offset = _contiguous_end(target.open(identity, size))
+            headers = dict(_if_range(identity), Range=f"bytes={offset}-") if offset else {}
+            async with self.http.stream("GET", url, headers=headers, timeout=self._timeout(deadline)) as response:
+                if offset and response.status_code == 206 and _range_start(response) == offset:
+                    return await self._stream(response, target, offset, deadline)
+                if response.status_code != 200:
+                    await response.aread()
+                    raise Exception(f"Failed to download asset: {response.text}")
+                if offset:
+                    target.restart()
+                return await self._stream(response, target, 0, deadline)
+        finally:
+            target.close()
+
+    async def _stream(self, response, target: _PartFile, offset: int, deadline: Optional[Deadline]) -> str:
+        length = _content_length(response.headers)
+        written = await self._copy(response, target, offset, deadline, checkpoint=self.part_size)
+        if length is not None and written != length:
+            raise IOError(f"Download of {target.filename} ended after {written} of {length} bytes")
+        return await asyncio.get_running_loop().run_in_executor(None, target.finish, offset + written)
+
+    async def _copy(self, response, target: _PartFile, offset: int, deadline: Optional[Deadline],
+                    checkpoint: Optional[int] = None) -> int:
+        loop = asyncio.get_running_loop()
+        buffer = bytearray()
+        written = 0
+        journaled = 0
+        async for chunk in response.aiter_bytes():
+            buffer += chunk
+            if len(buffer) >= self.buffer_size:
+                if deadline is not None:
+                    deadline.check(f"download of {target.filename}")
+                await loop.run_in_executor(None, target.write, buffer, offset + written)
+                written += len(buffer)
+                buffer.clear()
+                if checkpoint is not None and written - journaled >= checkpoint:
+                    target.record(offset + journaled, offset + written - 1)
+                    journaled = written
+        if buffer:
+            await loop.run_in_executor(None, target.write, buffer, offset + written)
+            written += len(buffer)
+        return written
+
+    async def _download_ranges(self, url: str, target: _PartFile, identity: dict, size: int, deadline: Optional[Deadline]) -> str:
+        done = set(target.open(identity, size))
+        semaphore = asyncio.Semaphore(self.max_workers)
+        if_range = _if_range(identity)
+
+        async def fetch_range(first, last):
+            headers = dict(if_range, Range=f"bytes={first}-{last}")
+            async with self.http.stream("GET", url, headers=headers, timeout=self._timeout(deadline)) as response:
+                if response.status_code == 200:
+                    target.discard()
+                    raise IOError(f"{target.filename} changed on the server during the download")
+                if response.status_code != 206:
+                    raise Exception(f"Range request for {target.filename} failed with status {response.status_code}")
+                written = await self._copy(response, target, first, deadline)
+            if written != last - first + 1:
+                raise IOError(f"Range {first}-{last} of {target.filename} ended after {written} bytes")
+            target.record(first, last)
+
+        failed = []
+
+        async def fetch(first, last):
+            async with semaphore:
+                if failed:
+                    return
+                try:
+                    await fetch_range(first, last)
+                except Exception as e:
+                    failed.append(e)
+
+        pending = [byte_range for byte_range in split_ranges(size, self.part_size) if byte_range not in done]
+        # Like the thread pool, a failed range stops the ranges that have not started
+        # yet while the ones in flight finish and are journaled
+        await asyncio.gather(*(fetch(first, last) for first, last in pending))
+        if failed:
+            raise failed[0]
+        return await asyncio.get_running_loop().run_in_executor(None, target.finish, size)
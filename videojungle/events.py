@@ -0,0 +1,424 @@
+import asyncio
+import json
+import queue
+import threading
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional
+import httpx
+
+class ServerSentEvent(NamedTuple):
+    '''
+    One event received from a /subscribe endpoint.
+    '''
+    data: str
+    event: str = "message"
+    id: Optional[str] = None
+    retry: Optional[int] = None
+
+    def json(self):
+        return json.loads(self.data)
+
+class SubscriptionClosed(Exception):
+    '''
+    Raised when waiting on a subscription that has been closed.
+    '''
+
+# Queued to subscribers whenever their stream (re)connects, so waiters can
+# re-check state they may have missed while disconnected
+CONNECTED = object()
+_CLOSED = object()
+
+class SSEParser:
+    '''
+    Incremental text/event-stream parser: feed it lines without their line
+    endings and it returns a ServerSentEvent whenever one is complete.
+    '''
+
+    def __init__(self):
+        self.last_event_id: Optional[str] = None
+        self._reset()
+
+    def _reset(self):
+        self._data = []
+        self._event = ""
+        self._retry = None
+
+    def feed(self, line: str) -> Optional[ServerSentEvent]:
+        if not line:
+            if not self._data and not self._event:
+                self._reset()
+                return None
+            event = ServerSentEvent("\n".join(self._data), self._event or "message", self.last_event_id, self._retry)
+            self._reset()
+            return event
+        if line.startswith(":"):
+            return None
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            self._data.append(value)
+        elif field == "event":
+            self._event = value
+        elif field == "id" and "\0" not in value:
+            self.last_event_id = value
+        elif field == "retry" and value.isdigit():
+            self._retry = int(value)
+        return None
+
+def iter_sse(lines: Iterable[str]) -> Iterator[ServerSentEvent]:
+    parser = SSEParser()
+    for line in lines:
+        event = parser.feed(line.rstrip("\r"))
+        if event is not None:
+            yield event
+
+def _is_fatal(error: BaseException) -> bool:
+    # Client errors other than 408/429 will not go away by reconnecting
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status is not None and 400 <= status < 500 and status not in (408, 429)
+
+class Subscription:
+    '''
+    A subscriber to an event stream. Iterate over it to receive events, or
+    pass a callback to have each item delivered from the stream's thread.
+    Several subscriptions to the same resource share one connection.
+
+        with vj.video_files.subscribe(video_file_id) as events:
+            for event in events:
+                print(event.event, event.data)
+    '''
+
+    def __init__(self, multiplexer: "EventMultiplexer", path: str, callback: Optional[Callable] = None):
+        self.path = path
+        self._key = path
+        self._multiplexer = multiplexer
+        self._callback = callback
+        self._queue: "queue.Queue" = queue.Queue()
+        self.closed = False
+
+    def _deliver(self, item):
+        if self._callback is not None:
+            self._callback(item)
+        else:
+            self._queue.put(item)
+
+    def get(self, timeout: Optional[float] = None) -> ServerSentEvent:
+        '''
+        Returns the next event, raising queue.Empty after timeout seconds and
+        SubscriptionClosed once the subscription is closed.
+        '''
+        while True:
+            item = self._queue.get(timeout=timeout)
+            if item is _CLOSED:
+                self._queue.put(_CLOSED)
+                raise SubscriptionClosed(f"Subscription to {self.path} is closed")
+            if isinstance(item, BaseException):
+                raise item
+            if item is not CONNECTED:
+                return item
+
+    def __iter__(self):
+        while True:
+            try:
+                yield self.get()
+            except SubscriptionClosed:
+                return
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._multiplexer._unsubscribe(self)
+            self._deliver(_CLOSED)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class _Channel:
+    # One connection to a subscribe endpoint, shared by all of its subscribers.
+    # Keyed by path, except for subscribers resuming from their own event id
+    def __init__(self, path: str, last_event_id: Optional[str], key=None):
+        self.path = path
+        self.key = key if key is not None else path
+        self.subscribers = []
+        self.last_event_id = last_event_id
+        self.retry: Optional[float] = None
+        self.response = None
+        # True while the stream is open; late subscribers are sent CONNECTED
+        self.connected = False
+        self.thread: Optional[threading.Thread] = None
+        self.task: Optional[asyncio.Task] = None
+        self.stopped = threading.Event()
+
+    def dispatch(self, item):
+        for subscriber in list(self.subscribers):
+            subscriber._deliver(item)
+
+def _channel_key(channels: Dict, path: str, last_event_id: Optional[str], subscription):
+    # A subscriber resuming from an event id the shared connection has moved
+    # past gets its own connection, so it still receives what it missed
+    channel = channels.get(path)
+    if last_event_id is None or channel is None or channel.last_event_id == last_event_id:
+        return path
+    return (path, id(subscription))
+
+class EventMultiplexer:
+    '''
+    Keeps at most one Server-Sent-Events connection per resource and fans
+    its events out to every subscriber. Each connection runs on its own
+    daemon thread, reconnects with backoff (resuming via Last-Event-ID)
+    and is closed once its last subscriber goes away.
+
+    Streams use the client's connect timeout but no read timeout by default,
+    since a quiet stream is normal; set read_timeout to reconnect streams
+    that stay silent longer than that.
+    '''
+
+    def __init__(self, client, read_timeout: Optional[float] = None):
+        self.client = client
+        self.read_timeout = read_timeout
+        self._lock = threading.Lock()
+        self._channels: Dict = {}
+        self.reconnects = 0
+
+    def subscribe(self, path: str, callback: Optional[Callable] = None, last_event_id: Optional[str] = None) -> Subscription:
+        subscription = Subscription(self, path, callback)
+        with self._lock:
+            subscription._key = _channel_key(self._channels, path, last_event_id, subscription)
+            channel = self._channels.get(subscription._key)
+            if channel is None:
+                channel = self._channels[subscription._key] = _Channel(path, last_event_id, subscription._key)
+                channel.subscribers.append(subscription)
+                channel.thread = threading.Thread(target=self._run, args=(channel,), name=f"videojungle-sse {path}", daemon=True)
+                channel.thread.start()
+            else:
+                channel.subscribers.append(subscription)
+            connected = channel.connected
+        if connected:
+            # The stream connected before this subscriber joined
+            subscription._deliver(CONNECTED)
+        return subscription
+
+    def channels(self) -> int:
+        with self._lock:
+            return len(self._channels)
+
+    def close(self):
+        with self._lock:
+            subscriptions = [s for channel in self._channels.values() for s in channel.subscribers]
+        for subscription in subscriptions:
+            subscription.close()
+
+    def _unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            channel = self._channels.get(subscription._key)
+            if channel is None or subscription not in channel.subscribers:
+                return
+            channel.subscribers.remove(subscription)
+            if channel.subscribers:
+                return
+            del self._channels[subscription._key]
+            response = channel.response
+        channel.stopped.set()
+        if response is not None:
+            # Unblocks the reader thread
+            response.close()
+
+    def _active(self, channel: _Channel) -> bool:
+        with self._lock:
+            return self._channels.get(channel.key) is channel
+
+    def _run(self, channel: _Channel):
+        client = self.client
+        attempt = 0
+        while self._active(channel):
+            headers = {"X-API-Key": client.token, "Accept": "text/event-stream", "Cache-Control": "no-cache"}
+            if channel.last_event_id is not None:
+                headers["Last-Event-ID"] = channel.last_event_id
+            url = f"{client.BASE_URL}/{channel.path.lstrip('/')}"
+            try:
+                timeout = (client.timeout.connect, self.read_timeout)
+                with client.session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+                    channel.response = response
+                    if not self._active(channel):
+                        return
+                    response.raise_for_status()
+                    with self._lock:
+                        channel.connected = True
+                    channel.dispatch(CONNECTED)
+                    for event in iter_sse(response.iter_lines(decode_unicode=True)):
+                        attempt = 0
+                        if event.retry is not None:
+                            channel.retry = event.retry / 1000
+                        if event.id is not None:
+                            channel.last_event_id = event.id
+                        channel.dispatch(event)
+            except Exception as e:
+                if not self._active(channel):
+                    return
+                if _is_fatal(e):
+                    with self._lock:
+                        if self._channels.get(channel.key) is channel:
+                            del self._channels[channel.key]
+                    channel.dispatch(e)
+                    return
+            finally:
+                with self._lock:
+                    channel.connected = False
+                channel.response = None
+            if not self._active(channel):
+                return
+            delay = channel.retry if channel.retry is not None and attempt == 0 else client.retry.backoff(attempt)
+            attempt += 1
+            self.reconnects += 1
+            channel.stopped.wait(delay)
+
+class AsyncSubscription:
+    '''
+    Asyncio counterpart of Subscription:
+
+        async with vj.video_files.subscribe(video_file_id) as events:
+            async for event in events:
+                print(event.event, event.data)
+    '''
+
+    def __init__(self, multiplexer: "AsyncEventMultiplexer", path: str):
+        self.path = path
+        self._key = path
+        self._multiplexer = multiplexer
+        self._queue: "asyncio.Queue" = asyncio.Queue()
+        self.closed = False
+
+    def _deliver(self, item):
+        self._queue.put_nowait(item)
+
+    async def _next(self, connects: bool = False):
+        while True:
+            item = await self._queue.get()
+            if item is _CLOSED:
+                self._queue.put_nowait(_CLOSED)
+                raise SubscriptionClosed(f"Subscription to {self.path} is closed")
+            if isinstance(item, BaseException):
+                raise item
+            if item is not CONNECTED or connects:
+                return item
+
+    async def get(self) -> ServerSentEvent:
+        return await self._next()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> ServerSentEvent:
+        try:
+            return await self._next()
+        except SubscriptionClosed:
+            raise StopAsyncIteration
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._multiplexer._unsubscribe(self)
+            self._deliver(_CLOSED)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+class AsyncEventMultiplexer:
+    '''
+    Asyncio counterpart of EventMultiplexer: one streaming connection task
+    per resource, shared by all of its subscribers. As there, streams have
+    no read timeout unless read_timeout is set.
+    '''
+
+    def __init__(self, client, read_timeout: Optional[float] = None):
+        self.client = client
+        self.read_timeout = read_timeout
+        self._channels: Dict = {}
+        self.reconnects = 0
+
+    def subscribe(self, path: str, last_event_id: Optional[str] = None) -> AsyncSubscription:
+        subscription = AsyncSubscription(self, path)
+        subscription._key = _channel_key(self._channels, path, last_event_id, subscription)
+        channel = self._channels.get(subscription._key)
+        if channel is None:
+            channel = self._channels[subscription._key] = _Channel(path, last_event_id, subscription._key)
+            channel.task = asyncio.get_running_loop().create_task(self._run(channel))
+        channel.subscribers.append(subscription)
+        if channel.connected:
+            # The stream connected before this subscriber joined
+            subscription._deliver(CONNECTED)
+        return subscription
+
+    def channels(self) -> int:
+        return len(self._channels)
+
+    def close(self):
+        for channel in list(self._channels.values()):
+            for subscription in list(channel.subscribers):
+                subscription.close()
+
+    def _unsubscribe(self, subscription: AsyncSubscription):
+        channel = self._channels.get(subscription._key)
+        if channel is None or subscription not in channel.subscribers:
+            return
+        channel.subscribers.remove(subscription)
+        if not channel.subscribers:
+            del self._channels[subscription._key]
+            channel.task.cancel()
+
+    async def _run(self, channel: _Channel):
+        client = self.client
+        attempt = 0
+        connect = client.timeout.connect
+        timeout = httpx.Timeout(connect=connect, read=self.read_timeout, write=connect, pool=connect)
+        while True:
+            headers = {"X-API-Key": client.token, "Accept": "text/event-stream", "Cache-Control": "no-cache"}
+            if channel.last_event_id is not None:
+                headers["Last-Event-ID"] = channel.last_event_id
+            url = f"{client.BASE_URL}/{channel.path.lstrip('/')}"
+            try:
+                async with client.http.stream("GET", url, headers=headers, timeout=timeout) as response:
+                    response.raise_for_status()
+                    channel.connected = True
+                    channel.dispatch(CONNECTED)
+                    parser = SSEParser()
+                    async for line in response.aiter_lines():
+                        event = parser.feed(line.rstrip("\r"))
+                        if event is None:
+                            continue
+                        attempt = 0
+                        if event.retry is not None:
+                            channel.retry = event.retry / 1000
+                        if event.id is not None:
+                            channel.last_event_id = event.id
+                        channel.dispatch(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if _is_fatal(e):
+                    if self._channels.get(channel.key) is channel:
+                        del self._channels[channel.key]
+                    channel.dispatch(e)
+                    return
+            finally:
+                channel.connected = False
+            delay = channel.retry if channel.retry is not None and attempt == 0 else client.retry.backoff(attempt)
+            attempt += 1
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+
+def subscription_path(kind: str, resource_id: str) -> str:
+    '''
+    Subscribe endpoint for a video file ('video') or an asset ('asset').
+    '''
+    if kind == "video":
+        return f"/videos/{resource_id}/subscribe"
+    if kind == "asset":
+        return f"/assets/{resource_id}/subscribe"
+    raise ValueError(f"Unknown subscription kind '{kind}'")
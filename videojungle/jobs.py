@@ -0,0 +1,390 @@
+import asyncio
+import heapq
+import itertools
+import random
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from .model import Asset, Prompt, VideoFile
+from .timeouts import Deadline, DeadlineExceeded
+
+ASSET_FAILED_STATUSES = frozenset({"failed", "error"})
+ANALYSIS_DONE_STATUSES = frozenset({"analyzed", "complete", "completed"})
+ANALYSIS_FAILED_STATUSES = frozenset({"failed", "error"})
+
+class JobFailed(Exception):
+    '''
+    Raised by Job.result() when the server reports that the job failed.
+    '''
+
+class Job(Future):
+    '''
+    Handle for a server-side operation (render, generation, analysis) that
+    completes asynchronously. It is a concurrent.futures.Future, so it works
+    with concurrent.futures.wait / as_completed, and it can be awaited from
+    asyncio code:
+
+        job = vj.edits.render_edit(project_id, edit_id)
+        job.add_done_callback(lambda j: print("rendered", j.result().download_url))
+        asset = job.result(timeout=600)      # or: asset = await job
+
+    The initial API response is available as job.response, and for backwards
+    compatibility the job can be indexed like it, e.g. job["asset_id"].
+    '''
+
+    # Consecutive polling errors tolerated before the job is failed
+    MAX_POLL_ERRORS = 5
+
+    def __init__(self, kind: str, response: dict, check: Callable[[], Tuple[bool, Any]], deadline=None, key: Optional[Hashable] = None):
+        super().__init__()
+        self.kind = kind
+        self.response = response
+        self.deadline = Deadline.coerce(deadline)
+        # Jobs with the same key share one status request per sweep
+        self.key = key
+        self.started = time.monotonic()
+        self.polls = 0
+        self._check = check
+        self._poll_errors = 0
+
+    def __getitem__(self, key):
+        return self.response[key]
+
+    def __contains__(self, key):
+        return key in self.response
+
+    def get(self, key, default=None):
+        return self.response.get(key, default)
+
+    def keys(self):
+        return self.response.keys()
+
+    def __await__(self):
+        return asyncio.wrap_future(self).__await__()
+
+    def poll(self) -> bool:
+        '''
+        Checks the job status once and completes the job if it is finished.
+        Returns True once the job is done.
+        '''
+        if self.done():
+            return True
+        try:
+            outcome = self._check()
+        except Exception as e:
+            return self._settle(error=e)
+        return self._settle(outcome)
+
+    def age(self) -> float:
+        return time.monotonic() - self.started
+
+    def _settle(self, outcome: Optional[Tuple[bool, Any]] = None, error: Optional[Exception] = None) -> bool:
+        # Applies the outcome of one status check; shared by jobs polled in the same batch
+        if self.done():
+            return True
+        self.polls += 1
+        if isinstance(error, JobFailed):
+            self._finish(error=error)
+            return True
+        if error is not None:
+            self._poll_errors += 1
+            if self._poll_errors >= self.MAX_POLL_ERRORS:
+                self._finish(error=error)
+                return True
+        else:
+            finished, result = outcome
+            self._poll_errors = 0
+            if finished:
+                self._finish(result=result)
+                return True
+        if self.deadline is not None and self.deadline.expired():
+            self._finish(error=DeadlineExceeded(f"Deadline of {self.deadline.seconds:g}s exceeded waiting for {self.kind} job"))
+            return True
+        return False
+
+    def _finish(self, result=None, error: Optional[BaseException] = None):
+        try:
+            if error is not None:
+                self.set_exception(error)
+            else:
+                self.set_result(result)
+        except InvalidStateError:
+            # Cancelled by the caller while we were polling
+            pass
+
+    def __repr__(self):
+        state = "done" if self.done() else "pending"
+        return f"<Job {self.kind} {state} {self.response}>"
+
+class PollSchedule:
+    '''
+    Decides how long to wait before polling a job again.
+
+    Polls start every `initial` seconds and back off exponentially by `factor`,
+    up to a cap per job kind, with +/- `jitter` so many jobs started together
+    do not poll in lockstep. Once a few jobs of a kind have finished, the
+    schedule uses their median duration: a job is polled sparsely until it
+    approaches the usual completion time, frequently around it, and backs
+    off again if it runs long. Short jobs are noticed quickly and long ones
+    cost few requests.
+    '''
+
+    DEFAULT_MAX_INTERVALS = {"prompt": 5.0, "generate": 30.0, "render": 30.0, "asset": 30.0, "analysis": 60.0}
+
+    def __init__(self, initial: float = 0.25, factor: float = 1.5, max_interval: float = 30.0,
+                 max_intervals: Optional[Dict[str, float]] = None, jitter: float = 0.1, history: int = 50):
+        '''
+        Args:
+            initial: First polling interval, and the shortest one used
+            factor: Growth of the interval after each unfinished poll
+            max_interval: Cap for kinds not listed in max_intervals
+            max_intervals: Cap per job kind ('prompt', 'generate', 'render', 'asset', 'analysis')
+            jitter: Random fraction added to or removed from each interval
+            history: Number of completion times remembered per kind
+        '''
+        self.initial = initial
+        self.factor = factor
+        self.max_interval = max_interval
+        self.max_intervals = dict(self.DEFAULT_MAX_INTERVALS, **(max_intervals or {}))
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._durations: Dict[str, deque] = {}
+        self._history = history
+
+    def observe(self, kind: str, duration: float):
+        '''
+        Records how long a finished job of this kind took.
+        '''
+        with self._lock:
+            durations = self._durations.get(kind)
+            if durations is None:
+                durations = self._durations[kind] = deque(maxlen=self._history)
+            durations.append(duration)
+
+    def typical(self, kind: str) -> Optional[float]:
+        '''
+        Median observed duration for the kind, once at least 3 jobs finished.
+        '''
+        with self._lock:
+            durations = self._durations.get(kind)
+            if not durations or len(durations) < 3:
+                return None
+            return statistics.median(durations)
+
+    def next_delay(self, kind: str, polls: int, age: float, deadline: Optional[Deadline] = None) -> float:
+        '''
+        Seconds to wait before the next poll of a job that has been polled
+        `polls` times and has been running for `age` seconds.
+        '''
+        cap = self.max_intervals.get(kind, self.max_interval)
+        typical = self.typical(kind)
+        if typical is None:
+            delay = self.initial * self.factor ** polls
+        elif age < typical:
+            # Close half the gap to the usual completion time each poll
+            delay = max(self.initial, (typical - age) / 2)
+        else:
+            overdue = age - typical
+            delay = max(self.initial, overdue / 2)
+        delay = min(delay, cap)
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        if deadline is not None:
+            # Poll once more right at the deadline rather than oversleeping it
+            delay = min(delay, deadline.remaining())
+        return max(0.0, delay)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {kind: {"completed": len(d), "median": statistics.median(d)} for kind, d in self._durations.items() if d}
+
+class JobPoller:
+    '''
+    A single background thread that schedules polls for every outstanding
+    Job of a client, instead of one thread or busy loop per job. The thread
+    starts when the first job is submitted and exits once there is nothing
+    left to poll.
+
+    Work is done in sweeps: due times are rounded up to the next `tick`, and
+    each sweep checks every job that is due, sending a single status request
+    for jobs that wait on the same thing (e.g. two downloads of one asset).
+    The checks run on a pool of `max_workers` threads, so one slow status
+    request does not hold up the others or the next sweep. When to poll each
+    job again comes from the PollSchedule.
+    '''
+
+    def __init__(self, schedule: Optional[PollSchedule] = None, tick: float = 0.25, max_workers: int = 4):
+        self.schedule = schedule if schedule is not None else PollSchedule()
+        self.tick = tick
+        self.sweeps = 0
+        self.checks = 0
+        self._cond = threading.Condition()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="videojungle-job-check")
+        # Checks submitted to the pool that have not finished yet
+        self._running = 0
+        self._closed = False
+
+    def submit(self, job: Job) -> Job:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("JobPoller is closed")
+            job.add_done_callback(self._completed)
+            heapq.heappush(self._queue, (time.monotonic(), next(self._sequence), job))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="videojungle-job-poller", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return job
+
+    def wait(self, job: Job):
+        '''
+        Submits the job and blocks until it finishes, returning its result.
+        '''
+        return self.submit(job).result()
+
+    def pending(self) -> int:
+        with self._cond:
+            return sum(1 for _, _, job in self._queue if not job.done())
+
+    def stats(self) -> dict:
+        with self._cond:
+            pending = sum(1 for _, _, job in self._queue if not job.done())
+            return {"pending": pending, "sweeps": self.sweeps, "checks": self.checks, "durations": self.schedule.stats()}
+
+    def close(self):
+        '''
+        Stops polling and cancels jobs that have not finished.
+        '''
+        with self._cond:
+            self._closed = True
+            jobs = [job for _, _, job in self._queue]
+            self._queue.clear()
+            self._cond.notify()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        for job in jobs:
+            job.cancel()
+
+    def _completed(self, job: Job):
+        if not job.cancelled() and job.exception() is None:
+            self.schedule.observe(job.kind, job.age())
+
+    def _align(self, when: float) -> float:
+        # Round up to the tick grid so jobs become due together and share a sweep
+        if self.tick <= 0:
+            return when
+        return (int(when / self.tick) + 1) * self.tick
+
+    def _next_due(self):
+        # Called with the condition held; returns due jobs, or None when the thread should exit
+        while True:
+            if self._closed or (not self._queue and not self._running):
+                self._thread = None
+                return None
+            if not self._queue:
+                # Checks still running will queue their jobs again
+                self._cond.wait()
+                continue
+            now = time.monotonic()
+            if self._queue[0][0] <= now:
+                due = []
+                while self._queue and self._queue[0][0] <= now:
+                    due.append(heapq.heappop(self._queue)[2])
+                return due
+            self._cond.wait(self._queue[0][0] - now)
+
+    def _sweep(self, due):
+        groups: Dict[Hashable, list] = {}
+        for job in due:
+            if not job.done():
+                key = job.key if job.key is not None else id(job)
+                groups.setdefault(key, []).append(job)
+        with self._cond:
+            self._running += len(groups)
+        for jobs in groups.values():
+            self._pool.submit(self._check, jobs)
+        self.sweeps += 1
+
+    def _check(self, jobs):
+        # Runs on the pool: one status request for the group, then reschedules what is not done
+        outcome, error = None, None
+        try:
+            outcome = jobs[0]._check()
+        except Exception as e:
+            error = e
+        pending = [job for job in jobs if not job._settle(outcome, error)]
+        now = time.monotonic()
+        with self._cond:
+            self.checks += 1
+            self._running -= 1
+            if not self._closed:
+                for job in pending:
+                    delay = self.schedule.next_delay(job.kind, job.polls, job.age(), job.deadline)
+                    heapq.heappush(self._queue, (self._align(now + delay), next(self._sequence), job))
+            self._cond.notify()
+        if self._closed:
+            for job in pending:
+                job.cancel()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                due = self._next_due()
+            if due is None:
+                return
+            try:
+                self._sweep(due)
+            except RuntimeError:
+                # The pool was shut down by close()
+                with self._cond:
+                    self._running = 0
+                for job in due:
+                    job.cancel()
+
+def asset_finished(asset: Asset) -> bool:
+    '''
+    True once the asset is uploaded; raises JobFailed if the server reports a failure.
+    '''
+    if asset.status in ASSET_FAILED_STATUSES:
+        raise JobFailed(f"Asset {asset.id} failed with status '{asset.status}'")
+    return asset.uploaded
+
+def analysis_finished(video: VideoFile) -> bool:
+    '''
+    True once the video file has been analyzed; raises JobFailed if the analysis failed.
+    '''
+    status = (video.current_status or "").lower()
+    if status in ANALYSIS_FAILED_STATUSES:
+        raise JobFailed(f"Analysis of video file {video.id} failed with status '{video.current_status}'")
+    return status in ANALYSIS_DONE_STATUSES or (not status and bool(video.analysis))
+
+def asset_ready_check(client, asset_id: str, deadline: Optional[Deadline] = None) -> Callable[[], Tuple[bool, Any]]:
+    '''
+    Job check that finishes once the asset is uploaded, with the Asset as result.
+    '''
+    def check():
+        asset = client._make_request("GET", f"/assets/{asset_id}", response_model=Asset, deadline=deadline, use_cache=False)
+        return asset_finished(asset), asset
+    return check
+
+def analysis_complete_check(client, video_file_id: str, deadline: Optional[Deadline] = None) -> Callable[[], Tuple[bool, Any]]:
+    '''
+    Job check that finishes once the video file has been analyzed, with the VideoFile as result.
+    '''
+    def check():
+        video = client._make_request("GET", f"/video-file/{video_file_id}", response_model=VideoFile, deadline=deadline, use_cache=False)
+        return analysis_finished(video), video
+    return check
+
+def prompt_ready_check(client, prompt_id: str, deadline: Optional[Deadline] = None) -> Callable[[], Tuple[bool, Any]]:
+    '''
+    Job check that finishes once the prompt has been generated, with the Prompt as result.
+    '''
+    def check():
+        prompt = client._make_request("GET", f"/prompts/{prompt_id}", response_model=Prompt, deadline=deadline, use_cache=False)
+        return prompt.value != "generating...", prompt
+    return check
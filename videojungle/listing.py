@@ -0,0 +1,146 @@
+import codecs
+import json
+from typing import Any, List, Optional
+from urllib import parse
+
+# Read size of streamed list bodies
+LIST_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+# Characters that can follow a complete number inside an array
+_NUMBER_END = _WHITESPACE + ",]"
+
+class JSONArrayParser:
+    '''
+    Incremental parser for a JSON array that arrives in chunks. feed() returns
+    the items completed by each chunk, so only the item being received and one
+    chunk are held in memory, never the whole array.
+    '''
+
+    def __init__(self):
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pending: List[str] = []
+        self._pending_size = 0
+        self._state = "start"
+        # Unparsed characters needed before a partial item is tried again;
+        # doubling keeps re-parsing of large items linear overall
+        self._need = 0
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        text = self._text.decode(chunk)
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if len(self._buffer) + self._pending_size < self._need:
+            # Still inside a partial item; joining now would copy it for nothing
+            return []
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        '''
+        Parses what is left at the end of the body. Raises ValueError when
+        the array is truncated.
+        '''
+        self._pending.append(self._text.decode(b"", final=True))
+        items = self._parse(final=True)
+        if self._state != "end":
+            raise ValueError("Truncated JSON array in response")
+        return items
+
+    def _parse(self, final: bool) -> List[Any]:
+        items = []
+        buffer = self._buffer + "".join(self._pending)
+        self._pending = []
+        self._pending_size = 0
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            if self._state == "start":
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array in response")
+                pos += 1
+                self._state = "first"
+            elif self._state in ("first", "item"):
+                if self._state == "first" and buffer[pos] == "]":
+                    pos += 1
+                    self._state = "end"
+                    continue
+                try:
+                    item, end = self._json.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    self._need = 2 * (len(buffer) - pos)
+                    break
+                if not final and isinstance(item, (int, float)) and (end == len(buffer) or buffer[end] not in _NUMBER_END):
+                    # A number cut at a chunk boundary ("-2." or "1e") may continue in the next chunk
+                    self._need = len(buffer) - pos + 1
+                    break
+                items.append(item)
+                pos = end
+                self._need = 0
+                self._state = "comma"
+            elif self._state == "comma":
+                if buffer[pos] not in ",]":
+                    raise ValueError(f"Unexpected {buffer[pos]!r} in JSON array")
+                self._state = "item" if buffer[pos] == "," else "end"
+                pos += 1
+            else:
+                raise ValueError("Unexpected data after JSON array")
+        self._buffer = buffer[pos:]
+        return items
+
+class ListBody:
+    '''
+    Items of one list response body, fed in chunks.
+
+    A bare JSON array (what the API returns today) is parsed incrementally.
+    A page envelope, {"items": [...], "next": <url or null>}, is parsed once
+    complete, and its next URL is available from .next after close().
+    '''
+
+    def __init__(self):
+        self._array: Optional[JSONArrayParser] = None
+        self._envelope: Optional[bytearray] = None
+        self.next: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        if self._array is None and self._envelope is None:
+            stripped = chunk.lstrip()
+            if not stripped:
+                return []
+            if stripped[:1] == b"{":
+                self._envelope = bytearray()
+            else:
+                self._array = JSONArrayParser()
+        if self._envelope is not None:
+            self._envelope += chunk
+            return []
+        return self._array.feed(chunk)
+
+    def close(self) -> List[Any]:
+        if self._envelope is not None:
+            page = json.loads(bytes(self._envelope))
+            if not isinstance(page.get("items"), list):
+                raise ValueError("Expected a JSON array or an {\"items\": [...]} page in response")
+            self.next = page.get("next")
+            return page["items"]
+        if self._array is None:
+            raise ValueError("Empty list response")
+        return self._array.close()
+
+def next_page_url(url: str, links: dict, body: ListBody) -> Optional[str]:
+    '''
+    URL of the page after `url`, from a Link: <...>; rel="next" header or the
+    envelope's "next", or None on the last (or only) page.
+    '''
+    link = (links.get("next") or {}).get("url") or body.next
+    return parse.urljoin(url, link) if link else None
+
+def same_origin(a: str, b: str) -> bool:
+    a, b = parse.urlsplit(a), parse.urlsplit(b)
+    return (a.scheme, a.netloc) == (b.scheme, b.netloc)
@@ -0,0 +1,199 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+# ioctl request number of Linux's FICLONE (copy-on-write clone of a whole file)
+_FICLONE = 0x40049409
+
+def media_key(kind: str, resource_id: str, server_hash: Optional[str] = None) -> str:
+    '''
+    Cache key of a video file ('video_file') or asset ('asset'). Including the
+    server's content hash means a changed file never matches its old entry.
+    '''
+    return f"{kind}/{resource_id}/{(server_hash or '-').lower()}"
+
+def _reflink(source: str, target: str) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return True
+        except OSError:
+            return False
+
+class MediaCache:
+    '''
+    Optional on-disk cache of downloaded media shared by every process on the
+    host that points at the same directory:
+
+        vj = ApiClient(token=VJ_API_KEY, media_cache=MediaCache(max_bytes=50 * 1024**3))
+
+    With a cache, AssetsAPI.download and VideoFileAPI.download serve files
+    that were downloaded before from the cache instead of the network. Entries
+    are keyed by resource id plus the server's content hash. The least recently
+    used entries are evicted once the cache grows beyond max_bytes.
+
+    Hits are placed at the destination as a copy-on-write reflink where the
+    filesystem supports it (e.g. btrfs or XFS on Linux), and as a plain copy
+    otherwise. link="hardlink" shares the cached inode instead, which
+    is fastest but means writing to the downloaded file in place changes the
+    cached copy; use it only when downloads are treated as read-only.
+
+    Only one process downloads a given entry at a time (flock per entry);
+    the others wait and then use the cached file. The index lives in SQLite
+    in WAL mode, and files enter the cache by atomic rename.
+    '''
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 20 * 1024 ** 3, link: str = "auto"):
+        import fcntl  # noqa: F401 -- fail early on platforms without flock
+        if link not in ("auto", "hardlink", "copy"):
+            raise ValueError("link must be 'auto', 'hardlink' or 'copy'")
+        self.directory = directory or os.path.join(os.path.expanduser("~"), ".cache", "videojungle", "media")
+        self.max_bytes = max_bytes
+        self.link = link
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(os.path.join(self.directory, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(self.directory, "locks"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(self.directory, "index.sqlite3"), timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, path TEXT, size INTEGER, last_used REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _query(self, sql: str, *args):
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def _object_path(self, key: str) -> str:
+        return os.path.join(self.directory, "objects", hashlib.sha256(key.encode()).hexdigest())
+
+    @contextmanager
+    def _locked(self, key: str, blocking: bool = True):
+        # Exclusive across processes and, since every call opens its own file, across
+        # threads too. Yields False when not blocking and someone else holds the lock.
+        import fcntl
+        path = os.path.join(self.directory, "locks", hashlib.sha256(key.encode()).hexdigest()[:32])
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            yield True
+        finally:
+            os.close(fd)
+
+    def fetch(self, key: str, filename: str, download: Callable[[str], object]) -> str:
+        '''
+        Places the entry for key at filename, calling download(path) to fill
+        the cache first on a miss, and returns filename.
+        '''
+        if self._materialize(key, filename):
+            self._count(hit=True)
+            return filename
+        with self._locked(key):
+            # Another process may have finished the download while we waited
+            if self._materialize(key, filename):
+                self._count(hit=True)
+                return filename
+            self._count(hit=False)
+            path = self._object_path(key)
+            download(path)
+            self._query("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", key, path, os.path.getsize(path), time.time())
+            placed = self._materialize(key, filename)
+        self._evict()
+        if not placed:
+            raise IOError(f"Could not place cached {key} at {filename}")
+        return filename
+
+    def _materialize(self, key: str, filename: str) -> bool:
+        rows = self._query("SELECT path, size FROM entries WHERE key = ?", key)
+        if not rows:
+            return False
+        path, size = rows[0]
+        tmp = f"{filename}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            if os.path.getsize(path) != size:
+                raise FileNotFoundError(path)
+            self._place(path, tmp)
+            os.replace(tmp, filename)
+        except FileNotFoundError:
+            # Evicted by another process, or removed by hand
+            self._query("DELETE FROM entries WHERE key = ? AND path = ?", key, path)
+            self._remove(tmp)
+            return False
+        except BaseException:
+            self._remove(tmp)
+            raise
+        self._query("UPDATE entries SET last_used = ? WHERE key = ?", time.time(), key)
+        return True
+
+    def _place(self, source: str, target: str):
+        if self.link == "hardlink":
+            try:
+                os.link(source, target)
+                return
+            except FileNotFoundError:
+                raise
+            except OSError:
+                # e.g. the destination is on another filesystem
+                pass
+        elif self.link == "auto" and _reflink(source, target):
+            return
+        shutil.copyfile(source, target)
+
+    def _evict(self):
+        total = self._query("SELECT COALESCE(SUM(size), 0) FROM entries")[0][0]
+        if total <= self.max_bytes:
+            return
+        for key, path, size in self._query("SELECT key, path, size FROM entries ORDER BY last_used"):
+            if total <= self.max_bytes:
+                return
+            with self._locked(key, blocking=False) as locked:
+                if not locked:
+                    # Being downloaded or placed right now, so not least recently used
+                    continue
+                self._query("DELETE FROM entries WHERE key = ? AND path = ?", key, path)
+                self._remove(path)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def size(self) -> int:
+        return self._query("SELECT COALESCE(SUM(size), 0) FROM entries")[0][0]
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+        stats.update(entries=self._query("SELECT COUNT(*) FROM entries")[0][0], bytes=self.size(), max_bytes=self.max_bytes)
+        return stats
@@ -1,8 +1,9 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional, Set, Any, Union, Dict
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+from typing import ClassVar, List, Optional, Set, Any, Tuple, Union, Dict, get_args, get_origin
 from datetime import time, datetime
 from uuid import UUID
 import json
+from .analysis import AnalysisTable
 
 class DurationFilter(BaseModel):
     """Model representing duration filter constraints for video search."""
@@ -195,6 +196,16 @@ class VideoFile(BaseModel):
     has_redirect: bool = False
     public_link: Optional[PublicLinkInfo] = None
     # embeddings: List[dict]
+    _analysis_table: Optional[AnalysisTable] = None
+
+    @property
+    def analysis_table(self) -> AnalysisTable:
+        """
+        The analysis segments as a column-wise AnalysisTable, built from `analysis` on first access.
+        """
+        if self._analysis_table is None:
+            self._analysis_table = AnalysisTable.from_analysis(self.analysis)
+        return self._analysis_table
 
 class VideoUpload(BaseModel):
     """Model representing a video file upload."""
@@ -481,7 +492,97 @@ class CollaboratorRequest(BaseModel):
         description="Email address of the user to add as a collaborator.",
     )
 
-class Project(BaseModel):
+HYDRATION_MODES = ("full", "lazy")
+
+_field_adapters: Dict[Tuple[type, str], TypeAdapter] = {}
+
+def _field_adapter(model: type, name: str) -> TypeAdapter:
+    adapter = _field_adapters.get((model, name))
+    if adapter is None:
+        adapter = _field_adapters[(model, name)] = TypeAdapter(model.model_fields[name].annotation)
+    return adapter
+
+class LazyModel(BaseModel):
+    """
+    Base for models with large nested lists (named in lazy_fields) whose
+    validation can wait until the field is first read:
+
+        project = Project.model_validate_deferred(payload)   # validates scalars only
+        project.assets                                       # validates assets now
+
+    Dumping, copying, comparing or printing the model validates every deferred
+    field first, so a fully read model is indistinguishable from one validated
+    up front. Validation errors in a deferred field surface on first access.
+    """
+
+    lazy_fields: ClassVar[Tuple[str, ...]] = ()
+    _deferred: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def model_validate_deferred(cls, data: Dict[str, Any]):
+        deferred = {name: data[name] for name in cls.lazy_fields if name in data}
+        instance = cls.model_validate({**data, **{name: [] for name in deferred}})
+        for name in deferred:
+            del instance.__dict__[name]
+        instance._deferred = deferred or None
+        return instance
+
+    def __getattr__(self, name: str):
+        private = object.__getattribute__(self, "__pydantic_private__") or {}
+        deferred = private.get("_deferred")
+        if deferred and name in deferred:
+            self._hydrate(name)
+            return self.__dict__[name]
+        return super().__getattr__(name)
+
+    def _hydrate(self, name: str):
+        raw = self._deferred.pop(name)
+        if name not in self.__dict__:
+            # Otherwise assigned since, and the server value is stale
+            self.__dict__[name] = _field_adapter(type(self), name).validate_python(raw)
+        if not self._deferred:
+            self._deferred = None
+
+    def hydrate(self):
+        """
+        Validates every deferred field now and returns self.
+        """
+        if self._deferred:
+            for name in list(self._deferred):
+                self._hydrate(name)
+        return self
+
+    @property
+    def is_hydrated(self) -> bool:
+        return not self._deferred
+
+    def model_dump(self, **kwargs):
+        return super(LazyModel, self.hydrate()).model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs):
+        return super(LazyModel, self.hydrate()).model_dump_json(**kwargs)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyModel):
+            other.hydrate()
+        return super(LazyModel, self.hydrate()).__eq__(other)
+
+    def __repr_args__(self):
+        return super(LazyModel, self.hydrate()).__repr_args__()
+
+    def __iter__(self):
+        return super(LazyModel, self.hydrate()).__iter__()
+
+    def __copy__(self):
+        return super(LazyModel, self.hydrate()).__copy__()
+
+    def __deepcopy__(self, memo=None):
+        return super(LazyModel, self.hydrate()).__deepcopy__(memo)
+
+    def __getstate__(self):
+        return super(LazyModel, self.hydrate()).__getstate__()
+
+class Project(LazyModel):
     id: str
     name: str
     description: Optional[str]
@@ -494,6 +595,9 @@ class Project(BaseModel):
     scripts: List[Script]
     _client: Optional[Any] = None
 
+    # Validated on first access when loaded with hydration="lazy"
+    lazy_fields: ClassVar[Tuple[str, ...]] = ("assets", "prompts", "scripts")
+
     def has_analyzing_assets(self, client: Optional[Any] = None) -> bool:
         """
         Checks if the project has any assets that are currently being analyzed by checking with the API.
@@ -584,6 +688,33 @@ class Project(BaseModel):
         
         # Return the uploaded asset
         return asset
+
+    def upload_assets(self, paths: List[str], concurrency: int = 4, description: str = "", client: Optional[Any] = None):
+        """
+        Uploads many files to the project in parallel and refreshes the project once at the end.
+        
+        Args:
+            paths: Files to upload; each asset is named after its file
+            concurrency: Maximum number of simultaneous uploads
+            description: Description given to every asset
+            client: Optional ApiClient instance. If not provided, uses the previously set client.
+            
+        Returns:
+            BulkUploadResult: Per-file outcomes; failed files do not stop the batch
+            
+        Raises:
+            ValueError: If no client is available and none is provided
+        """
+        api_client = client or self._client
+        
+        if api_client is None:
+            raise ValueError("No API client available. Either set the _client attribute on the Project instance or provide a client parameter.")
+            
+        result = api_client.assets.bulk_upload(self.id, paths, concurrency=concurrency, description=description)
+        
+        # The batch already fetched the project once; reuse it
+        self._refresh_from(result.project)
+        return result
         
     def update_project_data(self, client: Optional[Any] = None) -> 'Project':
         """
@@ -606,7 +737,9 @@ class Project(BaseModel):
             
         # Get updated project data
         updated_project = api_client.projects.get(self.id)
-        
+        return self._refresh_from(updated_project)
+
+    def _refresh_from(self, updated_project: 'Project') -> 'Project':
         # Preserve the client reference
         original_client = self._client
         
@@ -623,3 +756,45 @@ class Project(BaseModel):
         self._client = original_client
         
         return self
+
+def load_model(model: type, data: Any, hydration: str = "full") -> Any:
+    """
+    Builds one model from decoded JSON. With hydration="lazy", a LazyModel's
+    nested lists are validated on first access instead of up front.
+    """
+    if hydration == "lazy" and issubclass(model, LazyModel):
+        return model.model_validate_deferred(data)
+    return model(**data)
+
+_response_adapters: Dict[Any, TypeAdapter] = {}
+
+def response_adapter(response_model: Any) -> TypeAdapter:
+    """
+    Module-level cached TypeAdapter for a model class or List[Model]; building
+    one compiles a validator, so it is done once per response type.
+    """
+    adapter = _response_adapters.get(response_model)
+    if adapter is None:
+        adapter = _response_adapters[response_model] = TypeAdapter(response_model)
+    return adapter
+
+def validate_json_response(response_model: Any, body: bytes, hydration: str = "full") -> Any:
+    """
+    Validates a raw JSON response body against a model class or List[Model].
+    pydantic-core parses and validates the bytes in a single pass, without
+    building an intermediate graph of dicts and lists first.
+    """
+    item_model = get_args(response_model)[0] if get_origin(response_model) in (list, List) else response_model
+    if hydration == "lazy" and isinstance(item_model, type) and issubclass(item_model, LazyModel):
+        # Deferred fields have to be kept as plain JSON
+        return validate_response(response_model, json.loads(body), hydration)
+    return response_adapter(response_model).validate_json(body)
+
+def validate_response(response_model: Any, obj: Any, hydration: str = "full") -> Any:
+    """
+    Validates decoded JSON against a model class, or against List[Model] for list endpoints.
+    """
+    if get_origin(response_model) in (list, List):
+        item_model = get_args(response_model)[0]
+        return [load_model(item_model, item, hydration) for item in obj]
+    return load_model(response_model, obj, hydration)
@@ -0,0 +1,204 @@
+import asyncio
+import mmap
+import os
+import uuid
+from typing import Any, Iterator, List, Mapping, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+class _FilePart:
+    # A file field; streamed from its current position to the end
+    def __init__(self, fileobj, start: int, size: Optional[int]):
+        self.fileobj = fileobj
+        self.start = start
+        self.size = size
+
+def _file_size(fileobj) -> Tuple[int, Optional[int]]:
+    # Returns (current position, bytes left), or (0, None) for unsized streams
+    try:
+        position = fileobj.tell()
+    except (AttributeError, OSError, ValueError):
+        return 0, None
+    try:
+        return position, os.fstat(fileobj.fileno()).st_size - position
+    except (AttributeError, OSError, ValueError):
+        pass
+    try:
+        end = fileobj.seek(0, os.SEEK_END)
+        fileobj.seek(position)
+        return position, end - position
+    except (AttributeError, OSError, ValueError):
+        return position, None
+
+def _filename(name: str, fileobj) -> str:
+    filename = getattr(fileobj, "name", None)
+    if isinstance(filename, str) and not (filename.startswith("<") and filename.endswith(">")):
+        return os.path.basename(filename)
+    return name
+
+class MultipartEncoder:
+    '''
+    Streams a multipart/form-data body instead of building it in memory, so
+    peak memory stays at about one chunk no matter how large the files are.
+
+    Fields take the same values as the `files=` argument of requests: a file
+    object, a (filename, fileobj) or (filename, fileobj, content_type) tuple,
+    or plain str / bytes values. Regular files are read through mmap and the
+    pages are released once sent. When every file size is known len() gives
+    the exact body size, sent as Content-Length; otherwise the body goes out
+    with chunked transfer encoding.
+
+    The body can be iterated again (e.g. by a retry) as long as the files
+    are seekable. An optional hasher (any object with update() and reset())
+    is fed the file contents as they are sent.
+    '''
+
+    def __init__(self, fields: Mapping[str, Any], boundary: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE, hasher=None):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.hasher = hasher
+        self._parts: List[Any] = []
+        for name, value in fields.items():
+            content_type = None
+            if isinstance(value, tuple):
+                filename, fileobj = value[0], value[1]
+                if len(value) > 2:
+                    content_type = value[2]
+            elif isinstance(value, (str, bytes)):
+                filename, fileobj = None, value
+            else:
+                filename, fileobj = _filename(name, value), value
+            header = f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"'
+            if filename is not None:
+                header += f'; filename="{filename}"'
+            if content_type is not None:
+                header += f"\r\nContent-Type: {content_type}"
+            self._parts.append((header + "\r\n\r\n").encode())
+            if isinstance(fileobj, str):
+                self._parts.append(fileobj.encode())
+            elif isinstance(fileobj, bytes):
+                self._parts.append(fileobj)
+            else:
+                start, size = _file_size(fileobj)
+                self._parts.append(_FilePart(fileobj, start, size))
+            self._parts.append(b"\r\n")
+        self._parts.append(f"--{self.boundary}--\r\n".encode())
+        self._consumed = False
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    @property
+    def length(self) -> Optional[int]:
+        '''
+        Size of the encoded body in bytes, or None if a file has unknown size.
+        '''
+        total = 0
+        for part in self._parts:
+            if isinstance(part, _FilePart):
+                if part.size is None:
+                    return None
+                total += part.size
+            else:
+                total += len(part)
+        return total
+
+    def __len__(self):
+        # requests uses len() for Content-Length; 0 makes it fall back to chunked encoding
+        return self.length or 0
+
+    def headers(self) -> dict:
+        headers = {"Content-Type": self.content_type}
+        length = self.length
+        if length is not None:
+            headers["Content-Length"] = str(length)
+        return headers
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self._consumed:
+            self._rewind()
+        self._consumed = True
+        if self.hasher is not None:
+            self.hasher.reset()
+        for part in self._parts:
+            if isinstance(part, _FilePart):
+                for chunk in self._iter_file(part):
+                    if self.hasher is not None:
+                        self.hasher.update(chunk)
+                    yield chunk
+            else:
+                yield part
+
+    def _rewind(self):
+        for part in self._parts:
+            if isinstance(part, _FilePart):
+                try:
+                    part.fileobj.seek(part.start)
+                except (AttributeError, OSError, ValueError):
+                    raise ValueError("Multipart body cannot be sent again: file is not seekable")
+
+    def _iter_file(self, part: _FilePart) -> Iterator[bytes]:
+        mapped = self._mmap(part)
+        if mapped is None:
+            while True:
+                chunk = part.fileobj.read(self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        with mapped:
+            # mmap offsets must be page aligned, so map from 0 and skip to start
+            offset = part.start
+            end = part.start + part.size
+            while offset < end:
+                size = min(self.chunk_size, end - offset)
+                with memoryview(mapped)[offset:offset + size] as chunk:
+                    yield chunk
+                self._release(mapped, offset, size)
+                offset += size
+        part.fileobj.seek(end)
+
+    @staticmethod
+    def _mmap(part: _FilePart):
+        if not part.size:
+            return None
+        try:
+            return mmap.mmap(part.fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _release(mapped, offset: int, size: int):
+        # Drop sent pages so resident memory does not grow with the file
+        if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_DONTNEED"):
+            start = offset - offset % mmap.PAGESIZE
+            try:
+                mapped.madvise(mmap.MADV_DONTNEED, start, offset + size - start)
+            except OSError:
+                pass
+
+    def async_body(self) -> "AsyncMultipartBody":
+        '''
+        Wraps the encoder for httpx's AsyncClient, which rejects sync iterables.
+        '''
+        return AsyncMultipartBody(self)
+
+class AsyncMultipartBody:
+    '''
+    Async-iterable view of a MultipartEncoder. File reads run in the default
+    executor so the event loop keeps running while a large file is sent.
+    '''
+
+    def __init__(self, encoder: MultipartEncoder):
+        self.encoder = encoder
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        iterator = iter(self.encoder)
+        done = object()
+        while True:
+            chunk = await loop.run_in_executor(None, next, iterator, done)
+            if chunk is done:
+                return
+            # memoryviews over the mmap are only valid until the next step
+            yield bytes(chunk)
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Dict, Mapping, Optional, Tuple
+from .utils import endpoint_path
+
+ENDPOINT_CLASSES = ("search", "generate", "upload", "reads", "writes")
+
+class RateLimitExceeded(Exception):
+    '''
+    Raised by a non-blocking RateLimiter when no token is available.
+    '''
+
+    def __init__(self, endpoint_class: str, retry_after: float):
+        self.endpoint_class = endpoint_class
+        self.retry_after = retry_after
+        super().__init__(f"Rate limit for '{endpoint_class}' requests exceeded; next token in {retry_after:.2f}s")
+
+def classify_endpoint(method: str, endpoint: str, has_files: bool = False) -> str:
+    '''
+    Maps a request onto one of the endpoint classes used for rate limiting:
+    'search', 'generate', 'upload', 'reads' or 'writes'.
+    '''
+    method = method.upper()
+    path = endpoint_path(endpoint)
+    if path.endswith("/search"):
+        return "search"
+    if method in ("GET", "HEAD", "OPTIONS"):
+        return "reads"
+    if has_files or "upload" in path:
+        return "upload"
+    if any(part in path for part in ("/generate", "/render", "/create-edit", "/analysis", "/prompt")):
+        return "generate"
+    return "writes"
+
+class RateLimitBackend:
+    '''
+    Stores token-bucket state. Implementations decide who shares the budget.
+    '''
+
+    def take(self, bucket: str, rate: float, capacity: float, tokens: float) -> float:
+        '''
+        Refills the bucket and takes `tokens` from it if enough are available.
+        Returns 0 on success, otherwise the number of seconds until they will be.
+        '''
+        raise NotImplementedError
+
+    @staticmethod
+    def _refill(state: Optional[Tuple[float, float]], rate: float, capacity: float, now: float) -> float:
+        if state is None:
+            return capacity
+        available, updated_at = state
+        return min(capacity, available + max(0.0, now - updated_at) * rate)
+
+class InMemoryBackend(RateLimitBackend):
+    '''
+    Shares buckets between all threads of the current process.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: Dict[str, Tuple[float, float]] = {}
+
+    def take(self, bucket, rate, capacity, tokens):
+        with self._lock:
+            now = time.monotonic()
+            available = self._refill(self._state.get(bucket), rate, capacity, now)
+            if available >= tokens:
+                self._state[bucket] = (available - tokens, now)
+                return 0.0
+            self._state[bucket] = (available, now)
+            return (tokens - available) / rate
+
+class FileLockBackend(RateLimitBackend):
+    '''
+    Shares buckets between every process on the host that points at the same
+    state file. Each take() holds an exclusive flock on the file while it
+    reads, updates and writes back the bucket state. POSIX only.
+    '''
+
+    def __init__(self, path: str):
+        import fcntl  # noqa: F401 -- fail early on platforms without flock
+        self.path = path
+        self._lock = threading.Lock()
+
+    def take(self, bucket, rate, capacity, tokens):
+        import fcntl
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                raw = b""
+                while True:
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        break
+                    raw += chunk
+                try:
+                    state = json.loads(raw) if raw else {}
+                except ValueError:
+                    state = {}
+                now = time.time()
+                previous = state.get(bucket)
+                available = self._refill(tuple(previous) if previous else None, rate, capacity, now)
+                wait = 0.0
+                if available >= tokens:
+                    available -= tokens
+                else:
+                    wait = (tokens - available) / rate
+                state[bucket] = [available, now]
+                payload = json.dumps(state).encode()
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, payload)
+                return wait
+            finally:
+                os.close(fd)
+
+class RateLimiter:
+    '''
+    Client-side token-bucket rate limiter, configured per endpoint class:
+
+        RateLimiter({"reads": (20, 40), "search": (2, 5), "generate": (0.5, 2)})
+
+    Each value is (tokens per second, bucket capacity); the capacity is the
+    largest burst allowed after a quiet period. Classes that are not listed
+    are not limited. With block=True callers sleep until a token is free;
+    with block=False RateLimitExceeded is raised immediately instead.
+
+    The default backend shares the budget across threads. Use
+    FileLockBackend(path) to share it across processes on the same host.
+    '''
+
+    def __init__(self, limits: Mapping[str, Tuple[float, float]], block: bool = True, backend: Optional[RateLimitBackend] = None, namespace: str = "videojungle"):
+        '''
+        Args:
+            limits: (rate, capacity) per endpoint class: 'search', 'generate', 'upload', 'reads', 'writes'
+            block: Wait for a token (True) or raise RateLimitExceeded (False)
+            backend: Where bucket state lives; defaults to an in-process backend
+            namespace: Prefix for bucket names, so several API keys can share one state file
+        '''
+        for endpoint_class, (rate, capacity) in limits.items():
+            if endpoint_class not in ENDPOINT_CLASSES:
+                raise ValueError(f"Unknown endpoint class '{endpoint_class}', expected one of {ENDPOINT_CLASSES}")
+            if rate <= 0 or capacity < 1:
+                raise ValueError("Rate must be positive and capacity at least 1")
+        self.limits = dict(limits)
+        self.block = block
+        self.backend = backend if backend is not None else InMemoryBackend()
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self.waited = 0.0
+        self.rejected = 0
+
+    def _try(self, endpoint_class: str) -> float:
+        rate, capacity = self.limits[endpoint_class]
+        return self.backend.take(f"{self.namespace}:{endpoint_class}", rate, capacity, 1)
+
+    def _rejected(self, endpoint_class: str, wait: float):
+        with self._lock:
+            self.rejected += 1
+        raise RateLimitExceeded(endpoint_class, wait)
+
+    def _waited(self, wait: float):
+        with self._lock:
+            self.waited += wait
+
+    def acquire(self, endpoint_class: str, block: Optional[bool] = None):
+        '''
+        Takes a token for the endpoint class, sleeping or raising if none is available.
+        '''
+        if endpoint_class not in self.limits:
+            return
+        block = self.block if block is None else block
+        while True:
+            wait = self._try(endpoint_class)
+            if wait <= 0:
+                return
+            if not block:
+                self._rejected(endpoint_class, wait)
+            self._waited(wait)
+            time.sleep(wait)
+
+    async def acquire_async(self, endpoint_class: str, block: Optional[bool] = None):
+        '''
+        Asyncio version of acquire() that yields to the event loop while waiting.
+        '''
+        if endpoint_class not in self.limits:
+            return
+        block = self.block if block is None else block
+        while True:
+            wait = self._try(endpoint_class)
+            if wait <= 0:
+                return
+            if not block:
+                self._rejected(endpoint_class, wait)
+            self._waited(wait)
+            await asyncio.sleep(wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"waited": self.waited, "rejected": self.rejected}
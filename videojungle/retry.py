@@ -0,0 +1,202 @@
+import random
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+
+class RetryPolicy:
+    '''
+    Decides whether and how long to wait before retrying a failed request.
+
+    Delays use exponential backoff with full jitter: attempt n sleeps a random
+    amount between 0 and min(backoff_max, backoff_base * 2 ** (n - 1)). When the
+    server sends a Retry-After header that value is used instead. Retrying stops
+    once max_attempts is reached or the next sleep would push the total time
+    spent on the request past max_retry_time.
+    '''
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_retry_time: float = 120.0,
+        retry_statuses: Iterable[int] = RETRYABLE_STATUSES,
+        retry_methods: Iterable[str] = IDEMPOTENT_METHODS,
+        respect_retry_after: bool = True,
+        retry_connection_errors: bool = True,
+    ):
+        '''
+        Args:
+            max_attempts: Total attempts per request, including the first one (1 disables retries)
+            backoff_base: Upper bound in seconds of the first backoff sleep
+            backoff_max: Cap in seconds on any single backoff sleep
+            max_retry_time: Total budget in seconds for a request, including all retries
+            retry_statuses: HTTP status codes that are considered transient
+            retry_methods: HTTP methods that may be retried; only idempotent ones by default
+            respect_retry_after: Whether to sleep for the server's Retry-After value when present
+            retry_connection_errors: Whether to retry connection failures and timeouts
+        '''
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_time = max_retry_time
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = frozenset(m.upper() for m in retry_methods)
+        self.respect_retry_after = respect_retry_after
+        self.retry_connection_errors = retry_connection_errors
+
+    def backoff(self, attempt: int) -> float:
+        '''
+        Returns a jittered sleep for the given (1-based) failed attempt.
+        '''
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+        '''
+        Parses a Retry-After header given either as seconds or as an HTTP date.
+        '''
+        if not headers:
+            return None
+        value = headers.get("Retry-After")
+        if value is None:
+            return None
+        value = value.strip()
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def get_delay(
+        self,
+        method: str,
+        attempt: int,
+        elapsed: float,
+        status_code: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Optional[float]:
+        '''
+        Returns the number of seconds to sleep before the next attempt, or None
+        if the request should not be retried.
+
+        Args:
+            method: HTTP method of the request
+            attempt: Number of the attempt that just failed (1-based)
+            elapsed: Seconds spent on the request so far
+            status_code: Response status, or None if the attempt raised a connection error
+            headers: Response headers, used for Retry-After
+        '''
+        if attempt >= self.max_attempts:
+            return None
+        if method.upper() not in self.retry_methods:
+            return None
+        if status_code is None:
+            if not self.retry_connection_errors:
+                return None
+        elif status_code not in self.retry_statuses:
+            return None
+
+        delay = None
+        if self.respect_retry_after:
+            delay = self.parse_retry_after(headers)
+        if delay is None:
+            delay = self.backoff(attempt)
+
+        if elapsed + delay > self.max_retry_time:
+            return None
+        return delay
+
+class AttemptRecord(NamedTuple):
+    '''
+    A single HTTP attempt made by the client.
+    '''
+    method: str
+    endpoint: str
+    attempt: int
+    status_code: Optional[int]
+    error: Optional[str]
+    duration: float
+    retry_delay: Optional[float]
+
+class RetryStats:
+    '''
+    Thread-safe per-attempt metrics for requests made through a client.
+
+    Keeps aggregate counters plus the most recent attempts, so callers can see
+    how many retries happened and how much time they cost.
+    '''
+
+    def __init__(self, history: int = 1000):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=history)
+        self.requests = 0
+        self.attempts = 0
+        self.retries = 0
+        self.gave_up = 0
+        self.failed_attempt_time = 0.0
+        self.backoff_time = 0.0
+        self.retries_by_status: Dict[str, int] = {}
+
+    def record(self, record: AttemptRecord, final: bool):
+        '''
+        Records an attempt. `final` marks the last attempt of a request.
+        '''
+        with self._lock:
+            self._recent.append(record)
+            self.attempts += 1
+            if record.attempt == 1:
+                self.requests += 1
+            if record.retry_delay is not None:
+                key = str(record.status_code) if record.status_code is not None else "connection_error"
+                self.retries += 1
+                self.failed_attempt_time += record.duration
+                self.backoff_time += record.retry_delay
+                self.retries_by_status[key] = self.retries_by_status.get(key, 0) + 1
+            elif final and record.attempt > 1 and (record.error is not None or (record.status_code or 0) >= 400):
+                self.gave_up += 1
+
+    def recent(self) -> List[AttemptRecord]:
+        with self._lock:
+            return list(self._recent)
+
+    def snapshot(self) -> dict:
+        '''
+        Returns the aggregate counters as a plain dict.
+        '''
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "gave_up": self.gave_up,
+                "failed_attempt_time": self.failed_attempt_time,
+                "backoff_time": self.backoff_time,
+                "retry_time": self.failed_attempt_time + self.backoff_time,
+                "retries_by_status": dict(self.retries_by_status),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._recent.clear()
+            self.requests = 0
+            self.attempts = 0
+            self.retries = 0
+            self.gave_up = 0
+            self.failed_attempt_time = 0.0
+            self.backoff_time = 0.0
+            self.retries_by_status = {}
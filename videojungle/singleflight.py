@@ -0,0 +1,106 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+from .timeouts import Deadline, DeadlineExceeded
+
+def request_key(method: str, url: str, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None) -> Tuple:
+    '''
+    Builds a hashable key identifying a request, so identical requests
+    made with differently ordered params or headers still match.
+    '''
+    params_key = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    headers_key = tuple(sorted((k.lower(), v) for k, v in (headers or {}).items()))
+    return (method.upper(), url, params_key, headers_key)
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    '''
+    Coalesces concurrent calls that share a key: the first caller runs the
+    function, and every caller that arrives while it is still running blocks
+    until it finishes and receives the same result (or exception). A caller
+    with a deadline stops waiting when it runs out and raises DeadlineExceeded,
+    while the shared call carries on for the others.
+
+    Nothing is cached once the call completes; the next caller starts a new one.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], deadline: Optional[Deadline] = None) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            if not call.event.wait(deadline.remaining() if deadline is not None else None):
+                raise DeadlineExceeded(f"Deadline of {deadline.seconds:g}s exceeded waiting for a shared request")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._calls)}
+
+class AsyncSingleFlight:
+    '''
+    Asyncio version of SingleFlight. All callers await the same task; cancelling
+    one waiter, or its deadline running out, does not cancel the shared call
+    for the others.
+    '''
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], deadline: Optional[Deadline] = None) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            self.executed += 1
+
+            def _forget(finished, key=key):
+                if self._tasks.get(key) is finished:
+                    del self._tasks[key]
+            task.add_done_callback(_forget)
+        else:
+            self.shared += 1
+        if deadline is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), deadline.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Deadline of {deadline.seconds:g}s exceeded waiting for a shared request")
+
+    def stats(self) -> dict:
+        return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._tasks)}
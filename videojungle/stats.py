@@ -0,0 +1,206 @@
+import bisect
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+# Network phases of a single attempt; not every transport reports all of them
+NETWORK_PHASES = ("connect", "tls", "time_to_headers", "download", "total")
+# Client-side processing of a successful response
+PROCESSING_PHASES = ("decode", "validate")
+
+class RequestEvent:
+    '''
+    Describes one HTTP attempt; passed to on_request, on_response and on_error hooks.
+    Fields that are not known yet (e.g. status_code in on_request) are None.
+    '''
+    __slots__ = ("method", "endpoint", "template", "url", "attempt", "status_code", "phases", "bytes_sent", "bytes_received", "error")
+
+    def __init__(self, method: str, endpoint: str, template: str, url: str, attempt: int):
+        self.method = method
+        self.endpoint = endpoint
+        self.template = template
+        self.url = url
+        self.attempt = attempt
+        self.status_code: Optional[int] = None
+        self.phases: Dict[str, float] = {}
+        self.bytes_sent: Optional[int] = None
+        self.bytes_received: Optional[int] = None
+        self.error: Optional[BaseException] = None
+
+    def __repr__(self):
+        return f"RequestEvent({self.method} {self.template} attempt={self.attempt} status={self.status_code})"
+
+class Hooks:
+    '''
+    Callbacks fired by the client around every HTTP attempt. Register with
+    the decorator-style methods:
+
+        @vj.hooks.on_response
+        def log(event):
+            print(event.template, event.status_code, event.phases["total"])
+
+    Exceptions raised by hooks propagate to the caller.
+    '''
+
+    def __init__(self):
+        self.request: List[Callable[[RequestEvent], None]] = []
+        self.response: List[Callable[[RequestEvent], None]] = []
+        self.error: List[Callable[[RequestEvent], None]] = []
+
+    def on_request(self, fn):
+        self.request.append(fn)
+        return fn
+
+    def on_response(self, fn):
+        self.response.append(fn)
+        return fn
+
+    def on_error(self, fn):
+        self.error.append(fn)
+        return fn
+
+    @staticmethod
+    def fire(callbacks, event: RequestEvent):
+        for callback in callbacks:
+            callback(event)
+
+class Histogram:
+    '''
+    Cumulative-bucket histogram in the Prometheus style.
+    '''
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        running = 0
+        buckets = []
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            running += count
+            buckets.append(("+Inf" if bound == float("inf") else repr(bound), running))
+        return buckets
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "buckets": dict(self.cumulative()),
+        }
+
+class _EndpointStats:
+    __slots__ = ("requests", "errors", "statuses", "phases", "bytes_sent", "bytes_received")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.statuses: Dict[str, int] = {}
+        self.phases: Dict[str, Histogram] = {}
+        self.bytes_sent = Histogram(BYTE_BUCKETS)
+        self.bytes_received = Histogram(BYTE_BUCKETS)
+
+    def phase(self, name: str) -> Histogram:
+        histogram = self.phases.get(name)
+        if histogram is None:
+            histogram = self.phases[name] = Histogram(LATENCY_BUCKETS)
+        return histogram
+
+class StatsCollector:
+    '''
+    Aggregates per-endpoint-template latency and byte histograms, e.g. for
+    ('GET', '/projects/{id}/edits/{id}'). Network phases of every attempt are
+    recorded separately from JSON decoding and pydantic validation, so slow
+    servers can be told apart from expensive parsing.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], _EndpointStats] = {}
+
+    def _get(self, method: str, template: str) -> _EndpointStats:
+        key = (method.upper(), template)
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = _EndpointStats()
+        return stats
+
+    def record_attempt(self, event: RequestEvent):
+        with self._lock:
+            stats = self._get(event.method, event.template)
+            stats.requests += 1
+            if event.error is not None:
+                stats.errors += 1
+                status = "error"
+            else:
+                status = str(event.status_code)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            for name, seconds in event.phases.items():
+                stats.phase(name).observe(seconds)
+            if event.bytes_sent is not None:
+                stats.bytes_sent.observe(event.bytes_sent)
+            if event.bytes_received is not None:
+                stats.bytes_received.observe(event.bytes_received)
+
+    def record_phase(self, method: str, template: str, phase: str, seconds: float):
+        with self._lock:
+            self._get(method, template).phase(phase).observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_dict(self) -> dict:
+        '''
+        Returns {"GET /projects/{id}": {"requests": ..., "phases": {...}, ...}, ...}
+        '''
+        with self._lock:
+            result = {}
+            for (method, template), stats in sorted(self._endpoints.items()):
+                result[f"{method} {template}"] = {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "statuses": dict(stats.statuses),
+                    "phases": {name: histogram.to_dict() for name, histogram in stats.phases.items()},
+                    "bytes_sent": stats.bytes_sent.to_dict(),
+                    "bytes_received": stats.bytes_received.to_dict(),
+                }
+            return result
+
+    def to_prometheus(self, prefix: str = "videojungle") -> str:
+        '''
+        Renders the collected metrics in the Prometheus text exposition format.
+        '''
+        lines = [
+            f"# TYPE {prefix}_requests_total counter",
+            f"# TYPE {prefix}_request_phase_seconds histogram",
+            f"# TYPE {prefix}_request_bytes_sent histogram",
+            f"# TYPE {prefix}_request_bytes_received histogram",
+        ]
+        requests_lines, phase_lines, sent_lines, received_lines = [], [], [], []
+        with self._lock:
+            for (method, template), stats in sorted(self._endpoints.items()):
+                labels = f'method="{method}",endpoint="{template}"'
+                for status, count in sorted(stats.statuses.items()):
+                    requests_lines.append(f'{prefix}_requests_total{{{labels},status="{status}"}} {count}')
+                for name, histogram in sorted(stats.phases.items()):
+                    phase_lines.extend(_histogram_lines(f"{prefix}_request_phase_seconds", f'{labels},phase="{name}"', histogram))
+                sent_lines.extend(_histogram_lines(f"{prefix}_request_bytes_sent", labels, stats.bytes_sent))
+                received_lines.extend(_histogram_lines(f"{prefix}_request_bytes_received", labels, stats.bytes_received))
+        return "\n".join(lines[:1] + requests_lines + lines[1:2] + phase_lines + lines[2:3] + sent_lines + lines[3:] + received_lines) + "\n"
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> List[str]:
+    lines = [f'{name}_bucket{{{labels},le="{bound}"}} {count}' for bound, count in histogram.cumulative()]
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
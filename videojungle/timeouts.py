@@ -0,0 +1,92 @@
+import time
+from typing import Optional, Tuple, Union
+
+class DeadlineExceeded(TimeoutError):
+    '''
+    Raised when an operation runs out of its deadline budget.
+    '''
+
+class Deadline:
+    '''
+    A point in time by which an operation, including all of its retries,
+    polling and downloads, must be finished:
+
+        vj.edits.download_edit_render(project_id, edit_id, "out.mp4", deadline=600)
+
+    Methods that accept deadline= take either a number of seconds or a
+    Deadline instance, so one budget can be shared between several calls.
+    '''
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def coerce(cls, value: Union["Deadline", float, None]) -> Optional["Deadline"]:
+        if value is None or isinstance(value, Deadline):
+            return value
+        return cls(value)
+
+    @classmethod
+    def earliest(cls, *deadlines: Optional["Deadline"]) -> Optional["Deadline"]:
+        candidates = [d for d in deadlines if d is not None]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda d: d.expires_at)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self, operation: str = "operation"):
+        if self.expired():
+            raise DeadlineExceeded(f"Deadline of {self.seconds:g}s exceeded during {operation}")
+
+    def cap(self, timeout: Optional[float]) -> float:
+        '''
+        Returns the smaller of timeout and the remaining budget.
+        '''
+        remaining = self.remaining()
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def __repr__(self):
+        return f"Deadline({self.seconds:g}s, remaining={self.remaining():.2f}s)"
+
+class Timeout:
+    '''
+    Network timeouts applied to every request made by a client.
+
+    connect bounds establishing a connection, read bounds each wait for data
+    from the server, and total bounds a whole API call including its retries.
+    Any of them can be None to disable it.
+
+    The async client cancels a request as soon as total runs out. The sync
+    client checks total between attempts and caps each attempt's connect and
+    read timeouts by what is left, so an attempt whose server keeps sending
+    data slowly can overrun it until the next check.
+    '''
+
+    def __init__(self, connect: Optional[float] = 10.0, read: Optional[float] = 120.0, total: Optional[float] = None):
+        self.connect = connect
+        self.read = read
+        self.total = total
+
+    def deadline(self, deadline: Optional[Deadline] = None) -> Optional[Deadline]:
+        '''
+        Combines the caller's deadline with this timeout's total budget.
+        '''
+        total = Deadline(self.total) if self.total is not None else None
+        return Deadline.earliest(deadline, total)
+
+    def for_attempt(self, deadline: Optional[Deadline] = None) -> Tuple[Optional[float], Optional[float]]:
+        '''
+        Returns (connect, read) timeouts for one attempt, capped by the deadline.
+        '''
+        if deadline is None:
+            return self.connect, self.read
+        return deadline.cap(self.connect), deadline.cap(self.read)
+
+    def __repr__(self):
+        return f"Timeout(connect={self.connect}, read={self.read}, total={self.total})"
@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+import requests
+from .multipart import MultipartEncoder
+from .retry import RetryPolicy
+
+READ_SIZE = 1024 * 1024
+# Age after which a journal's presigned target is assumed to have expired
+JOURNAL_MAX_AGE = 3600
+
+def presigned_upload_info(response: Dict[str, Any]) -> Dict[str, Any]:
+    '''
+    Finds the presigned upload payload in a `direct` video file create response,
+    either at the top level or under "video".
+    '''
+    for container in (response, response.get("video") if isinstance(response.get("video"), dict) else {}):
+        upload_url = container.get("upload_url")
+        if isinstance(upload_url, dict) and "url" in upload_url and "fields" in upload_url:
+            return upload_url
+    raise KeyError("Could not find presigned upload_url in API response")
+
+def created_video_id(response: Dict[str, Any]) -> str:
+    video = response.get("video")
+    if isinstance(video, dict) and "id" in video:
+        return str(video["id"])
+    if "id" in response:
+        return str(response["id"])
+    raise KeyError("Could not find video id in API response")
+
+class UploadTargetRejected(Exception):
+    '''
+    Storage refused a presigned upload target (400 / 403), e.g. because it expired.
+    '''
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+class UploadOutcome(NamedTuple):
+    '''
+    Result of one file in a bulk upload: the asset on success, the exception otherwise.
+    '''
+    path: str
+    asset: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+class BulkUploadResult:
+    '''
+    Per-file outcomes of AssetsAPI.bulk_upload, in the order the paths were
+    given, plus the project as refreshed once after the whole batch.
+    '''
+
+    def __init__(self, outcomes: List[UploadOutcome], project=None, elapsed: float = 0.0):
+        self.outcomes = outcomes
+        self.project = project
+        self.elapsed = elapsed
+
+    @property
+    def succeeded(self) -> List[UploadOutcome]:
+        return [outcome for outcome in self.outcomes if outcome.ok]
+
+    @property
+    def failed(self) -> List[UploadOutcome]:
+        return [outcome for outcome in self.outcomes if not outcome.ok]
+
+    @property
+    def assets(self) -> list:
+        return [outcome.asset for outcome in self.outcomes if outcome.ok]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def __iter__(self):
+        return iter(self.outcomes)
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def __repr__(self):
+        return f"<BulkUploadResult {len(self.succeeded)} succeeded, {len(self.failed)} failed in {self.elapsed:.1f}s>"
+
+class UploadProgress:
+    '''
+    Progress of one direct upload, counted over the encoded request body.
+    '''
+
+    def __init__(self, total_bytes: int, callback: Optional[Callable[["UploadProgress"], None]] = None):
+        self.total_bytes = total_bytes
+        self.sent_bytes = 0
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+        self._callback = callback
+
+    def _sent(self, count: int):
+        self.sent_bytes += count
+        if self._callback is not None:
+            self._callback(self)
+
+    def _rollback(self, count: int):
+        # A failed attempt's bytes are sent again by the retry
+        self.sent_bytes -= count
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        '''
+        Bytes per second actually transferred in this run.
+        '''
+        elapsed = self.elapsed
+        return self.sent_bytes / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "total_bytes": self.total_bytes,
+            "sent_bytes": self.sent_bytes,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+        }
+
+    def __repr__(self):
+        return f"<UploadProgress {self.sent_bytes}/{self.total_bytes} bytes, {self.throughput / 1e6:.1f} MB/s>"
+
+class UploadJournal:
+    '''
+    On-disk record of the video file a direct upload created and when, so a
+    retry after an interruption sends the file to the same video file instead
+    of creating another. The upload itself is one POST and restarts from the
+    beginning. A journal older than max_age is treated as stale, because the
+    presigned target in its create response will have expired.
+    '''
+
+    def __init__(self, path: str, max_age: float = JOURNAL_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self.state: Dict[str, Any] = {}
+
+    @classmethod
+    def for_file(cls, file_path: str, directory: Optional[str] = None, max_age: float = JOURNAL_MAX_AGE) -> "UploadJournal":
+        '''
+        Journal in `directory` (default: <tmp>/videojungle-uploads) keyed by the
+        file's absolute path, size and modification time.
+        '''
+        stat = os.stat(file_path)
+        key = f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        directory = directory or os.path.join(tempfile.gettempdir(), "videojungle-uploads")
+        os.makedirs(directory, exist_ok=True)
+        return cls(os.path.join(directory, hashlib.sha256(key.encode()).hexdigest()[:32] + ".json"), max_age)
+
+    def load(self) -> bool:
+        '''
+        Loads the journal; False (and the journal is discarded) when there is
+        none, it cannot be read, or it is older than max_age.
+        '''
+        try:
+            with open(self.path) as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+        if self.state and time.time() - self.state.get("created_at", 0) > self.max_age:
+            self.discard()
+        return bool(self.state)
+
+    def start(self, create_response: dict):
+        self.state = {"create_response": create_response, "created_at": time.time()}
+        self._write()
+
+    def discard(self):
+        self.state = {}
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _write(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.path)
+
+class _CountingBody:
+    # Reports a MultipartEncoder's bytes to the progress as they are sent
+    def __init__(self, encoder: MultipartEncoder, progress: UploadProgress):
+        self.encoder = encoder
+        self.progress = progress
+        self.sent = 0
+
+    def __len__(self):
+        return len(self.encoder)
+
+    def __iter__(self) -> Iterator[bytes]:
+        self.progress._rollback(self.sent)
+        self.sent = 0
+        for chunk in self.encoder:
+            self.sent += len(chunk)
+            self.progress._sent(len(chunk))
+            yield chunk
+
+class DirectUploader:
+    '''
+    Uploads a file to the presigned POST target ({"url": ..., "fields": {...}})
+    returned by a `direct` video file create call, streaming it from disk.
+
+    The file goes up in a single POST; the API does not hand out multipart
+    part URLs, so an interrupted upload is sent again from the start.
+    '''
+
+    def __init__(self, session: Optional[requests.Session] = None, retry: Optional[RetryPolicy] = None, timeout=(10, 300)):
+        self.session = session if session is not None else requests.Session()
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.timeout = timeout
+
+    def upload(self, file_path: str, upload_info: dict, progress: Optional[Callable[[UploadProgress], None]] = None) -> UploadProgress:
+        '''
+        Uploads file_path and returns the final UploadProgress. Raises
+        UploadTargetRejected when storage refuses the presigned target.
+        '''
+        fields = dict(upload_info.get("fields", {}))
+        content_type = fields.get("Content-Type") or "application/octet-stream"
+        with open(file_path, "rb") as f:
+            fields["file"] = (os.path.basename(file_path), f, content_type)
+            encoder = MultipartEncoder(fields)
+            # Progress counts the encoded body, form fields and boundaries included
+            progress = UploadProgress(len(encoder), progress)
+            self._send("POST", upload_info["url"], _CountingBody(encoder, progress), {"Content-Type": encoder.content_type})
+        progress.finished = time.monotonic()
+        return progress
+
+    def _send(self, method: str, url: str, body, headers: dict) -> requests.Response:
+        # Presigned targets are outside the API, so retries are handled here
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self.session.request(method, url, data=body, headers=headers, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                delay = self.retry.get_delay("PUT", attempt, time.monotonic() - started)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            if response.status_code < 300:
+                return response
+            snippet = response.text[:300].replace("\n", " ")
+            if response.status_code in (400, 403):
+                # Expired or otherwise invalid signature; retrying the same target can't help
+                raise UploadTargetRejected(response.status_code, f"Direct upload rejected ({response.status_code}): {snippet}")
+            delay = self.retry.get_delay("PUT", attempt, time.monotonic() - started, response.status_code, response.headers)
+            if delay is None:
+                raise Exception(f"Direct upload failed ({response.status_code}): {snippet}")
+            time.sleep(delay)
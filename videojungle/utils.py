@@ -37,3 +37,19 @@ def is_youtube_url(string):
     
     # Return True if found, False otherwise
     return match is not None
+
+_ID_SEGMENT = re.compile(r'^(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+|[0-9a-fA-F]{24,})$')
+
+def endpoint_path(endpoint):
+    """
+    Returns the path part of an endpoint, without query string and with a single leading slash.
+    """
+    return "/" + endpoint.split("?", 1)[0].strip("/")
+
+def endpoint_template(endpoint):
+    """
+    Collapses identifiers in an endpoint path into placeholders, so that
+    '/projects/1b4e...-.../edits/9a2f...' becomes '/projects/{id}/edits/{id}'.
+    """
+    segments = endpoint_path(endpoint).split("/")
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in segments)